@@ -0,0 +1,59 @@
+"""
+It times the physics functions (micro-benchmarks) and compares the timings to a baseline to flag the regressions.
+
+The first run (or a run with update_baseline = True) writes the baseline.
+It stops with an error too if the import of a module of the computation loads the plotting stack, naima or astropy.
+"""
+
+##------------------------##
+# Librairies and functions #
+##------------------------##
+import os
+import sys
+from Functions_benchmark import *
+
+##==========##
+# Parameters #
+##==========##
+
+baseline = 'Benchmarks.json'    # JSON file of the baseline (next to this program)                 #you need to change it for your machine
+threshold = 0.25                # relative slowdown flagged as a regression (25 %)
+noise = 1e-5                    # slowdowns smaller than noise are not flagged (s)
+update_baseline = False         # if the timings of this run become the baseline
+names = None                    # cases to run, e.g. ['masses', 'pion_decay', 'import'] (None: all cases)
+repeat = 3                      # number of repetitions of each case
+
+##=========##
+# Benchmark #
+##=========##
+
+baseline = os.path.join(os.path.dirname(os.path.abspath(__file__)), baseline)
+results = benchmark_run(names, repeat)
+
+for module in sorted(benchmark_heavy_loaded):
+
+    print('the import of %s loads %s' %(module, ', '.join(benchmark_heavy_loaded[module])))
+
+if update_baseline or not os.path.isfile(baseline):
+
+    benchmark_write(baseline, results)
+    print('baseline written in %s (%d cases)' %(baseline, len(results)))
+
+    for name in sorted(results):
+
+        print('%-45s %12.3e s' %(name, results[name]))
+
+    if len(benchmark_heavy_loaded) > 0:
+        sys.exit(1)
+
+else:
+
+    regressions = benchmark_compare(results, benchmark_read(baseline), threshold, noise)
+
+    if len(regressions) > 0:
+        print('%d regression(s) of more than %d %%' %(len(regressions), 100 * threshold))
+
+    if (len(regressions) > 0) or (len(benchmark_heavy_loaded) > 0):
+        sys.exit(1)
+
+    print('no regression of more than %d %%' %(100 * threshold))
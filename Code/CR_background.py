@@ -8,15 +8,14 @@ It computes the CR background followind data from the LIS
 import matplotlib.pyplot as plt
 import numpy
 import scipy.integrate as integrate
-import astropy.units as units
 import os
 import pickle
-import naima
-from naima.models import PionDecay, TableModel
 from Functions import *
+from Functions_plot import *
 from Functions_CR import *
 from Functions_SB import *
 from Functions_gamma import *
+from Functions_store import *
 
 # Physical constants and conversion factors
 from Physical_constants import *
@@ -49,80 +48,17 @@ if need_correction:
 else:
     correction_factor = 1
 
-    # Parameters of the SB
+    # Gamma luminosity (erg s^-1)
+        # the intrinsic differential luminosity of the LIS is computed once and scaled by the density and the volume of the shell at each time
+background = cr_background(correction_factor, t6)
 
-Rsb, Vsb = radius_velocity_SB(t6)   # radius of the SB (pc)
-Rsb = correction_factor * Rsb       # correction of the radius
-Msb, Mswept = masses(t7, Rsb)       # swept-up and inner masses (solar masses)
-Ms = Mswept - Msb                   # mass in the shell (solar masses)
-#ns, hs = density_thickness_shell_percentage(percentage, Rsb, Mswept, Msb)  # thickness (pc) and density (cm^-3) of the shell
-ns, hs = density_thickness_shell(Vsb, Mswept, Msb, Rsb)                     # thickness (pc) and density (cm^-3) of the shell
-Vs = (Ms*Msun2g)/(ns * mu * mpg)
+Lum_CRb = background['Lum']
+Lum_HESS_CRb = background['Lum_HESS']
+Lum_Fermi_CRb = background['Lum_Fermi']
 
-with open('CRbackground', 'wb') as CR_write:
-
-        # CR particles density (cm^-3 GeV^-1)
-    n_CRb = cosmicray_lis(ECR)
-
-        # Gamma luminosity (erg s^-1)
-    Lum_CRb = numpy.zeros(number_bin_t)
-    Lum_HESS_CRb = numpy.zeros(number_bin_t)
-    Lum_Fermi_CRb = numpy.zeros(number_bin_t)
-
-    for i in range (number_bin_t):
-
-                # Density of gas (cm^-3)
-        ngas = ns[i] * 1/units.cm**3
-
-                # Particles distribution (GeV^-1)
-        N_CRb = n_CRb * Vs[i] * 1/units.GeV
-
-
-        if numpy.asarray(N_CRb).all() == 0:
-            continue
-
-            # For all the range of energy (100 MeV to 100 TeV)
-                # intrisic differential luminosity (eV^-1 s^-1)
-        model = TableModel(E_CR, N_CRb, amplitude = 1)
-        PD = PionDecay(model, nh = ngas, nuclear_enhancement = True, useLUT = False)
-        flux_PD = PD.flux(spectrum_energy, distance = 0 * units.pc)
-        flux_PD = numpy.nan_to_num(numpy.asarray(flux_PD))
-
-                # Gamma luminosity (whole energy range) (erg s^-1)
-        spectrum_erg = spectrum * 1.0/erg2GeV     # erg
-        spectrum_ev = spectrum_erg * 1.0/eV2erg   # eV
-        lum_energy = flux_PD * spectrum_erg          # erg s^-1 eV^-1
-        Lum_CRb[i] = luminosity(lum_energy, spectrum_ev)
-
-            # H.E.S.S energy range
-        Emin = 1 * TeV2GeV                  # 1 TeV (GeV)
-        Emax = 10 * TeV2GeV                 # 10 TeV (GeV)
-        indE = numpy.where((spectrum >= Emin) & (spectrum <= Emax))[0]
-
-                # Gamma luminosity
-        spectrum_HESS = spectrum[indE]
-        spectrum_erg = spectrum_HESS * 1.0/erg2GeV     # only in the energy range (erg)
-        spectrum_ev = spectrum_erg * 1.0/eV2erg         # eV
-        lum_HESS = flux_PD[indE] * spectrum_erg   # erg s^-1 eV^-1
-        Lum_HESS_CRb[i] = luminosity(lum_HESS, spectrum_ev) # erg s^-1
-
-            # H.E.S.S energy range
-        Emin = 100 * MeV2GeV                # 100 MeV (GeV)
-        Emax = 100                          # 100 GeV (GeV)
-        indE = numpy.where((spectrum >= Emin) & (spectrum <= Emax))[0]
-
-                # Gamma luminosity
-        spectrum_Fermi = spectrum[indE]
-        spectrum_erg = spectrum_Fermi * 1.0/erg2GeV     # only in the energy range (erg)
-        spectrum_ev = spectrum_erg * 1.0/eV2erg         # eV
-        lum_Fermi = flux_PD[indE] * spectrum_erg   # erg s^-1 eV^-1
-        Lum_Fermi_CRb[i] = luminosity(lum_Fermi, spectrum_ev) # erg s^-1
-
-        print('t = %.2f Myrs done'%t6[i])
-
-    pickle.dump(Lum_CRb, CR_write)
-    pickle.dump(Lum_HESS_CRb, CR_write)
-    pickle.dump(Lum_Fermi_CRb, CR_write)
+store_write('CRbackground', 'Lum', Lum_CRb, ['time'], 'erg s^-1')
+store_write('CRbackground', 'Lum_HESS', Lum_HESS_CRb, ['time'], 'erg s^-1')
+store_write('CRbackground', 'Lum_Fermi', Lum_Fermi_CRb, ['time'], 'erg s^-1')
 
 print('number of massive stars: %d' %Nob)
 print('ambient medium density: %d cm^-3' %n0)
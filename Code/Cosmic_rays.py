@@ -10,6 +10,7 @@ import matplotlib.pyplot as plt
 import numpy
 from scipy.optimize import curve_fit
 from Functions import *
+from Functions_plot import *
 from Functions_SB import radius_velocity_SB
 from Functions_CR import *
 
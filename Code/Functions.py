@@ -1,417 +1,14 @@
 ##----------##
 # Librairies #
 ##----------##
-import matplotlib.pyplot as plt
-from matplotlib import rcParams
-from mpl_toolkits.axes_grid1 import host_subplot
-import mpl_toolkits.axisartist as AA
 import numpy
-from scipy.interpolate import interp1d,interp2d
+from scipy.interpolate import interp1d
 
 ##---------##
 # Functions #
 ##---------##
 
-    # axes
-rcParams['xtick.bottom'] = True
-rcParams['xtick.top'] = True
-rcParams['xtick.minor.visible'] = True
-#rcParams['xtick.major.size'] = 10
-#rcParams['xtick.minor.size'] = 7
-
-rcParams['ytick.left'] = True
-rcParams['ytick.right'] = True
-rcParams['ytick.minor.visible'] = True
-
-plt.rc('font', family='serif', size = 12)
-figsize = (12, 8)
-
-#rcParams['lines.linewidth'] = 8
-
-def log_plot(figure_number, number_of_plot, x, y, xlabel, ylabel, symbol, linestyle, color, xmin, xmax, ymin, ymax, label_name = 'none', title = 'none', text = 'none'):
-    """
-    Plot a log-log graphic
-    Inputs:
-        figure_number   :   define the number of the figure
-        number_of_plot  :   define how many plot you want on one figure (with the same axis)
-        x               :   x-vector
-        y               :   y-array (line = one y-array and row = each different y-plot)
-        label_name      :   legend of one y (default = 'none')
-        title           :   title of the plot (default = 'none')
-        xlabel          :   label of the x-axis
-        ylabel          :   label of the y-axis
-        symbol          :   symbol of one y
-        linestyle       :   style of the line (drashed, etc)
-        text            :   important parameters that you will write on the figure (default = 'none')
-        xmin            :   minimum of x
-        xmax            :   maximum of x
-        ymin            :   minimum of y
-        ymax            :   maximum of y
-    """
-        # figure
-    fig = plt.figure(figure_number, figsize = figsize)
-    ax = fig.add_subplot(111)
-
-        # limit
-    plt.xlim((xmin, xmax))
-    plt.ylim((ymin, ymax))
-
-        # Plot
-    if number_of_plot > 1:
-
-        for i in range (number_of_plot):
-            y_plot = y[i]
-
-            if len(symbol) > 1:
-                rcParams['lines.marker'] = symbol[i]
-                rcParams['lines.linestyle'] = linestyle[i]
-                col = color[i]
-
-            else:
-                rcParams['lines.marker'] = symbol
-                rcParams['lines.linestyle'] = linestyle
-                col = color
-
-            if label_name == 'none':
-                plt.loglog(x, y_plot, color = col)
-
-            else:
-                plt.loglog(x, y_plot, label = label_name[i], color = col)
-                plt.legend(loc = 'best')
-
-    elif label_name == 'none':
-
-        rcParams['lines.marker'] = symbol
-        rcParams['lines.linestyle'] = linestyle
-        col = color
-
-        plt.loglog(x, y, color = col)
-
-    else:
-        rcParams['lines.marker'] = symbol
-        rcParams['lines.linestyle'] = linestyle
-        col = color
-
-        plt.loglog(x, y, label = label_name, col = color)
-        plt.legend(loc = 'best')
-
-    if title != 'none':
-
-        plt.title(title)
-
-    plt.xlabel(xlabel)
-    plt.ylabel(ylabel)
-
-        # grid
-    plt.grid(color = 'k', alpha = 0.15, linestyle = ':')
-
-        # text
-    if text != 'none':
-        plt.text(0.5, 0.5, text, horizontalalignment='center', verticalalignment='center', transform = ax.transAxes)
-
-    return
-
-def plot(figure_number, number_of_plot, x, y, xlabel, ylabel, symbol, linestyle, color, xmin, xmax, ymin, ymax, label_name = 'none', title = 'none', text = 'none'):
-    """
-    Function to plot a linear graphic
-    Inputs:
-        figure_number   :   define the number of the figure
-        number_of_plot  :   define how many plot you want on one figure (with the same axis)
-        x               :   x-vector
-        y               :   y-array (line = one y-array and row = each different y-plot)
-        label_name      :   legend of one y (default = 'none')
-        title           :   title of the plot (default = 'none')
-        xlabel          :   label of the x-axis
-        ylabel          :   label of the y-axis
-        symbol          :   symbol of one y
-        linestyle       :   style of the line (drashed, etc)
-        text            :   important parameters that you will write on the figure (default = 'none')
-        xmin            :   minimum of x
-        xmax            :   maximum of x
-        ymin            :   minimum of y
-        ymax            :   maximum of y
-    """
-        # figure
-    fig = plt.figure(figure_number, figsize=figsize)
-    ax = fig.add_subplot(111)
-
-        # limit
-    plt.xlim((xmin, xmax))
-    plt.ylim((ymin, ymax))
-
-        # Plot
-    if number_of_plot > 1:
-
-        for i in range (number_of_plot):
-            y_plot = y[i]
-
-            if len(symbol) > 1:
-                rcParams['lines.marker'] = symbol[i]
-                rcParams['lines.linestyle'] = linestyle[i]
-                col = color[i]
-
-            else:
-                rcParams['lines.marker'] = symbol
-                rcParams['lines.linestyle'] = linestyle
-                col = color
-
-            if label_name == 'none':
-                plt.plot(x, y_plot, color = col)
-
-            else:
-                plt.plot(x, y_plot, label = label_name[i], color = col)
-                plt.legend(loc = 'best')
-
-    elif label_name == 'none':
-        rcParams['lines.marker'] = symbol
-        rcParams['lines.linestyle'] = linestyle
-        col = color
-
-        plt.plot(x, y, color = col)
-
-    else:
-        rcParams['lines.marker'] = symbol
-        rcParams['lines.linestyle'] = linestyle
-        col = color
-
-        plt.plot(x, y, label = label_name, color = col)
-        plt.legend(loc = 'best')
-
-    if title != 'none':
-
-        plt.title(title)
-
-    plt.xlabel(xlabel)
-    plt.ylabel(ylabel)
-
-        # grid
-    plt.grid(color = 'k', alpha = 0.15, linestyle = ':')
-
-        # text
-    if text != 'none':
-        plt.text(0.5, 0.5, text, horizontalalignment='center', verticalalignment='center', transform = ax.transAxes)
-
-    return
-
-def semilog_plot(figure_number, number_of_plot, x, y, xlabel, ylabel, symbol, linestyle, color, xmin, xmax, ymin, ymax, label_name = 'none', title = 'none', text = 'none'):
-    """
-    Function to plot a linear graphic
-    Inputs:
-        figure_number   :   define the number of the figure
-        number_of_plot  :   define how many plot you want on one figure (with the same axis)
-        x               :   x-vector
-        y               :   y-array (line = one y-array and row = each different y-plot)
-        label_name      :   legend of one y (default = 'none')
-        title           :   title of the plot (default = 'none')
-        xlabel          :   label of the x-axis
-        ylabel          :   label of the y-axis
-        symbol          :   symbol of one y
-        linestyle       :   style of the line (drashed, etc)
-        text            :   important parameters that you will write on the figure (default = 'none')
-        xmin            :   minimum of x
-        xmax            :   maximum of x
-        ymin            :   minimum of y
-        ymax            :   maximum of y
-    """
-        # figure
-    fig = plt.figure(figure_number, figsize=figsize)
-    ax = fig.add_subplot(111)
-
-        # limit
-    plt.xlim((xmin, xmax))
-    plt.ylim((ymin, ymax))
-
-        # Plot
-    if number_of_plot > 1:
-
-        for i in range (number_of_plot):
-            y_plot = y[i]
-
-            if len(symbol) > 1:
-                rcParams['lines.marker'] = symbol[i]
-                rcParams['lines.linestyle'] = linestyle[i]
-                col = color[i]
-
-            else:
-                rcParams['lines.marker'] = symbol
-                rcParams['lines.linestyle'] = linestyle
-                col = color
-
-            if label_name == 'none':
-                plt.plot(x, y_plot, color = col)
-
-            else:
-                plt.plot(x, y_plot, label = label_name[i], color = col)
-                plt.legend(loc = 'best')
-
-    elif label_name == 'none':
-        rcParams['lines.marker'] = symbol
-        rcParams['lines.linestyle'] = linestyle
-        col = color
-
-        plt.plot(x, y, color = col)
-
-    else:
-        rcParams['lines.marker'] = symbol
-        rcParams['lines.linestyle'] = linestyle
-        col = color
-
-        plt.plot(x, y, label = label_name, color = col)
-        plt.legend(loc = 'best')
-
-    plt.yscale('log')
-
-    if title != 'none':
-
-        plt.title(title)
-
-    plt.xlabel(xlabel)
-    plt.ylabel(ylabel)
-
-        # grid
-    plt.grid(color = 'k', alpha = 0.15, linestyle = ':')
-
-        # text
-    if text != 'none':
-        plt.text(0.5, 0.5, text, horizontalalignment='center', verticalalignment='center', transform = ax.transAxes)
-
-    return
-
-def log_plot_multi(figure_number, x, y, label_name, xlabel, ylabel, symbol, title = 'none'):
-    """
-    Plot a log-log graphic for two different y-axis
-    Inputs:
-        figure_number   :   define the number of the figure
-        x               :   x-vector
-        y               :   (2D) y-array
-        label_name      :   legend of one y
-        title           :   title of the plot (default = 'none')
-        xlabel          :   label of the x-axis
-        ylabel          :   labels of the y-axis
-        symbol          :   symbol of one y
-    """
-
-        # figure
-    fig = plt.figure(figure_number, figsize = figsize)
-
-        # axes
-    host = host_subplot(111, axes_class=AA.Axes)
-    plt.subplots_adjust(right=0.75)
-
-    par = host.twinx()
-
-    par.axis["right"].toggle(all=True)
-
-    host.set_xlabel(xlabel)
-    host.set_ylabel(ylabel[0])
-    p1, = host.loglog(x, y[0], symbol[0], label = label_name[0])
-
-            # second axes
-    par.set_ylabel(ylabel[1])
-    p2, = par.loglog(x, y[1], symbol[1], label = label_name[1])
-
-        # legend
-    host.legend()
-    host.axis["left"].label.set_color(p1.get_color())
-    par.axis["right"].label.set_color(p2.get_color())
-
-        # grid
-    plt.grid(color = 'k', alpha = 0.15, linestyle = ':')
-
-        # Title
-    if title != 'none':
-
-        plt.title(title)
-
-        # Draw
-    plt.draw()
-
-    return
-
-def plot_multi(figure_number, x, y, xlabel, ylabel, symbol, label_name, title = 'none'):
-    """
-    Plot a linear graphic for two different y-axis
-    Inputs:
-        figure_number   :   define the number of the figure
-        x               :   x-vector
-        y               :   (2D) y-array
-        label_name      :   legend of one y
-        title           :   title of the plot (default = 'none')
-        xlabel          :   label of the x-axis
-        ylabel          :   labels of the y-axis
-        symbol          :   symbol of one y
-    """
-
-        # figure
-    fig = plt.figure(figure_number, figsize = figsize)
-
-        # axes
-    host = host_subplot(111, axes_class=AA.Axes)
-    plt.subplots_adjust(right=0.75)
-
-    par = host.twinx()
-
-    par.axis["right"].toggle(all=True)
-
-            # host axes
-    host.set_xlabel(xlabel)
-    host.set_ylabel(ylabel[0])
-    p1, = host.plot(x, y[0], symbol[0], label = label_name[0])
-
-            # second axes
-    par.set_ylabel(ylabel[1])
-    p2, = par.plot(x, y[1], symbol[1], label = label_name[1])
-
-        # legend
-    host.legend()
-    host.axis["left"].label.set_color(p1.get_color())
-    par.axis["right"].label.set_color(p2.get_color())
-
-        # grid
-    plt.grid(color = 'k', alpha = 0.15, linestyle = ':')
-
-        # Title
-    if title != 'none':
-
-        plt.title(title)
-
-        # Draw
-    plt.draw()
-
-    return
-
-def histogramme(figure_number, hist, xlabel, ylabel, len_bins, label_name = 'none', title = 'none'):
-    """
-    Return the histogramme of hist
-    Inputs:
-        figure_number   :   define the number of the figure
-        hist            :   what you want to make the histogramme
-        label_name      :   label of the data (default = 'none')
-        title           :   title of the histogramme (default = 'none')
-        xlabel          :   label of the x-axis
-        ylabel          :   label of the y axis
-    """
-    plt.figure(figure_number, figsize=figsize)
-    hist_max = numpy.max(hist)
-    hist_min = numpy.min(hist)
-    bins = int((hist_max - hist_min)/len_bins)
-
-    if label_name == 'none':
-        plt.hist(hist, histtype = 'step', bins = bins, align = 'mid')
-
-    else:
-        plt.hist(hist, histtype = 'step', bins = bins, align = 'mid', label = label_name)
-        plt.legend(loc = 'best')
-
-    if title != 'none':
-
-        plt.title(title)
-
-    plt.xlabel(xlabel)
-    plt.ylabel(ylabel)
-
-
-    return
+    # the plotting functions are in Functions_plot.py
 
 def random_PL(xmin, xmax, alpha, size = 1):
 
@@ -440,16 +37,44 @@ def interpolation1d(x, y):
 
     return interp1d(x, y, kind='linear', bounds_error = False, fill_value = 0.0)
 
-def interpolation2d(x, y, z):
+def interpolation_weights(x, x_new):
     """
-    Return the interpolation of a function
+    Return the indices and weights of the linear interpolation from x to x_new
+    They are computed once and can be applied to any number of quantities given on x (see interpolation_stack).
     Inputs:
-        x       :       x-axis of the function
-        y       :       y-axis of the function
-        z       :       z-axis of the function: z = f(x, y)
+        x       :       sorted x-axis of the function
+        x_new   :       x-axis where the function is interpolated
+    Outputs:
+        ind     :       index of the lower node of x for each x_new
+        w       :       weight of the upper node of x for each x_new
+        inside  :       x_new inside [x[0], x[-1]] (0 outside, like interpolation1d)
+    """
+    x = numpy.asarray(x)
+    x_new = numpy.asarray(x_new)
+
+    ind = numpy.clip(numpy.searchsorted(x, x_new, side = 'right') - 1, 0, len(x) - 2)
+    w = (x_new - x[ind])/(x[ind + 1] - x[ind])
+    inside = (x_new >= x[0]) & (x_new <= x[-1])
+
+    return ind, w, inside
+
+def interpolation_stack(weights, y):
+    """
+    Return the linear interpolation of stacked quantities with precomputed weights
+    Inputs:
+        weights :       indices and weights from interpolation_weights
+        y       :       quantities given on x, the first axis is the x-axis (any other axes are interpolated together)
+    Output:
+        y_new   :       quantities on x_new (0 outside the range of x)
     """
+    ind, w, inside = weights
+    y = numpy.asarray(y)
+    shape = (len(w),) + (1,) * (y.ndim - 1)
+    w = w.reshape(shape)
 
-    return interp2d(x, y, z, kind='linear', bounds_error = False, fill_value = 0.0)
+    y_new = y[ind] + w * (y[ind + 1] - y[ind])
+
+    return y_new * inside.reshape(shape)
 
 def loglog_interpolation(x,y):
     """
@@ -464,6 +89,30 @@ def loglog_interpolation(x,y):
 
     return interp1d(numpy.log10(x[nzidx]),numpy.log10(y[nzidx]),kind='linear',bounds_error=False,fill_value=0.0)
 
+def probability_events(Lum_HESS, Lum_Fermi, Lum_pwn, Lum_psr, Lum_HESS_CRb, Lum_Fermi_CRb):
+
+    """
+    Return, for each iteration and time step, if the events of the probabilities happen
+
+    Inputs:
+        Lum_HESS        :   each iterations and time step of the gamma luminosity of CR in the HESS energy range
+        Lum_Fermi       :   each iterations and time step of the gamma luminosity of CR in the Fermi energy range
+        Lum_pwn         :   each iterations and time step of the gamma luminosity of PWNe in the HESS energy range
+        Lum_psr         :   each iterations and time step of the gamma luminosity of PSRs in the Fermi energy range
+        Lum_HESS_CRb    :   each time step of the gamma luminosity of CR background in the HESS energy range
+        Lum_Fermi_CRb   :   each time step of the gamma luminosity of CR background in the Fermi energy range
+
+    Output:
+        events          :   boolean array (5, iterations, time steps) for the SB (PWN + CR) and only the CRs in the HESS energy range,
+                            the SB (PSR + CR) and only the CRs in the Fermi energy range, and no PWNe and no PSRs
+    """
+
+    return numpy.array([(Lum_HESS + Lum_pwn) > Lum_HESS_CRb,
+                        (Lum_HESS > Lum_HESS_CRb) & (Lum_pwn <= Lum_HESS_CRb),
+                        (Lum_Fermi + Lum_psr) > Lum_Fermi_CRb,
+                        (Lum_Fermi > Lum_Fermi_CRb) & (Lum_psr <= Lum_Fermi_CRb),
+                        (Lum_pwn <= 0.0) & (Lum_psr <= 0.0)])
+
 def probability(Lum_HESS, Lum_Fermi, Lum_pwn, Lum_psr, Lum_HESS_CRb, Lum_Fermi_CRb, nit_tot, number_bin_t):
 
     """
@@ -487,20 +136,69 @@ def probability(Lum_HESS, Lum_Fermi, Lum_pwn, Lum_psr, Lum_HESS_CRb, Lum_Fermi_C
         Proba_pwn_psr   :   probability to observe no PWNe and no PSRs in the SB
     """
 
-    nit_tot = float(nit_tot)
+    events = probability_events(Lum_HESS[:, :number_bin_t], Lum_Fermi[:, :number_bin_t], Lum_pwn[:, :number_bin_t], Lum_psr[:, :number_bin_t], Lum_HESS_CRb[:number_bin_t], Lum_Fermi_CRb[:number_bin_t])
+    Proba_HESS, Proba_HESS_CR, Proba_Fermi, Proba_Fermi_CR, Proba_pwn_psr = numpy.sum(events, axis = 1)/float(nit_tot)
 
-    Proba_HESS = numpy.zeros(number_bin_t)
-    Proba_HESS_CR = numpy.zeros(number_bin_t)
-    Proba_Fermi = numpy.zeros(number_bin_t)
-    Proba_Fermi_CR = numpy.zeros(number_bin_t)
-    Proba_pwn_psr = numpy.zeros(number_bin_t)
+    return Proba_HESS, Proba_HESS_CR, Proba_Fermi, Proba_Fermi_CR, Proba_pwn_psr
 
-    for i in range (number_bin_t):
+def probability_wilson(proba, nit_tot, z = 1.96):
 
-        Proba_HESS[i] = sum((Lum_HESS[:,i] + Lum_pwn[:,i]) > Lum_HESS_CRb[i])/nit_tot
-        Proba_HESS_CR[i] = sum((Lum_HESS[:,i] > Lum_HESS_CRb[i]) * (Lum_pwn[:,i] <= Lum_HESS_CRb[i]))/nit_tot
-        Proba_Fermi[i] = sum((Lum_Fermi[:,i] + Lum_psr[:,i]) > Lum_Fermi_CRb[i])/nit_tot
-        Proba_Fermi_CR[i] = sum((Lum_Fermi[:,i] > Lum_Fermi_CRb[i]) * (Lum_psr[:,i] <= Lum_Fermi_CRb[i]))/nit_tot
-        Proba_pwn_psr[i] = sum((Lum_pwn[:,i] <= 0.0) * (Lum_psr[:,i] <= 0.0))/nit_tot
+    """
+    Return the Wilson score interval of probabilities
 
-    return Proba_HESS, Proba_HESS_CR, Proba_Fermi, Proba_Fermi_CR, Proba_pwn_psr
+    Inputs:
+        proba       :   probabilities (array of any shape)
+        nit_tot     :   total number of iterations
+        z           :   quantile of the normal distribution of the confidence level (default = 1.96: 95 %)
+
+    Outputs:
+        proba_min   :   lower bound of the interval
+        proba_max   :   upper bound of the interval
+    """
+    proba = numpy.asarray(proba, dtype = float)
+    n = float(nit_tot)
+
+    center = (proba + z**2/(2 * n))/(1 + z**2/n)
+    width = z/(1 + z**2/n) * numpy.sqrt(proba * (1 - proba)/n + z**2/(4 * n**2))
+
+    return numpy.maximum(center - width, 0.0), numpy.minimum(center + width, 1.0)
+
+def probability_bootstrap(events, nboot = 1000, level = 0.95, seed = 0, chunk = 100):
+
+    """
+    Return the bootstrap confidence interval of probabilities
+    Each bootstrap sample is given by the number of times each iteration is drawn (multinomial), so all samples are computed with one matrix product
+    per chunk of time steps. The product is done in float32 (the numbers of events are integers below 2^24, so it is exact) and only one chunk
+    of the events is converted at a time, so the memory does not grow with the number of time steps.
+
+    Inputs:
+        events      :   boolean array (..., iterations, time steps) (see probability_events)
+        nboot       :   number of bootstrap samples (default = 1000)
+        level       :   confidence level (default = 0.95)
+        seed        :   seed of the bootstrap samples (default = 0)
+        chunk       :   number of time steps computed together (default = 100)
+
+    Outputs:
+        proba_min   :   lower bound of the interval, shape (..., time steps)
+        proba_max   :   upper bound of the interval, shape (..., time steps)
+    """
+    events = numpy.asarray(events)
+    nit_tot = events.shape[-2]
+    nt = events.shape[-1]
+
+    rng = numpy.random.default_rng(seed)
+    counts = rng.multinomial(nit_tot, numpy.ones(nit_tot)/nit_tot, size = nboot).astype(numpy.float32)     # (nboot, iterations)
+
+    proba_min = numpy.zeros(events.shape[:-2] + (nt,))
+    proba_max = numpy.zeros(events.shape[:-2] + (nt,))
+
+    for start in range (0, nt, chunk):
+
+        stop = min(start + chunk, nt)
+
+            # probabilities of each bootstrap sample (nboot, ..., time steps of the chunk)
+        proba_boot = numpy.tensordot(counts, events[..., start:stop].astype(numpy.float32), axes = ([1], [-2])).astype(float)/nit_tot
+
+        proba_min[..., start:stop], proba_max[..., start:stop] = numpy.quantile(proba_boot, [(1 - level)/2, (1 + level)/2], axis = 0)
+
+    return proba_min, proba_max
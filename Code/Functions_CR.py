@@ -5,10 +5,11 @@ Here are all functions needed to compute the CR
 ##----------##
 # Librairies #
 ##----------##
-import matplotlib.pyplot as plt
 import numpy
+import Parameters_system
 import scipy.integrate as integrate
 from scipy.special import erf, erfc
+from Functions_integrals import *
 
 ##-----------------------------------------##
 # Physical constants and Conversion factors #
@@ -31,10 +32,10 @@ def power_law_distribution(E):
     """
     mpgev = mp * MeV2GeV # mass of the proton in GeV
 
-    integral_E = integrate.quad(lambda E: (E**2 + 2 * mpgev * E)**(-(1 + alpha)/2.0) * (E + mpgev) * E, Emin_CR, Emax_CR)[0]
-    N0 = eta * Esng * cl**(1-alpha) * p0**(-alpha) * 1.0/integral_E         # normalization constant (GeV^-1 c)
+    integral_E = power_law_integral(Parameters_system.alpha, Emin_CR, Emax_CR)
+    N0 = eta * Esng * cl**(1-Parameters_system.alpha) * p0**(-Parameters_system.alpha) * 1.0/integral_E         # normalization constant (GeV^-1 c)
 
-    return N0/cl**(1 - alpha) * (E**2 + 2 * mpgev * E)**(-(1 + alpha)/2.0) * (E + mpgev)/p0**(-alpha)    # GeV^-1
+    return N0/cl**(1 - Parameters_system.alpha) * (E**2 + 2 * mpgev * E)**(-(1 + Parameters_system.alpha)/2.0) * (E + mpgev)/p0**(-Parameters_system.alpha)    # GeV^-1
 
 def diffusion_coefficient(E):
     """
@@ -48,7 +49,7 @@ def diffusion_coefficient(E):
         D       :       diffusion coefficient (cm^2 s^-1)
     """
     mpgev = mp * MeV2GeV  # mass of the proton in GeV
-    return D0 * (numpy.sqrt(E**2 + 2 * mpgev * E)/p0)**delta
+    return Parameters_system.D0 * (numpy.sqrt(E**2 + 2 * mpgev * E)/p0)**Parameters_system.delta
 
 def diffusion_time(L, D):
     """
@@ -86,7 +87,7 @@ def shell_particles(r_in, r_out, NE, D, deltat):
     if deltat < 1e-8 and r_in == 0:
         N = NE
 
-    elif delta < 1e-8:
+    elif Parameters_system.delta < 1e-8:
         N = numpy.zeros_like(NE)
 
     else:
@@ -122,6 +123,73 @@ def inf_particles(Rsb, NE, D, deltat):
 
     return N
 
+def diffusion_fractions(r, D, deltat):
+    """
+    Return the fractions of particles inside and outside each radius, for all times and energies in one call
+        F(x) = erf(x) - 2/sqrt(pi) * x * exp(-x^2)      :   inside r
+        G(x) = erfc(x) + 2/sqrt(pi) * x * exp(-x^2)     :   outside r (G = 1 - F without cancellation at large x)
+        with x = r/sqrt(4 * D * deltat)
+    Before the SN explosion (deltat < 1e-8 yr), all particles are at the center.
+    Inputs:
+        r           :       radius (pc), shape (number of radii) or (number of times, number of radii)
+        D           :       diffusion coefficient (cm^2 s^-1), shape (number of energies)
+        deltat      :       time after the SN explosion (yr), shape (number of times)
+    Outputs:
+        x           :       scaled radius, shape (number of times, number of radii, number of energies)
+        F           :       fraction of particles inside r, same shape as x
+        G           :       fraction of particles outside r, same shape as x
+    """
+    deltat = numpy.atleast_1d(numpy.asarray(deltat, dtype = float))
+    r = numpy.asarray(r, dtype = float) * pc2cm     # in cm
+    r = numpy.broadcast_to(r, (len(deltat), r.shape[-1]))
+
+    started = (deltat >= 1e-8)[:, numpy.newaxis, numpy.newaxis]
+    alpha = numpy.sqrt(4 * D * numpy.where(started[:, 0], deltat[:, numpy.newaxis], 1.0) * yr2s)  # in cm
+    x = r[:, :, numpy.newaxis]/alpha[:, numpy.newaxis, :]
+
+    spi = numpy.sqrt(numpy.pi)
+    gauss_term = 2/spi * x * numpy.exp(-x**2)
+    center = numpy.zeros_like(x) + (r == 0)[:, :, numpy.newaxis]
+    F = numpy.where(started, erf(x) - gauss_term, 1 - center)
+    G = numpy.where(started, erfc(x) + gauss_term, center)
+
+    return x, F, G
+
+def shell_particles_cube(r, NE, D, deltat):
+    """
+    Return the number of particles in each shell between consecutive radii, for all times and energies in one call
+    Each boundary is evaluated only once and shared by the two shells on each side of it.
+    Inputs:
+        r           :       boundaries of the shells (pc), shape (number of boundaries) or (number of times, number of boundaries)
+        NE          :       initial particles distribution (GeV^-1)
+        D           :       diffusion coefficient (cm^2 s^-1)
+        deltat      :       time after the SN explosion (yr), shape (number of times)
+    Output:
+        N           :       number of particles in each shell (GeV^-1), shape (number of times, number of boundaries - 1, number of energies)
+    """
+    x, F, G = diffusion_fractions(r, D, deltat)
+
+        # difference of the enclosed fractions close to the center and of the escaped fractions far from it
+    dF = numpy.where(x[:, :-1] < 1, numpy.diff(F, axis = 1), -numpy.diff(G, axis = 1))
+
+    return NE * dF
+
+def inf_particles_cube(Rsb, NE, D, deltat):
+    """
+    Return the number of particles outside the superbubble, for all times and energies in one call
+    Inputs:
+        Rsb         :       outer radius of the SB (pc), scalar or shape (number of times)
+        NE          :       initial particles distribution (GeV^-1)
+        D           :       diffusion coefficient (cm^2 s^-1)
+        deltat      :       time after the SN explosion (yr), shape (number of times)
+    Output:
+        N           :       number of particles outside the SB (GeV^-1), shape (number of times, number of energies)
+    """
+    deltat = numpy.atleast_1d(numpy.asarray(deltat, dtype = float))
+    Rsb = numpy.asarray(Rsb, dtype = float) * numpy.ones_like(deltat)
+
+    return NE * diffusion_fractions(Rsb[:, numpy.newaxis], D, deltat)[2][:, 0]
+
 def diffusion_spherical(delta_t, r, NE, D):
     """
     Return the density of the cosmic rays at each time and radius
@@ -1,10 +1,11 @@
 ##----------##
 # Librairies #
 ##----------##
-import matplotlib.pyplot as plt
 import numpy
+import Parameters_system
 import scipy.integrate as integrate
 from scipy.special import erf, erfc
+from Functions_integrals import *
 
 ##-----------------------------------------##
 # Physical constants and Conversion factors #
@@ -32,11 +33,11 @@ def radius_velocity_SB(t6):
 
         # Outer radius of the SB (pc)
             # R_sb = ar * n0^alphar * L36^betar * t6^gammar
-    Rsb = ar * n0**alphar * L36**betar * t6**gammar
+    Rsb = ar * Parameters_system.n0**alphar * Parameters_system.L36**betar * t6**gammar
 
         # Velocity of the forward shock
             # Vsb = dRsb/dt = av * n0^alphav * L36^betav * t6^gammav
-    Vsb = av * n0**alphav * L36**betav * t6**gammav
+    Vsb = av * Parameters_system.n0**alphav * Parameters_system.L36**betav * t6**gammav
 
     return Rsb, Vsb
 
@@ -55,13 +56,13 @@ def masses(t7, Rsb):
     """
 
         # mass within the superbubble (solar mass)
-        # integral over x of the density in the SB
-    integral_msb = integrate.quad(lambda x: (1-x)**deltan * x**2, 0, 1)[0]
-    Msb = 4*numpy.pi * (Rsb*pc2cm)**3 * an * n0**alphan * L38**betan * t7**gamman * integral_msb * mu * mpg/Msun2g
+        # integral over x of the density in the SB (Beta function B(3, deltan+1))
+    integral_msb = beta_integral(2, deltan)
+    Msb = 4*numpy.pi * (Rsb*pc2cm)**3 * an * Parameters_system.n0**alphan * Parameters_system.L38**betan * t7**gamman * integral_msb * mu * mpg/Msun2g
 
         # swept-up mass (solar mass)
         # Mswept = Volume_sb * n0 * mu * mpg
-    Mswept = 4*numpy.pi/3.0 * (Rsb*pc2cm)**3 * n0 * mu * mpg/Msun2g
+    Mswept = 4*numpy.pi/3.0 * (Rsb*pc2cm)**3 * Parameters_system.n0 * mu * mpg/Msun2g
 
     return Msb, Mswept
 
@@ -109,7 +110,7 @@ def density_thickness_shell(Vsb, Mswept, Msb, Rsb):
     """
         # density in the shell (cm^-3)
     Cs2 = kb*Ts/(mu*mpg)/(km2cm)**2             # isothermal sound speed in the shell (km2/s2)
-    ns = n0 * (Vsb**2 + C02)/Cs2                # density in the shell (cm^-3)
+    ns = Parameters_system.n0 * (Vsb**2 + C02)/Cs2                # density in the shell (cm^-3)
 
         # thickness of the shell (pc)
     Ms = (Mswept-Msb)*Msun2g                    # mass in the shell (g)
@@ -135,7 +136,7 @@ def pressure_SB(t6):
     Output:
         p       :       pressure in the SB (dyne cm^-2)
     """
-    return ap * n0**(alphap) * L36**(betap) * t6**(gammap)
+    return ap * Parameters_system.n0**(alphap) * Parameters_system.L36**(betap) * t6**(gammap)
 
 def luminosity_SB(t7, Rsb):
     """
@@ -153,8 +154,9 @@ def luminosity_SB(t7, Rsb):
     """
     at6 = at * K26K
     deltax = 2 * deltan + etal * deltat
-    integral_lsb = integrate.quad(lambda x: (1-x)**deltax * x**2, 1, 0)[0]
-    return al * zeta * (at6 * n0**alphat * L38**betat * t7**gammat)**(etal) * epsilon * (an * n0**alphan * L38**betan * t7**gamman)**2 * integral_lsb * (Rsb*pc2cm)**3 # in erg/s
+        # (for deltax <= -1 the integral diverges and the luminosity is infinite, see Functions_integrals.beta_integral)
+    integral_lsb = beta_integral(2, deltax, 1, 0)
+    return al * zeta * (at6 * Parameters_system.n0**alphat * Parameters_system.L38**betat * t7**gammat)**(etal) * epsilon * (an * Parameters_system.n0**alphan * Parameters_system.L38**betan * t7**gamman)**2 * integral_lsb * (Rsb*pc2cm)**3 # in erg/s
 
 def profile_density_temperature(t7, rsb, Rsb):
     """
@@ -174,9 +176,85 @@ def profile_density_temperature(t7, rsb, Rsb):
     x = rsb/Rsb
 
         # temperature profile (K)
-    Tsb = at * n0**alphat * L38**betat * t7**gammat * (1-x)**deltat
+    Tsb = at * Parameters_system.n0**alphat * Parameters_system.L38**betat * t7**gammat * (1-x)**deltat
 
         # density profile (cm^-3)
-    nsb = an * n0**alphan * L38**betan * t7**gamman * (1-x)**deltan
+    nsb = an * Parameters_system.n0**alphan * Parameters_system.L38**betan * t7**gamman * (1-x)**deltan
 
     return Tsb, nsb
+
+    # tables of the evolution of the SB already computed for one set of parameters (see superbubble_table)
+superbubble_cache = {}
+
+def superbubble_table(correction_factor, t6min, t6max):
+    """
+    Returns the table of the evolution of the superbubble on a logarithmic time grid (number_bin_sb time steps per decade)
+    The table is computed once for each set of parameters (n0, L36, percentage and correction factor) and extended when a larger time range is needed.
+    Inputs:
+        correction_factor   :   correction factor for the radius of the SB
+        t6min               :   first time needed (Myr)
+        t6max               :   last time needed (Myr)
+    Output:
+        table               :   dictionary with the time 't6' (Myr), the radius 'Rsb' (pc) and the velocity 'Vsb' (km/s) of the SB,
+                                the mass in the SB 'Msb' and the swept-up mass 'Mswept' (solar masses), the density 'ns' (cm^-3) and the thickness 'hs' (pc) of the shell,
+                                the pressure 'p' (dyne cm^-2) of the SB
+                                and 'log10', the log10 of the time and of the power-laws
+    """
+    key = (Parameters_system.n0, Parameters_system.L36, Parameters_system.percentage, correction_factor)
+
+        # decades covered by the table
+    lmin = numpy.floor(numpy.log10(t6min))
+    lmax = numpy.ceil(numpy.log10(t6max))
+
+    if key in superbubble_cache:
+
+        table = superbubble_cache[key]
+
+        if (table['log10']['t6'][0] <= lmin) and (table['log10']['t6'][-1] >= lmax):
+            return table
+
+        lmin = min(lmin, table['log10']['t6'][0])
+        lmax = max(lmax, table['log10']['t6'][-1])
+
+    t6 = numpy.logspace(lmin, lmax, int(round((lmax - lmin) * number_bin_sb)) + 1)     # Myr
+    t7 = t6 * s6yr27yr                                                                  # 10 Myr
+
+    Rsb, Vsb = radius_velocity_SB(t6)
+    Rsb = correction_factor * Rsb
+    Msb, Mswept = masses(t7, Rsb)
+    ns, hs = density_thickness_shell_percentage(Parameters_system.percentage, Rsb, Mswept, Msb)
+
+    table = {'t6': t6, 'Rsb': Rsb, 'Vsb': Vsb, 'Msb': Msb, 'Mswept': Mswept, 'ns': ns, 'hs': hs,
+             'p': pressure_SB(t6)}
+    table['log10'] = {name: numpy.log10(table[name]) for name in ('t6', 'Rsb', 'Vsb', 'Msb', 'Mswept', 'p')}
+
+    superbubble_cache[key] = table
+
+    return table
+
+def superbubble_state(correction_factor, t6):
+    """
+    Returns the parameters of the superbubble at some times from the table of its evolution
+    The power-laws of the Weaver's model are interpolated in log-log (exact for a power-law) and the density and the thickness of the shell
+    are computed from the interpolated radius and masses.
+    Inputs:
+        correction_factor   :   correction factor for the radius of the SB
+        t6                  :   time array (Myr)
+    Output:
+        state               :   dictionary with 'Rsb', 'Vsb', 'Msb', 'Mswept', 'ns', 'hs' and 'p' at each time (see superbubble_table)
+                                and the ambient density 'n0' (cm^-3)
+    """
+    t6 = numpy.asarray(t6, dtype = float)
+    table = superbubble_table(correction_factor, numpy.min(t6), numpy.max(t6))
+
+    logt6 = numpy.log10(t6)
+    state = {}
+
+    for name in ('Rsb', 'Vsb', 'Msb', 'Mswept', 'p'):
+
+        state[name] = 10**numpy.interp(logt6, table['log10']['t6'], table['log10'][name])
+
+    state['ns'], state['hs'] = density_thickness_shell_percentage(Parameters_system.percentage, state['Rsb'], state['Mswept'], state['Msb'])
+    state['n0'] = Parameters_system.n0 * numpy.ones_like(t6)
+
+    return state
@@ -0,0 +1,199 @@
+"""
+Here are all functions needed to compute the gamma-ray luminosities and the photon spectral indices in the energy bands of the instruments
+
+Each registered band has its integration weights over the gamma energies (see Functions_quadrature.py), so the luminosities and the spectral indices of all bands
+are given by one matrix product over the intrinsic differential luminosity, whatever the number of iterations and time steps.
+A new band (e.g. CTA or LHAASO) only needs one call to band_register.
+The error introduced by a reduced storage precision (see Functions_store.store_encode) on the results of the bands is given by band_precision_errors.
+"""
+
+##----------##
+# Librairies #
+##----------##
+import numpy
+from Functions_store import *
+
+##-----------------------------------------##
+# Physical constants and Conversion factors #
+##-----------------------------------------##
+from Physical_constants import *
+from Conversion_factors import *
+from Parameters_system import *
+
+##---------##
+# Functions #
+##---------##
+
+    # registered energy bands: minimum and maximum energies (GeV) of each band
+energy_bands = {}
+
+    # weights already computed for one energy array and the registered bands (see band_weights)
+band_cache = {}
+
+def band_register(name, Emin, Emax):
+    """
+    Register an energy band
+
+    Inputs:
+        name    :   name of the band (the results are 'Lum_' + name and 'Gamma_' + name)
+        Emin    :   minimum energy of the band (GeV)
+        Emax    :   maximum energy of the band (GeV)
+    """
+    energy_bands[name] = (Emin, Emax)
+    band_cache.clear()
+
+    return
+
+band_register('HESS', 1 * TeV2GeV, 10 * TeV2GeV)       # H.E.S.S.: 1 TeV to 10 TeV
+band_register('Fermi', 100 * MeV2GeV, 100)              # Fermi: 100 MeV to 100 GeV
+band_register('GeV', 1, 10)                             # 1 GeV to 10 GeV
+band_register('MeV', 100 * MeV2GeV, 1)                  # 100 MeV to 1 GeV
+
+    # minimal number of nodes per decade of a 'gauss' grid for the weights of the bands (relative errors about 1e-2 at 3 nodes per decade,
+    # 2e-3 at 5, above 3e-2 below 3: see Quadrature_study.py)
+band_gauss_density = 3.0
+
+def band_weights(energy = spectrum, quadrature = energy_quadrature):
+    """
+    Return the weights of the registered bands for one energy array
+        Lum = sum_E W[E, k] * Flux(E) for the band k
+    and the selection of the first and last energies of each band (for the spectral indices).
+
+    Inputs:
+        energy      :   energy array of the gamma photons (GeV) (default = spectrum)
+        quadrature  :   quadrature of the energy array (see Functions_quadrature.log_quadrature_band) (default = energy_quadrature),
+                        with 'gauss' a warning is printed below band_gauss_density nodes per decade
+
+    Output:
+        weights     :   dictionary with the names of the bands 'names', the matrix 'W' (number of energies, 3 * number of bands) with the integration
+                        weights (erg eV) followed by the selections of the first and of the last energy of each band,
+                        and the first 'Emin' and last 'Emax' energies of each band (GeV)
+    """
+    energy = numpy.asarray(energy, dtype = float)
+    names = sorted(energy_bands)
+    key = (energy.tobytes(), quadrature, tuple((name, energy_bands[name]) for name in (names)))
+
+    if key in band_cache:
+        return band_cache[key]
+
+    if (quadrature == 'gauss') and (len(energy) - 1 < band_gauss_density * numpy.log10(energy[-1]/energy[0])):
+        print('warning: %d gauss nodes over %.1f decades, the luminosities of the bands are not accurate (at least %.0f nodes per decade)'
+              %(len(energy), numpy.log10(energy[-1]/energy[0]), band_gauss_density))
+
+    energy_erg = energy * 1.0/erg2GeV           # erg
+
+    nb = len(names)
+    W = numpy.zeros((len(energy), 3 * nb))
+    Emin = numpy.zeros(nb)
+    Emax = numpy.zeros(nb)
+
+    for k in range (nb):
+
+        indE = numpy.where((energy >= energy_bands[names[k]][0]) & (energy <= energy_bands[names[k]][1]))[0]
+
+        if len(indE) == 0:
+            raise ValueError('no energy of the array in the band %s' %names[k])
+
+            # integration weights (eV) times the energy (erg)
+        W[:, k] = log_quadrature_band(energy, energy_bands[names[k]][0], energy_bands[names[k]][1], quadrature) * GeV2eV * energy_erg
+
+            # first and last energies of the band
+        W[indE[0], nb + k] = 1.0
+        W[indE[-1], 2 * nb + k] = 1.0
+        Emin[k] = energy[indE[0]]
+        Emax[k] = energy[indE[-1]]
+
+    weights = {'names': names, 'W': W, 'Emin': Emin, 'Emax': Emax}
+    band_cache[key] = weights
+
+    return weights
+
+def band_quantities(Flux, energy = spectrum, quadrature = energy_quadrature):
+    """
+    Return the gamma-ray luminosities and the photon spectral indices of all registered bands
+
+    Inputs:
+        Flux        :   intrinsic differential luminosity (eV^-1 s^-1), the last axis is the energy axis (e.g. iteration, time, energy)
+        energy      :   energy array of the gamma photons (GeV) (default = spectrum)
+        quadrature  :   quadrature of the energy array (default = energy_quadrature)
+
+    Output:
+        bands       :   dictionary with, for each band, the gamma-ray luminosity 'Lum_' + name (erg s^-1)
+                        and the photon spectral index between its first and last energies 'Gamma_' + name
+    """
+    weights = band_weights(energy, quadrature)
+    names = weights['names']
+    nb = len(names)
+
+    product = numpy.dot(Flux, weights['W'])
+    lum = numpy.nan_to_num(product[..., :nb])
+
+    with numpy.errstate(divide = 'ignore', invalid = 'ignore'):
+
+        Gamma = -(numpy.log(product[..., 2 * nb:]) - numpy.log(product[..., nb:2 * nb]))/numpy.log(weights['Emax']/weights['Emin'])
+
+    Gamma = numpy.nan_to_num(Gamma)
+
+    bands = {}
+
+    for k in range (nb):
+
+        bands['Lum_' + names[k]] = lum[..., k]
+        bands['Gamma_' + names[k]] = Gamma[..., k]
+
+    return bands
+
+def relative_error(values, reference):
+    """
+    Return the maximal relative error of an array (only where the reference is not zero)
+
+    Inputs:
+        values      :   array
+        reference   :   reference array
+
+    Output:
+        error       :   maximal relative error
+    """
+    ind = reference != 0
+
+    if not numpy.any(ind):
+        return 0.0
+
+    return numpy.max(numpy.abs(values[ind]/reference[ind] - 1))
+
+def band_precision_errors(Flux, precision, offset = None, energy = spectrum, quadrature = energy_quadrature):
+    """
+    Return the maximal relative errors introduced by a storage precision on the intrinsic differential luminosity and on the results of all registered bands
+    For each band, it is the largest error of the results computed from the stored intrinsic differential luminosity and of the stored results
+    (the spectral indices are stored with the precision Functions_store.store_signed[precision] and the offsets are the ones of the units, see Functions_store.store_offset).
+
+    Inputs:
+        Flux        :   intrinsic differential luminosity (eV^-1 s^-1), the last axis is the energy axis (e.g. time, energy)
+        precision   :   storage precision (see Functions_store.store_encode)
+        offset      :   offset of the logarithmic precision of Flux (default = None: Functions_store.store_offset(Flux, 'eV^-1 s^-1'))
+        energy      :   energy array of the gamma photons (GeV) (default = spectrum)
+        quadrature  :   quadrature of the energy array (default = energy_quadrature)
+
+    Output:
+        errors      :   dictionary with the maximal relative error of 'Flux' and of 'Lum_' + name and 'Gamma_' + name for each band
+    """
+    Flux = numpy.asarray(Flux, dtype = float)
+    if offset is None:
+        offset = store_offset(Flux, 'eV^-1 s^-1')
+
+    Flux_stored = store_decode(store_encode(Flux, precision, offset), precision, offset)
+
+    reference = band_quantities(Flux, energy, quadrature)
+    from_flux = band_quantities(Flux_stored, energy, quadrature)
+
+    errors = {'Flux': relative_error(Flux_stored, Flux)}
+
+    for name in (reference):
+
+        precision_name = precision if name.startswith('Lum_') else store_signed[precision]
+        offset_name = store_offset(reference[name], 'erg s^-1')
+        stored = store_decode(store_encode(reference[name], precision_name, offset_name), precision_name, offset_name)
+
+        errors[name] = max(relative_error(from_flux[name], reference[name]), relative_error(stored, reference[name]))
+
+    return errors
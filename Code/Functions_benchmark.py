@@ -0,0 +1,308 @@
+"""
+Here are all functions needed to time the physics functions (micro-benchmarks) and to compare the timings to a baseline
+
+Each case is one function called with arrays of realistic sizes (10 to 1000 energy bins, 1 to 10^4 time points).
+The timings are written in a JSON file (baseline) and a new run flags the cases which are slower than the baseline by more than a threshold.
+The import of the modules of the computation is timed too, in a new interpreter, and must not load the plotting stack nor naima and astropy.
+"""
+
+##----------##
+# Librairies #
+##----------##
+import json
+import os
+import platform
+import subprocess
+import sys
+import timeit
+import numpy
+from Functions_gamma import *
+
+##-----------------------------------------##
+# Physical constants and Conversion factors #
+##-----------------------------------------##
+from Physical_constants import *
+from Conversion_factors import *
+from Parameters_system import *
+
+##---------##
+# Functions #
+##---------##
+
+    # numbers of energy bins and of time points of the cases
+benchmark_energies = [10, 100, 1000]
+benchmark_times = [1, 100, 10000]
+
+    # modules of the computation (imported by Iterations.py, Sweep.py and their workers) and the packages that they must not load at import
+benchmark_modules = ['Functions_gamma', 'Functions_iterations', 'Functions_sweep']
+benchmark_heavy = ['matplotlib', 'mpl_toolkits', 'naima', 'astropy']
+
+    # heavy packages loaded by the import of each module of the computation during the last benchmark_run (empty if none)
+benchmark_heavy_loaded = {}
+
+def benchmark_cases():
+    """
+    Return the cases of the benchmark
+
+    Output:
+        cases   :   dictionary with, for each case (e.g. 'masses[nt=100]'), the function to time and its arguments
+    """
+    cases = {}
+
+        # Particles distribution and diffusion coefficient for nE energies
+    Rsb = 80.0                  # pc
+    hs = 0.2 * Rsb              # pc
+    deltat = 1e5                # yr
+    tsn = 5e6                   # yr
+
+    for nE in (benchmark_energies):
+
+        E = numpy.logspace(numpy.log10(Emin_CR), numpy.log10(Emax_CR), nE)   # GeV
+        NE = power_law_distribution(E)
+        D = diffusion_coefficient(E)
+
+        cases['diffusion_coefficient[nE=%d]' %nE] = (diffusion_coefficient, (E,))
+        cases['shell_particles[nE=%d]' %nE] = (shell_particles, (Rsb - hs, Rsb, NE, D, deltat))
+        cases['inf_particles[nE=%d]' %nE] = (inf_particles, (Rsb, NE, D, deltat))
+
+        for nt in (benchmark_times):
+
+                # at most 10^6 values in one array
+            if nE * nt > 1e6:
+                continue
+
+            delta_t = numpy.logspace(2, 7, nt)                                          # yr
+            r_bound = numpy.column_stack((numpy.zeros(nt), numpy.full(nt, Rsb - hs), numpy.full(nt, Rsb)))
+
+            cases['shell_particles_cube[nE=%d,nt=%d]' %(nE, nt)] = (shell_particles_cube, (r_bound, NE, D, delta_t))
+            cases['inf_particles_cube[nE=%d,nt=%d]' %(nE, nt)] = (inf_particles_cube, (Rsb, NE, D, delta_t))
+
+        # Parameters of the SB, luminosities and spectral indices for nt time points
+    for nt in (benchmark_times):
+
+        t6 = numpy.logspace(0, 1, nt)       # Myr
+        t7 = t6 * s6yr27yr                  # 10 Myr
+        Rsb_t = radius_velocity_SB(t6)[0]   # pc
+        time = tsn + numpy.logspace(2, 6, nt)   # yr
+
+        cases['radius_velocity_SB[nt=%d]' %nt] = (radius_velocity_SB, (t6,))
+        cases['masses[nt=%d]' %nt] = (masses, (t7, Rsb_t))
+        cases['spectral_index[nt=%d]' %nt] = (spectral_index, (1e3, 1e4, numpy.full(nt, 1e30), numpy.full(nt, 1e28)))
+        cases['pwn_emission[nt=%d]' %nt] = (lambda time: [pwn_emission(tsn, ti) for ti in (time)], (time,))
+        cases['psr_emission[nt=%d]' %nt] = (lambda time: [psr_emission(tsn, ti) for ti in (time)], (time,))
+
+        for nE in (benchmark_energies):
+
+            if nE * nt > 1e6:
+                continue
+
+            energy = numpy.logspace(8, 14, nE)              # eV
+            lum_energy = numpy.ones((nt, nE)) * energy**(-1.2)
+
+            cases['luminosity[nE=%d,nt=%d]' %(nE, nt)] = (luminosity, (lum_energy, energy))
+
+        # One pion-decay evaluation (naima and precomputed kernel)
+    import astropy.units as units
+    from naima.models import PionDecay, TableModel
+
+    NE = power_law_distribution(ECR)
+    model = TableModel(ECR * units.GeV, NE * 1/units.GeV, amplitude = 1)
+    PD = PionDecay(model, nh = 10 * 1/units.cm**3, nuclear_enhancement = True, useLUT = False)
+    PD._memoize = False         # naima would take the flux from its cache after the first call
+    kernel = pion_decay_kernel(ECR, spectrum)
+
+    cases['PionDecay.flux[nE=%d]' %len(spectrum)] = (lambda: PD.flux(spectrum * units.GeV, distance = 0 * units.pc), ())
+
+    for nt in (benchmark_times):
+
+        cases['pion_decay_flux[nE=%d,nt=%d]' %(len(spectrum), nt)] = (pion_decay_flux, (numpy.ones((nt, 1)) * NE, 10.0, kernel))
+
+        # Overhead of the astropy Quantities of the former inner loop (one naima model per time step, without its flux), removed from the unit-free core
+    def quantity_wrapping(N, nh):
+
+        for i in range (len(nh)):
+
+            model = TableModel(ECR * units.GeV, N[i] * 1/units.GeV, amplitude = 1)
+            PionDecay(model, nh = nh[i] * 1/units.cm**3, nuclear_enhancement = True, useLUT = False)
+            numpy.asarray(spectrum * units.GeV), 0 * units.pc
+
+        return
+
+    for nt in (benchmark_times):
+
+            # at most 100 time points (about 1 s for 10^4)
+        if nt > 100:
+            continue
+
+        cases['quantity_wrapping[nE=%d,nt=%d]' %(len(spectrum), nt)] = (quantity_wrapping, (numpy.ones((nt, 1)) * NE, numpy.full(nt, 10.0)))
+
+        # Particles content and pion-decay emission of the three zones in one pass (table of the cavity computed before the timing)
+    D = diffusion_coefficient(ECR)
+    cavity_table()
+
+    for nt in (benchmark_times):
+
+            # at most 10^7 values on the proton grid of the kernel
+        if 3 * nt * len(kernel['Ep']) > 1e7:
+            continue
+
+        t6 = numpy.logspace(0, 1, nt)       # Myr
+        state = superbubble_state(1.0, t6)
+        delta_t = numpy.logspace(2, 6, nt)  # yr
+
+        cases['zone_emission[zones=1,2,3,nt=%d]' %nt] = (zone_emission, ([1, 2, 3], NE, D, delta_t, state, t6 * s6yr27yr, kernel))
+
+    return cases
+
+def benchmark_time(function, arguments, repeat = 3):
+    """
+    Return the time of one call of a function (best of several repetitions, each one long enough to be measured)
+
+    Inputs:
+        function    :   function to time
+        arguments   :   arguments of the function
+        repeat      :   number of repetitions (default = 3)
+
+    Output:
+        duration    :   time of one call (s)
+    """
+    timer = timeit.Timer(lambda: function(*arguments))
+    number = timer.autorange()[0]
+
+    return min(timer.repeat(repeat, number))/number
+
+def benchmark_import(module, repeat = 3):
+    """
+    Return the time of the import of a module in a new interpreter (best of several repetitions) and the heavy packages that it loads
+
+    Inputs:
+        module      :   name of the module (e.g. 'Functions_gamma')
+        repeat      :   number of repetitions (default = 3)
+
+    Outputs:
+        duration    :   time of the import (s)
+        loaded      :   packages of benchmark_heavy loaded by the import
+    """
+    code = ('import sys, time\n'
+            'start = time.perf_counter()\n'
+            'import %s\n'
+            'print(time.perf_counter() - start)\n'
+            'print(" ".join(sorted(set(name.split(".")[0] for name in sys.modules))))' %module)
+
+    durations = []
+
+    for k in range (repeat):
+
+        output = subprocess.run([sys.executable, '-c', code], cwd = os.path.dirname(os.path.abspath(__file__)),
+                                capture_output = True, text = True, check = True).stdout.split('\n')
+        durations.append(float(output[0]))
+
+    loaded = [package for package in (benchmark_heavy) if package in output[1].split()]
+
+    return min(durations), loaded
+
+def benchmark_run(names = None, repeat = 3):
+    """
+    Return the timings of the cases of the benchmark (with the import of the modules of the computation, 'import[module]')
+    The heavy packages loaded by these imports are kept in benchmark_heavy_loaded.
+
+    Inputs:
+        names       :   names of the cases to run, or part of them (e.g. 'masses') (default = None: all cases)
+        repeat      :   number of repetitions of each case (default = 3)
+
+    Output:
+        results     :   dictionary with the time of one call of each case (s)
+    """
+    cases = benchmark_cases()
+    results = {}
+
+    for name in sorted(cases):
+
+        if (names is not None) and not any([selection in name for selection in (names)]):
+            continue
+
+        function, arguments = cases[name]
+        results[name] = benchmark_time(function, arguments, repeat)
+
+    benchmark_heavy_loaded.clear()
+
+    for module in (benchmark_modules):
+
+        name = 'import[%s]' %module
+
+        if (names is not None) and not any([selection in name for selection in (names)]):
+            continue
+
+        results[name], loaded = benchmark_import(module, repeat)
+
+        if len(loaded) > 0:
+            benchmark_heavy_loaded[module] = loaded
+
+    return results
+
+def benchmark_write(path, results):
+    """
+    Write the timings in a JSON file (baseline), with the description of the machine
+
+    Inputs:
+        path        :   name of the JSON file
+        results     :   timings of the cases (see benchmark_run)
+    """
+    baseline = {'machine': {'platform': platform.platform(), 'processor': platform.processor(), 'python': platform.python_version(), 'numpy': numpy.__version__},
+                'cases': results}
+
+    with open(path + '.tmp', 'w') as benchmark_dump:
+
+        json.dump(baseline, benchmark_dump, indent = 1, sort_keys = True)
+
+    os.replace(path + '.tmp', path)
+
+    return
+
+def benchmark_read(path):
+    """
+    Return the timings of a JSON file (baseline)
+
+    Input:
+        path        :   name of the JSON file
+
+    Output:
+        results     :   timings of the cases (s)
+    """
+    with open(path, 'r') as benchmark_load:
+
+        return json.load(benchmark_load)['cases']
+
+def benchmark_compare(results, baseline, threshold = 0.25, noise = 1e-5):
+    """
+    Return the cases slower than the baseline by more than a threshold (and print the comparison of all cases)
+
+    Inputs:
+        results     :   timings of the cases (s)
+        baseline    :   timings of the baseline (s)
+        threshold   :   relative slowdown flagged as a regression (default = 0.25: 25 % slower)
+        noise       :   slowdowns smaller than noise are never flagged (timing noise of the fastest cases) (default = 1e-5 s)
+
+    Output:
+        regressions :   list of (name of the case, time of the baseline, time of the run) for each regression
+    """
+    regressions = []
+
+    print('%-45s %12s %12s %8s' %('case', 'baseline(s)', 'run(s)', 'ratio'))
+
+    for name in sorted(results):
+
+        if name not in baseline:
+            print('%-45s %12s %12.3e %8s' %(name, '-', results[name], 'new'))
+            continue
+
+        ratio = results[name]/baseline[name]
+        flag = ''
+
+        if (ratio > 1 + threshold) and (results[name] - baseline[name] > noise):
+            regressions.append((name, baseline[name], results[name]))
+            flag = '  REGRESSION'
+
+        print('%-45s %12.3e %12.3e %8.2f%s' %(name, baseline[name], results[name], ratio, flag))
+
+    return regressions
@@ -0,0 +1,214 @@
+"""
+Here are all functions needed to compute the gamma emission of the cavity of the superbubble (zone 1) without cutting it into shells
+
+The pion-decay emission is linear in the density of the gas times the particles distribution, so only the density-weighted number of particles in the cavity is needed
+    int_0^(Rsb-hs) n(r) dN/dr dr = n(0) * N(E) * Phi(s, eta)
+with the density profile of Mac Low and McCray (1987), n(r) = n(0) * (1 - r/Rsb)^deltan, the gaussian profile of the particles (see Functions_CR.diffusion_fractions),
+the scaled radius of the SB s = Rsb/sqrt(4 * D * deltat) and the relative thickness of the shell eta = hs/Rsb:
+    Phi(s, eta) = int_0^(1-eta) (1 - u)^deltan * 4/sqrt(pi) * s^3 * u^2 * exp(-s^2 * u^2) du
+Phi is tabulated once (for each deltan) and the cavity costs about the same as the supershell.
+The former discretization of the cavity into 15 shells (cavity_shells) is kept to measure the accuracy of both against a fine shell grid (see cavity_accuracy).
+"""
+
+##----------##
+# Librairies #
+##----------##
+import numpy
+import scipy.integrate as integrate
+from scipy.interpolate import RectBivariateSpline
+from Functions_SB import *
+from Functions_CR import *
+from Functions_kernel import *
+
+##-----------------------------------------##
+# Physical constants and Conversion factors #
+##-----------------------------------------##
+from Physical_constants import *
+from Conversion_factors import *
+from Parameters_system import *
+
+##---------##
+# Functions #
+##---------##
+
+    # grid of the table of Phi: log10 of the scaled radius of the SB and relative thickness of the shell
+cavity_log10_s = numpy.linspace(-3, 5, 161)
+cavity_eta = numpy.linspace(0.01, 0.95, 95)
+
+    # tables of Phi already computed for one exponent of the density profile (see cavity_table)
+cavity_cache = {}
+
+def cavity_table(exponent = deltan):
+    """
+    Return the table of Phi, the density-weighted fraction of the particles in the cavity of the SB (relative to the density at the center)
+
+    Input:
+        exponent    :   exponent of the density profile in the SB (default = deltan)
+
+    Output:
+        table       :   dictionary with the grid 'log10_s' and 'eta', the values 'Phi' and the bicubic spline of log10(Phi) 'spline'
+    """
+    if exponent in cavity_cache:
+        return cavity_cache[exponent]
+
+    s = 10**cavity_log10_s
+    scale = numpy.minimum(s**3, 1.0)            # Phi ~ s^3 for small s: all values of the integral are of the order of 1
+
+    def integrand(u):
+
+        return (1 - u)**exponent * 4/numpy.sqrt(numpy.pi) * s**3/scale * u**2 * numpy.exp(-(s * u)**2)
+
+    Phi = numpy.zeros((len(s), len(cavity_eta)))
+
+    for j in range (len(cavity_eta)):
+
+        Phi[:, j] = integrate.quad_vec(integrand, 0, 1 - cavity_eta[j], epsrel = 1e-8, norm = 'max')[0] * scale
+
+    table = {'log10_s': cavity_log10_s, 'eta': cavity_eta, 'Phi': Phi,
+             'spline': RectBivariateSpline(cavity_log10_s, cavity_eta, numpy.log10(Phi))}
+    cavity_cache[exponent] = table
+
+    return table
+
+def cavity_fraction(s, eta, exponent = deltan):
+    """
+    Return Phi, the density-weighted fraction of the particles in the cavity of the SB (relative to the density at the center)
+    Below the table Phi follows s^3, above it Phi is the one of the last scaled radius (all particles are close to the center).
+
+    Inputs:
+        s           :   scaled radius of the SB Rsb/sqrt(4 * D * deltat)
+        eta         :   relative thickness of the shell hs/Rsb, broadcastable to s (from cavity_eta[0] to cavity_eta[-1])
+        exponent    :   exponent of the density profile in the SB (default = deltan)
+
+    Output:
+        Phi         :   density-weighted fraction, same shape as s
+    """
+    table = cavity_table(exponent)
+
+    log10_s = numpy.log10(numpy.asarray(s, dtype = float))
+    eta = numpy.asarray(eta, dtype = float) * numpy.ones_like(log10_s)
+
+    log10_s_grid = numpy.clip(log10_s, table['log10_s'][0], table['log10_s'][-1])
+    eta_grid = numpy.clip(eta, table['eta'][0], table['eta'][-1])
+
+    log10_Phi = table['spline'].ev(log10_s_grid, eta_grid)
+    log10_Phi += 3 * numpy.minimum(log10_s - table['log10_s'][0], 0)
+
+    return 10**log10_Phi
+
+def cavity_particles(NE, D, deltat, Rsb, hs, t7):
+    """
+    Return the density-weighted particles distribution of the cavity of the SB, for all times and energies in one call
+        int_0^(Rsb-hs) n(r) dN/dr dr = n(0) * N(E) * Phi(s, eta)
+    The pion-decay emission of the cavity is then pion_decay_flux(cavity_particles(...), 1, kernel).
+    Before the SN explosion (deltat < 1e-8 yr), all particles are at the center.
+
+    Inputs:
+        NE          :   initial particles distribution (GeV^-1)
+        D           :   diffusion coefficient (cm^2 s^-1)
+        deltat      :   time after the SN explosion (yr), shape (number of times)
+        Rsb         :   outer radius of the SB (pc), shape (number of times)
+        hs          :   thickness of the shell (pc), shape (number of times)
+        t7          :   age of the SB (10 Myr), shape (number of times)
+
+    Output:
+        nN          :   density of the gas times the particles distribution (cm^-3 GeV^-1), shape (number of times, number of energies)
+    """
+    deltat = numpy.atleast_1d(numpy.asarray(deltat, dtype = float))
+    Rsb = numpy.asarray(Rsb, dtype = float) * numpy.ones_like(deltat)
+    hs = numpy.asarray(hs, dtype = float) * numpy.ones_like(deltat)
+    t7 = numpy.asarray(t7, dtype = float) * numpy.ones_like(deltat)
+
+        # scaled radius of the SB (the largest one of the table before the SN explosion)
+    started = (deltat >= 1e-8)[:, numpy.newaxis]
+    length = numpy.sqrt(4 * D * numpy.where(started, deltat[:, numpy.newaxis], 1.0) * yr2s)     # cm
+    s = numpy.where(started, Rsb[:, numpy.newaxis] * pc2cm/length, 10**cavity_log10_s[-1])
+
+        # density at the center of the SB (cm^-3)
+    n_center = profile_density_temperature(t7, 0.0, Rsb)[1]
+
+    return n_center[:, numpy.newaxis] * NE * cavity_fraction(s, (hs/Rsb)[:, numpy.newaxis])
+
+def cavity_shells(NE, D, deltat, Rsb, hs, t7, number_bin_r = 15):
+    """
+    Return the density-weighted particles distribution of the cavity of the SB cut into shells (former computation of the zone 1)
+    The boundaries of the shells are logarithmic from 0.01 pc to Rsb - hs (after a first shell from 0 to 0.01 pc) and the density of each shell is the one of its outer boundary.
+
+    Inputs:
+        NE              :   initial particles distribution (GeV^-1)
+        D               :   diffusion coefficient (cm^2 s^-1)
+        deltat          :   time after the SN explosion (yr), shape (number of times)
+        Rsb             :   outer radius of the SB (pc), shape (number of times)
+        hs              :   thickness of the shell (pc), shape (number of times)
+        t7              :   age of the SB (10 Myr), shape (number of times)
+        number_bin_r    :   number of shells from 0 to Rsb - hs (default = 15)
+
+    Output:
+        nN              :   density of the gas times the particles distribution (cm^-3 GeV^-1), shape (number of times, number of energies)
+    """
+    deltat = numpy.atleast_1d(numpy.asarray(deltat, dtype = float))
+    Rsb = numpy.asarray(Rsb, dtype = float) * numpy.ones_like(deltat)
+    hs = numpy.asarray(hs, dtype = float) * numpy.ones_like(deltat)
+    t7 = numpy.asarray(t7, dtype = float) * numpy.ones_like(deltat)
+
+    rmin = 0.01                                                                             # pc
+    r = numpy.logspace(numpy.log10(rmin), numpy.log10(Rsb - hs), number_bin_r, axis = 1)    # pc
+    N_shells = shell_particles_cube(numpy.column_stack((numpy.zeros(len(deltat)), r)), NE, D, deltat)
+
+        # density at the outer boundary of each shell (cm^-3)
+    ngas = profile_density_temperature(t7[:, numpy.newaxis], r, Rsb[:, numpy.newaxis])[1]
+
+    return (ngas[:, :, numpy.newaxis] * N_shells).sum(axis = 1)
+
+def cavity_accuracy(NE, D, deltat, Rsb, hs, t7, kernel, shells = (15, 60, 240, 960), reference = 3840):
+    """
+    Return the accuracy of the analytic cavity (cavity_particles) and of the cavity cut into shells (cavity_shells) compared to a fine shell grid
+    The shells converge as 1/number_bin_r (density of the outer boundary). For one SN at 1 Myr seen from 1 yr to 10 Myr after the explosion
+    (10 CR bins, 20 gamma bins), with the reference of 3840 shells:
+        cavity      flux        lum
+        analytic    1.0e-03     4.8e-04
+        15          2.3e-01     1.8e-01
+        60          6.5e-02     3.3e-02
+        240         1.5e-02     7.3e-03
+        960         3.0e-03     1.4e-03
+    and with 15360 shells the analytic cavity is within 2.5e-4 (flux) and 1.2e-4 (lum): the error of the analytic cavity is the one of the reference.
+    The 15 shells of the former zone 1 underestimate its luminosity by up to 18 %, which is the change of the luminosities of the zone 1.
+
+    Inputs:
+        NE          :   initial particles distribution (GeV^-1)
+        D           :   diffusion coefficient (cm^2 s^-1)
+        deltat      :   time after the SN explosion (yr), shape (number of times)
+        Rsb         :   outer radius of the SB (pc), shape (number of times)
+        hs          :   thickness of the shell (pc), shape (number of times)
+        t7          :   age of the SB (10 Myr), shape (number of times)
+        kernel      :   pion-decay kernel (see Functions_kernel.pion_decay_kernel)
+        shells      :   numbers of shells compared to the reference (default = (15, 60, 240, 960))
+        reference   :   number of shells of the reference (default = 3840)
+
+    Output:
+        errors      :   dictionary with, for 'analytic' and each number of shells, the maximal relative errors on the intrinsic differential luminosity
+                        of the gamma energies 'flux' and on the gamma luminosity 'lum' (100 MeV to 100 TeV)
+    """
+    def emission(nN):
+
+        flux = pion_decay_flux(nN, 1.0, kernel)                     # eV^-1 s^-1
+        return flux, numpy.dot(flux * spectrum_erg, spectrum_weights_ev)    # erg s^-1
+
+    flux_ref, lum_ref = emission(cavity_shells(NE, D, deltat, Rsb, hs, t7, reference))
+
+    cases = [('analytic', cavity_particles(NE, D, deltat, Rsb, hs, t7))]
+    cases += [(number_bin_r, cavity_shells(NE, D, deltat, Rsb, hs, t7, number_bin_r)) for number_bin_r in (shells)]
+
+    errors = {}
+
+    print('%-10s %12s %12s' %('cavity', 'flux', 'lum'))
+
+    for name, nN in (cases):
+
+        flux, lum = emission(nN)
+        ind = flux_ref > 0
+        errors[name] = {'flux': numpy.max(numpy.abs(flux[ind]/flux_ref[ind] - 1)), 'lum': numpy.max(numpy.abs(lum[lum_ref > 0]/lum_ref[lum_ref > 0] - 1))}
+
+        print('%-10s %12.2e %12.2e' %(name, errors[name]['flux'], errors[name]['lum']))
+
+    return errors
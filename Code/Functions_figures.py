@@ -0,0 +1,132 @@
+"""
+Here are all functions needed to render the figures of the Plotting programs without display (Agg backend), several figures at the same time
+
+Each figure is described by a spec: the name of its PDF file and the list of the calls which draw it, either a plotting function of Functions_plot.py
+(e.g. semilog_plot, without the figure number) or a function of matplotlib.pyplot (e.g. fill_between). The specs are rendered by a pool of workers
+and each figure is closed as soon as it is saved, so the Plotting programs run unattended on batch nodes (no plt.show()).
+"""
+
+##----------##
+# Librairies #
+##----------##
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import multiprocessing
+import os
+import traceback
+from Functions_plot import *
+
+##---------##
+# Functions #
+##---------##
+
+    # plotting functions of Functions_plot.py which can be called in a spec (their first argument, the figure number, is given by figure_render)
+figure_functions = {'log_plot': log_plot, 'plot': plot, 'semilog_plot': semilog_plot, 'log_plot_multi': log_plot_multi,
+                    'plot_multi': plot_multi, 'histogramme': histogramme}
+
+def figure_call(name, *args, **kwargs):
+    """
+    Return one call of the spec of a figure
+
+    Inputs:
+        name    :   name of a plotting function of Functions_plot.py (see figure_functions) or of matplotlib.pyplot (e.g. 'fill_between')
+        args    :   positional arguments of the function (without the figure number for the functions of Functions_plot.py)
+        kwargs  :   keyword arguments of the function
+
+    Output:
+        call    :   tuple (name, args, kwargs)
+    """
+
+    return (name, args, kwargs)
+
+def figure_spec(path, calls):
+    """
+    Return the spec of one figure
+
+    Inputs:
+        path    :   name of the PDF file of the figure
+        calls   :   calls which draw the figure, in this order (see figure_call)
+
+    Output:
+        spec    :   dictionary with the name of the file 'path' and the calls 'calls'
+    """
+
+    return {'path': path, 'calls': list(calls)}
+
+def figure_render(spec):
+    """
+    Draw one figure, save it and close it
+    The rcParams changed by the plotting functions of Functions_plot.py (marker and style of the lines) are restored after the figure.
+
+    Input:
+        spec    :   spec of the figure (see figure_spec)
+
+    Outputs:
+        path    :   name of the PDF file of the figure
+        error   :   None if the figure is saved, otherwise the traceback of the error
+    """
+    error = None
+
+    with plt.rc_context():
+
+        fig = plt.figure(figsize = figsize)
+
+        try:
+
+            for name, args, kwargs in (spec['calls']):
+
+                if name in figure_functions:
+                    figure_functions[name](fig.number, *args, **kwargs)
+
+                else:
+                    getattr(plt, name)(*args, **kwargs)
+
+            if os.path.dirname(spec['path']) != '':
+                os.makedirs(os.path.dirname(spec['path']), exist_ok = True)
+
+            fig.savefig(spec['path'])
+
+        except Exception:
+
+            error = traceback.format_exc()
+
+        finally:
+
+            plt.close(fig)
+
+    return spec['path'], error
+
+def render_figures(specs, nworkers = 1):
+    """
+    Render the figures of a list of specs, shared between nworkers processes (forked so that the program is not executed again in each worker)
+    A figure which cannot be drawn does not stop the others: its error is printed and returned.
+
+    Inputs:
+        specs       :   specs of the figures (see figure_spec)
+        nworkers    :   number of worker processes (default = 1: no parallelisation)
+
+    Output:
+        errors      :   dictionary with the traceback of the error of each figure which is not saved (empty if all figures are saved)
+    """
+    if nworkers <= 1:
+
+        results = [figure_render(spec) for spec in (specs)]
+
+    else:
+
+        context = multiprocessing.get_context('fork')
+
+        with context.Pool(nworkers) as pool:
+
+            results = pool.map(figure_render, specs, chunksize = 1)
+
+    errors = {path: error for path, error in (results) if error is not None}
+
+    for path in (errors):
+
+        print('figure %s not saved:\n%s' %(path, errors[path]))
+
+    print('%d figure(s) saved, %d error(s)' %(len(results) - len(errors), len(errors)))
+
+    return errors
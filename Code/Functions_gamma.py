@@ -1,18 +1,19 @@
 ##------------------------##
 # Librairies and functions #
 ##------------------------##
-import matplotlib.pyplot as plt
 import numpy
 import scipy.integrate as integrate
-import astropy.units as units
-from astropy.io import ascii
 import os
 import pickle
-import naima
-from naima.models import PionDecay, TableModel
+import Parameters_system
 from Functions import *
 from Functions_CR import *
 from Functions_SB import *
+from Functions_kernel import *
+from Functions_cavity import *
+from Functions_zones import *
+from Functions_bands import *
+from Functions_profile import *
 
 ## --------------------------------------- ##
 # Physical constants and conversion factors #
@@ -26,40 +27,81 @@ from Parameters_system import *
 # Functions #
 ##---------##
 
-def cosmicray_lis(ekin):
+    # local interstellar spectra already loaded (see lis_table)
+lis_cache = {}
+
+def lis_table(path = lis_file):
     """
-    Return the cosmic rays spectrum from a table of kinetic energy.
+    Return the local interstellar spectrum of the cosmic rays and its log-log interpolation
+    The text file is read only once: a binary cache (path.npy) is written next to it and used while it is more recent than the text file.
 
-    Inputs:
-        ekin    :   kinetic energy array (GeV)
+    Input:
+        path    :   file of the LIS in kinetic energy (GeV) and flux (proton/m2/s/sr/GeV) (default = lis_file)
 
     Output:
-        n_recast:   cosmic rays spectrum interpolated from file (GeV^-1 cm^-3)
+        lis     :   dictionary with the kinetic energy 'ek' (GeV), the spectrum 'n' (GeV^-1 cm^-3) and its log-log interpolation 'itp'
     """
+    if path in lis_cache:
+        return lis_cache[path]
+
         # Physical constants
     mpgev = mp * MeV2GeV     # GeV
     clight = cl * cm2m       # m/s
 
         # Load LIS data from Boschini-2017 papers
-    data = ascii.read('/Users/stage/Documents/Virginie/Superbubbles/Code/CosmicRayLocal.txt',data_start=1)
+    cache = path + '.npy'
+
+    if os.path.isfile(cache) and os.path.getmtime(cache) >= os.path.getmtime(path):
+
+        ek_lis, flux_lis = numpy.load(cache)
+
+    else:
+
+        from astropy.io import ascii       # only needed to read the text file (not its binary cache)
+
+        data = ascii.read(path, data_start = 1)
+        ek_lis = numpy.asarray(data['Ekin'], dtype = float)
+        flux_lis = numpy.asarray(data['Flux'], dtype = float)
+
+        try:
+            numpy.save(cache, numpy.vstack((ek_lis, flux_lis)))
+
+        except OSError:     # the directory of the LIS is read-only
+            pass
 
         # Convert from proton/m2/s/sr/GeV into proton/GeV/cm3 by multiplying by 4pi/v and 1e6 for m-3 to cm-3
-    ek_lis = numpy.asarray(data['Ekin'])
     lorentz = 1.0+ek_lis/mpgev
     beta = numpy.sqrt(1.0-1.0/numpy.power(lorentz,2))
-    n_lis = numpy.asarray(data['Flux']*4.0*numpy.pi/beta/clight) * (cm2m)**3  # proton/GeV/cm3
+    n_lis = flux_lis*4.0*numpy.pi/beta/clight * (cm2m)**3  # proton/GeV/cm3
+
+    lis = {'ek': ek_lis, 'n': n_lis, 'itp': loglog_interpolation(ek_lis, n_lis)}
+    lis_cache[path] = lis
+
+    return lis
+
+def cosmicray_lis(ekin, path = lis_file):
+    """
+    Return the cosmic rays spectrum from a table of kinetic energy.
+
+    Inputs:
+        ekin    :   kinetic energy array (GeV)
+        path    :   file of the LIS (default = lis_file, see lis_table)
 
-        # Recast on input grid
-    lis_itp = lambda e : 10.0**(loglog_interpolation(ek_lis,n_lis)(numpy.log10(e)))
-    nk = ekin.size
-    n_recast = numpy.zeros(nk)
+    Output:
+        n_recast:   cosmic rays spectrum interpolated from file (GeV^-1 cm^-3)
+    """
+    lis = lis_table(path)
+    ek_lis = lis['ek']
+    n_lis = lis['n']
+    ekin = numpy.asarray(ekin, dtype = float)
 
-    for i in range(nk):
-            # Interpolate LIS spectrum over the input LIS range
-            #...and extend with power-law interpolation of index -2.7 above the range (see figure 4 of AMS-02 2015 paper)
-        n_recast[i] = lis_itp(ekin[i]) if ekin[i] <= ek_lis.max() else n_lis[-1]*(ekin[i]/ek_lis[-1])**(-2.7)  # proton/GeV/cm3
+        # Interpolate LIS spectrum over the input LIS range
+        #...and extend with power-law interpolation of index -2.7 above the range (see figure 4 of AMS-02 2015 paper)
+    inside = ekin <= ek_lis.max()
+    n_inside = 10.0**lis['itp'](numpy.log10(numpy.where(inside, ekin, ek_lis[-1])))
+    n_outside = n_lis[-1]*(ekin/ek_lis[-1])**(-2.7)
 
-    return n_recast
+    return numpy.where(inside, n_inside, n_outside)  # proton/GeV/cm3
 
 def pwn_emission(tsn,tsb):
 
@@ -123,7 +165,7 @@ def psr_emission(tsn,tsb):
 
    return psr_lum
 
-def luminosity(lum_energy, energy):
+def luminosity(lum_energy, energy, weights = None):
 
     """
     Return the luminosity in a range of energy
@@ -131,11 +173,17 @@ def luminosity(lum_energy, energy):
     Inputs:
         lum_energy 	:   intrinsic luminosity array per energy (erg/s/eV)
         energy      :   range of energy in which we will compute the luminosity (eV)
+        weights     :   integration weights of the energies (eV), e.g. spectrum_weights_ev for the whole range of spectrum (default = None: trapezoidal rule)
 
     Output:
         lum         :   luminosity (erg s^-1)
     """
-    lum = integrate.trapz(lum_energy, energy)
+    if weights is None:
+        lum = integrate.trapz(lum_energy, energy)
+
+    else:
+        lum = numpy.dot(lum_energy, weights)
+
     lum = numpy.nan_to_num(lum)
 
     return lum
@@ -160,6 +208,215 @@ def spectral_index(Emin, Emax, lum_ph_min, lum_ph_max):
 
     return -(numpy.log(lum_ph_max) - numpy.log(lum_ph_min))/(numpy.log(Emax) - numpy.log(Emin))
 
+    # gamma luminosities of the LIS per unit of volume and density already computed for one file of the LIS and the registered bands (see cr_background)
+cr_background_cache = {}
+
+def cr_background(correction_factor, t6, path = lis_file):
+
+    """
+    Return the gamma emission of the CR background (LIS) in the supershell
+    The pion-decay emission is linear in the particles distribution and in the density of the gas, so the intrinsic differential luminosity
+    of the LIS is computed only once (per file of the LIS and registered bands) and multiplied by ns * Vs at each time.
+
+    Inputs:
+        correction_factor   :   correction factor for the radius of the SB
+        t6                  :   time array (Myr)
+        path                :   file of the LIS (default = lis_file, see lis_table)
+
+    Output:
+        background          :   dictionary with the gamma luminosity in the whole energy range 'Lum' and in each registered band 'Lum_' + name
+                                (e.g. 'Lum_HESS' and 'Lum_Fermi', see Functions_bands.py) (erg s^-1),
+                                the density 'ns' (cm^-3) and the volume 'Vs' (cm^3) of the shell
+    """
+    t6 = numpy.asarray(t6, dtype = float)
+    t7 = t6 * s6yr27yr                  # 10 Myr
+
+        # Parameters of the SB
+    Rsb, Vsb = radius_velocity_SB(t6)   # radius of the SB (pc)
+    Rsb = correction_factor * Rsb       # correction of the radius
+    Msb, Mswept = masses(t7, Rsb)       # swept-up and inner masses (solar masses)
+    Ms = Mswept - Msb                   # mass in the shell (solar masses)
+    ns, hs = density_thickness_shell(Vsb, Mswept, Msb, Rsb)                     # thickness (pc) and density (cm^-3) of the shell
+    Vs = (Ms*Msun2g)/(ns * mu * mpg)    # cm^3
+
+        # Gamma luminosities of the LIS for a volume of 1 cm^3 and a density of 1 cm^-3 (erg s^-1)
+    key = (path, tuple(sorted(energy_bands.items())))
+
+    if key not in cr_background_cache:
+
+        kernel = pion_decay_kernel(ECR, spectrum)
+        flux_PD = pion_decay_flux(cosmicray_lis(ECR, path), 1.0, kernel)        # eV^-1 s^-1
+
+        bands = band_quantities(flux_PD)
+        lum_ref = {name: bands[name] for name in (bands) if name.startswith('Lum_')}
+        lum_ref['Lum'] = luminosity(flux_PD * spectrum_erg, spectrum_ev, spectrum_weights_ev)
+
+        cr_background_cache[key] = lum_ref
+
+    lum_ref = cr_background_cache[key]
+
+        # a non-positive particles distribution gives no emission
+    scale = numpy.where((Vs > 0) & (ns > 0), ns * Vs, 0.0)
+
+    background = {name: scale * lum_ref[name] for name in (lum_ref)}
+    background['ns'] = ns
+    background['Vs'] = Vs
+
+    return background
+
+    # number of time steps computed by data (evaluations) and of the fixed grids (fixed) (see time_steps_report)
+time_steps = {'evaluations': 0, 'fixed': 0}
+
+def sn_evolution(correction_factor, tsn, time, tstart, zones, N_E, D, kernel):
+
+    """
+    Return the gamma emission of the CRs of one SN and the parameters of the SB at each time step
+
+    Inputs:
+        correction_factor   :   correction factor for the radius of the SB
+        tsn                 :   SN explosion time (yr)
+        time                :   time steps (yr)
+        tstart              :   time when the CRs start to diffuse (yr)
+        zones               :   which zone do you want to compute (1: cavity of the SB, 2: supershell and 3: outside)
+        N_E                 :   injected particles distribution (GeV^-1)
+        D                   :   diffusion coefficient (cm^2 s^-1)
+        kernel              :   pion-decay kernel (see Functions_kernel.pion_decay_kernel)
+
+    Output:
+        quantities          :   array (time steps, columns) with the gamma luminosity of each zone (in the order of zones) (erg s^-1),
+                                the total gamma luminosity (erg s^-1), the TeV emission of the PWN (erg s^-1), the GeV emission of the PSR (erg s^-1),
+                                the intrinsic differential luminosity (number_bin_E columns) (eV^-1 s^-1),
+                                the radius (pc) and the velocity (km/s) of the SB, the mass (solar masses) and the density (cm^-3) of the shell
+    """
+    number_bin_t = len(time)
+    time6 = time * yr26yr   # Myr
+
+        # Initialization
+    Lum_pwn_t = numpy.zeros(number_bin_t)
+    Lum_psr_t = numpy.zeros(number_bin_t)
+
+        # Parameters of the SB (from the table of its evolution shared by all SNe, see Functions_SB.superbubble_table)
+    start = profile_clock()
+    state = superbubble_state(correction_factor, time6)
+    Rsb_t = state['Rsb']                            # radius of the SB (corrected) (pc)
+    Vsb_t = state['Vsb']                            # velocity of the SB (km/s)
+    Ms_t = state['Mswept'] - state['Msb']           # mass in the shell (solar masses)
+    ns_t = state['ns']                              # density of the shell (cm^-3)
+    profile_add('weaver', 0, start)
+
+    start = profile_clock()
+
+    for j in range (number_bin_t):                                          # for each time step
+
+        Lum_pwn_t[j] += pwn_emission(tsn, time[j])
+        Lum_psr_t[j] += psr_emission(tsn,time[j])
+
+    profile_add('pwn_psr', 0, start)
+
+        # Intrinsic differential luminosity of each zone (eV^-1 s^-1) for all time steps in one pass (see Functions_zones.py)
+    time7 = time6 * s6yr27yr                # 10^7 yr
+    delta_t = time - tstart                 # yr
+    Flux_zones = zone_emission(zones, N_E, D, delta_t, state, time7, kernel)
+
+        # Gamma luminosity of each zone (erg s^-1)
+    start = profile_clock()
+    lum_energy = Flux_zones * spectrum_erg          # erg s^-1 eV^-1
+    Lum_zones = luminosity(lum_energy, spectrum_ev, spectrum_weights_ev)
+    profile_add('luminosity', 0, start)
+
+        # Total intrinsic differential luminosity and gamma luminosity: cavity and supershell (the outside is not part of the SB)
+    inside = [k for k in range (len(zones)) if zones[k] in (1, 2)]
+    Flux = numpy.sum(Flux_zones[inside], axis = 0)
+    Lum_t_tot = numpy.sum(Lum_zones[inside], axis = 0)
+
+    return numpy.column_stack(list(Lum_zones) + [Lum_t_tot, Lum_pwn_t, Lum_psr_t, Flux, Rsb_t, Vsb_t, Ms_t, ns_t])
+
+def sn_time_adaptive(correction_factor, tsn, tmin, tmax, dtmin, zones, N_E, D, kernel):
+
+    """
+    Return adaptive time steps for one SN and the quantities of sn_evolution at these time steps
+    Starting from number_bin_tsn0 logarithmic time steps, each interval is cut at its geometric middle while the linear interpolation between its bounds
+    differs from the computed values by more than tolerance_time (relative to the maximum of each quantity) for the gamma luminosities and the intrinsic
+    differential luminosity at each energy. There are never more than number_bin_tsn time steps (the intervals with the largest errors are cut first)
+    and the intervals shorter than 2*dtmin are not cut (the emission is discontinuous when the CRs of the lowest energies reach the shell).
+    The tolerance only covers the gamma luminosities and the intrinsic differential luminosity: the PWN and PSR luminosities vary on 500 yr after the SN,
+    which the time steps cannot resolve, so data computes them at the times of its time array with adaptive_time (their columns here are not checked).
+
+    Inputs:
+        correction_factor   :   correction factor for the radius of the SB
+        tsn                 :   SN explosion time (yr)
+        tmin                :   first time step (yr)
+        tmax                :   last time step (yr)
+        dtmin               :   time resolution needed (yr), usually the time step of the time array of data
+        zones               :   which zone do you want to compute (1: cavity of the SB, 2: supershell and 3: outside)
+        N_E                 :   injected particles distribution (GeV^-1)
+        D                   :   diffusion coefficient (cm^2 s^-1)
+        kernel              :   pion-decay kernel (see Functions_kernel.pion_decay_kernel)
+
+    Outputs:
+        time                :   adaptive time steps (yr)
+        quantities          :   quantities at each time step (see sn_evolution)
+    """
+    nz = len(zones)
+    checked = list(range (nz + 1)) + list(range (nz + 3, nz + 3 + number_bin_E))  # gamma luminosities and intrinsic differential luminosity
+
+        # first grid
+    time = numpy.logspace(numpy.log10(tmin), numpy.log10(tmax), number_bin_tsn0)
+    tstart = time[0]
+    quantities = sn_evolution(correction_factor, tsn, time, tstart, zones, N_E, D, kernel)
+    error = numpy.full(len(time) - 1, numpy.inf)        # error of each interval
+
+    while True:
+
+            # intervals to cut
+        ind = numpy.where((error > tolerance_time) & (numpy.diff(time) >= 2 * dtmin))[0]
+        nfree = number_bin_tsn - len(time)
+
+        if len(ind) == 0 or nfree <= 0:
+            break
+
+        if len(ind) > nfree:
+            ind = numpy.sort(ind[numpy.argsort(error[ind])[::-1][:nfree]])
+
+            # new time steps and error of the linear interpolation
+        time_mid = numpy.sqrt(time[ind] * time[ind + 1])
+        quantities_mid = sn_evolution(correction_factor, tsn, time_mid, tstart, zones, N_E, D, kernel)
+
+        w = ((time_mid - time[ind])/(time[ind + 1] - time[ind]))[:, numpy.newaxis]
+        quantities_lin = quantities[ind] + w * (quantities[ind + 1] - quantities[ind])
+
+        order = numpy.argsort(numpy.concatenate((time, time_mid)), kind = 'stable')
+        time = numpy.concatenate((time, time_mid))[order]
+        quantities = numpy.concatenate((quantities, quantities_mid))[order]
+
+        scale = numpy.max(numpy.abs(quantities[:, checked]), axis = 0)
+        scale[scale == 0] = 1.0
+        error_mid = numpy.max(numpy.abs(quantities_mid - quantities_lin)[:, checked]/scale, axis = 1)
+
+            # both halves of a cut interval take its error (the error of each interval is given at its first time step)
+        error_point = numpy.append(error, 0.0)
+        error_point[ind] = error_mid
+        error = numpy.concatenate((error_point, error_mid))[order][:-1]
+
+    return time, quantities
+
+def time_steps_report():
+
+    """
+    Return the number of time steps computed by data and the number of time steps of the fixed grids (and print the saving of the adaptive time steps)
+
+    Outputs:
+        evaluations     :   number of time steps computed
+        fixed           :   number of time steps with the fixed grids (number_bin_tsn per SN)
+    """
+    evaluations = time_steps['evaluations']
+    fixed = time_steps['fixed']
+
+    if fixed > 0:
+        print('time steps: %d computed instead of %d with the fixed grids (%.1f %% saved)' %(evaluations, fixed, 100 * (1 - float(evaluations)/fixed)))
+
+    return evaluations, fixed
+
 def data(correction_factor, t0, t, zones):
 
     """
@@ -170,6 +427,7 @@ def data(correction_factor, t0, t, zones):
         TeV emission of PWNe
         GeV emission of PSRs
         number of remained OB stars
+    and the luminosity of each zone
 
     Inputs:
         correction_factor   :   correction factor for the radius of the SB
@@ -183,6 +441,7 @@ def data(correction_factor, t0, t, zones):
 	    Lum_pwn_sn		    :	TeV emission of PWNe (erg s^-1)
         Lum_psr_sn		    :	GeV emission of PSRs (erg s^-1)
         nob                 :   number of remained OB stars inside the OB association
+        Lumzones_sn         :   luminosity of each zone in the whole energy range (erg s^-1), shape (number of times, number of zones), in the order of zones
         R_sb                :   radius of the superbubble (pc)
         V_sb                :   velocity of the superbubble (km/s)
         M_s                 :   mass in the shell (solar masses)
@@ -194,6 +453,8 @@ def data(correction_factor, t0, t, zones):
         ## ====================================================== ##
             # N(p) = N0 * (p/p0)^(-alpha)
             # N(E) = N0/c * ((E^2 + 2*mp*c^2*E)^(-(1+alpha)/2) * (E + mp*c^2)/((E0^2 + 2*mp*E0)^(-alpha/2)) d^3(r)
+    start_data = profile_clock()
+    start = profile_clock()
     N_E = power_law_distribution(ECR)
 
         ## =============================== ##
@@ -202,6 +463,15 @@ def data(correction_factor, t0, t, zones):
             # D(p) = D0 * (p/p0)^(-delta)
             # D(E) = D0 * (E^2 + 2*mpg*E)^(delta/2) * 1/p0^delta
     D = diffusion_coefficient(ECR)
+    profile_add('distribution', 0, start)
+
+        ## ============================================ ##
+        # pion-decay response matrix (cm^3 eV^-1 s^-1) #
+        ## ============================================ ##
+            # flux(Egamma) = nh * K . N(Ep), computed once for the grids ECR and spectrum
+    start = profile_clock()
+    kernel = pion_decay_kernel(ECR, spectrum)
+    profile_add('kernel', 0, start)
 
         ## =============================================================== ##
         # Computation of gamma luminosity in each range of energy(erg s^-1) #
@@ -212,23 +482,15 @@ def data(correction_factor, t0, t, zones):
     nt0 = len(t0)
     nt = len(t)
 
-                # time evolution of the number of OB-stars
-    nob = Nob * numpy.ones(nt)
-
-                # Gamma luminosity (erg s^-1)
-    for zone in (zones):
-
-        if zone == 1:       # in the SB
+                # time resolution of the adaptive time steps (yr)
+    dtmin = numpy.min(numpy.diff(t)) if nt > 1 else 0.0
 
-            Lumsb_sn = numpy.zeros(nt)              # 100 MeV to 100 TeV
-
-        elif zone == 2:     # in the supershell
-
-            Lumshell_sn = numpy.zeros(nt)           # 100 MeV to 100 TeV
-
-        else:               # outside the SB
+                # time evolution of the number of OB-stars
+    nob = Parameters_system.Nob * numpy.ones(nt)
 
-            Lumout_sn = numpy.zeros(nt)             # 100 MeV to 100 TeV
+                # Gamma luminosity of each zone (erg s^-1), in the order of zones
+    nz = len(zones)
+    Lumzones_sn = numpy.zeros((nt, nz))     # 100 MeV to 100 TeV
 
             # Total
 
@@ -252,263 +514,81 @@ def data(correction_factor, t0, t, zones):
 
             # Time array (yr)
         t6 = t0[i] * yr26yr  # in Myr
+        start = profile_clock()
         Rsb = radius_velocity_SB(t6)[0]         # outer radius of the superbubble (Weaver model) (pc)
+        profile_add('weaver', 0, start)
         Rsb = correction_factor * Rsb           # outer radius of the superbubble (corrected) (pc)
         tdiffmax = diffusion_time(Rsb, D[0])    # maximal diffusion time scale (yr)
         tmin = t0[i]                            # only when the SN occurs and the high-energy particles enter the supershell (yr)
         tmax = tmin + 10*tdiffmax      # almost all the CR have left the superbubble (yr)
-        number_bin_t = 200
-        time = numpy.logspace(numpy.log10(tmin), numpy.log10(tmax), number_bin_t)
-        time6 = time * yr26yr   # Myr
-
-            # Initialization
-
-                # only time corresponding to the time array
-        indt = numpy.where((t >= tmin) & (t <= tmax))[0]    # for the gamma luminosity
-        indtob = numpy.where(t >= t0[i])[0]                 # number of remained ob stars
-
-                # gamma luminosity (erg s^-1)
-        for zone in (zones):
-
-            if zone == 1:                       # in the SB
-
-                Lum_t_sb = numpy.zeros(number_bin_t)
-
-            elif zone == 2:                     # in the supershell
-
-                Lum_t_shell = numpy.zeros(number_bin_t)
-
-            else:                               # outside the SB
-
-                Lum_t_out = numpy.zeros(number_bin_t)
-
-        Lum_t_tot = numpy.zeros(number_bin_t)
-
-        Flux = numpy.zeros((number_bin_t, number_bin_E))
-
-        Lum_pwn_t = numpy.zeros(number_bin_t)
-        Lum_psr_t = numpy.zeros(number_bin_t)
-        Rsb_t = numpy.zeros(number_bin_t)
-        Vsb_t = numpy.zeros(number_bin_t)
-        Ms_t = numpy.zeros(number_bin_t)
-        ns_t = numpy.zeros(number_bin_t)
-
-        for j in range (number_bin_t):                                          # for each time step
-
-                # Initialization
-            t6 = time6[j]           	# 10^6 yr
-            t7 = t6 * s6yr27yr      	# 10^7 yr
-            delta_t = time[j] - time[0]
-            SB = False  # we do not compute inside the SB
-
-                # Parameters of the SB
-            Rsb_t[j], Vsb_t[j] = radius_velocity_SB(t6)                                 # radius of the SB (pc)
-            Rsb_t[j] = correction_factor * Rsb_t[j]                                     # correction of the radius
-            Rsb = Rsb_t[j]
-            Vsb = Vsb_t[j]
-            Msb, Mswept = masses(t7, Rsb)                                               # swept-up and inner masses (solar masses)
-            Ms_t[j] = Mswept - Msb                                                      # mass in the shell (solar masses)
-            ns, hs = density_thickness_shell_percentage(percentage, Rsb, Mswept, Msb)  # thickness (pc) and density (cm^-3) of the shell
-            #ns, hs = density_thickness_shell(Vsb, Mswept, Msb, Rsb)                     # thickness (pc) and density (cm^-3) of the shell
-            ns_t[j] = ns
-
-                # For each zones
-            for zone in (zones):
-
-                if zone == 1:                                                   # inside the SB
-
-                    SB = True   # we compute the interior of the SB
 
-                        # distance array (pc)
-                    rmin = 0.01                 # minimum radius (pc)
-                    rmax = Rsb-hs               # maximum radius (pc)
-                    number_bin_r = 15           # number of bin for r from 0 to Rsb-hs
-                    r = numpy.logspace(numpy.log10(rmin), numpy.log10(rmax), number_bin_r)    # position (pc)
+            # Gamma emission and parameters of the SB at each time step
+        start = profile_clock()
 
-                        # Density of gas (cm^-3)
-                    nsb = profile_density_temperature(t7, r, Rsb)[1]
-                    ngas = nsb * 1/units.cm**3
+        if adaptive_time:
 
-                        # Particles distribution (GeV^-1)
-                    r_in = 0
-                    r_out = r[0]
-                    N_part = shell_particles(r_in, r_out, N_E, D, delta_t) * 1/units.GeV
+            time, quantities = sn_time_adaptive(correction_factor, t0[i], tmin, tmax, dtmin, zones, N_E, D, kernel)
 
-                    if numpy.asarray(N_part).all() == 0:
-                        continue
+        else:
 
-                        # For all the range of energy (100 MeV to 100 TeV)
-                            # intrisic differential luminosity (eV^-1 s^-1)
-                    model = TableModel(E_CR, N_part, amplitude = 1)
-                    PD = PionDecay(model, nh = ngas[0], nuclear_enhancement = True, useLUT = False)
-                    flux_PD = PD.flux(spectrum_energy, distance = 0 * units.pc)
-                    flux_PD = numpy.nan_to_num(numpy.asarray(flux_PD))
-                    Flux[j] += flux_PD
+            time = numpy.logspace(numpy.log10(tmin), numpy.log10(tmax), number_bin_tsn)
+            quantities = sn_evolution(correction_factor, t0[i], time, time[0], zones, N_E, D, kernel)
 
-                            # Gamma luminosity (erg s^-1)
-                    lum_energy = flux_PD * spectrum_erg          # erg s^-1 eV^-1
+        profile_add('sn_evolution', 0, start)
 
-                    Lum = luminosity(lum_energy, spectrum_ev)
-                    Lum_t_sb[j] += Lum
-
-                    for k in range (1, number_bin_r):   # for each radius inside the SB
-
-                            # Particles distribution (GeV^-1)
-                        r_in = r_out
-                        r_out = r[k]
-                        N_part = shell_particles(r_in, r_out, N_E, D, delta_t) * 1/units.GeV
-
-                        if numpy.asarray(N_part).all() == 0:
-                            continue
-
-                            # For all the range of energy (100 MeV to 100 TeV)
-                                # intrisic differential luminosity (eV^-1 s^-1)
-                        model = TableModel(E_CR, N_part, amplitude = 1)
-                        PD = PionDecay(model, nh = ngas[k], nuclear_enhancement = True, useLUT = False)
-                        flux_PD = PD.flux(spectrum_energy, distance = 0 * units.pc)
-                        flux_PD = numpy.nan_to_num(numpy.asarray(flux_PD))
-                        Flux[j] += flux_PD
-
-                                # Gamma luminosity (erg s^-1)
-                        lum_energy = flux_PD * spectrum_erg          # erg s^-1 eV^-1
-                        Lum = luminosity(lum_energy, spectrum_ev)
-                        Lum_t_sb[j] += Lum
-
-                elif zone == 2:                                                 # in the supershell
-
-                        # Density of gas (cm^-3)
-                    ngas = ns * 1/units.cm**3
-
-                        # Particles distribution (GeV^-1)
-                    r_in = Rsb - hs     # in pc
-                    r_out = Rsb         # in pc
-                    N_part = shell_particles(r_in, r_out, N_E, D, delta_t) * 1/units.GeV
-
-                    if numpy.asarray(N_part).all() == 0:
-                        continue
-
-                        # For all the range of energy (100 MeV to 100 TeV)
-                            # intrisic differential luminosity (eV^-1 s^-1)
-                    model = TableModel(E_CR, N_part, amplitude = 1)
-                    PD = PionDecay(model, nh = ngas, nuclear_enhancement = True, useLUT = False)
-                    flux_PD = PD.flux(spectrum_energy, distance = 0 * units.pc)
-                    flux_PD = numpy.nan_to_num(numpy.asarray(flux_PD))
-                    Flux[j] += flux_PD
-
-                            # Gamma luminosity (erg s^-1)
-                    lum_energy = flux_PD * spectrum_erg          # erg s^-1 eV^-1
-                    Lum = luminosity(lum_energy, spectrum_ev)
-                    Lum_t_shell[j] += Lum
-
-                else:                                                           # outside the SB
-
-                        # Density of gas
-                    ngas = n0 * 1/units.cm**3
-
-                        # Distribution of particles (GeV^-1)
-                    N_part = inf_particles(Rsb, N_E, D, delta_t) * 1/units.GeV
-
-                        # For all the range of energy (100 MeV to 100 TeV)
-                            # intrisic differential luminosity (eV^-1 s^-1)
-                    model = TableModel(E_CR, N_part, amplitude = 1)
-                    PD = PionDecay(model, nh = ngas, nuclear_enhancement = True, useLUT = False)
-                    flux_PD = PD.flux(spectrum_energy, distance = 0 * units.pc)
-                    flux_PD = numpy.nan_to_num(numpy.asarray(flux_PD))
-
-                            # Gamma luminosity (erg s^-1)
-                    lum_energy = flux_PD * spectrum_erg          # erg s^-1 eV^-1
-
-                    Lum = luminosity(lum_energy, spectrum_ev)
-                    Lum_t_out[j] += Lum
-
-            if SB:  # if we compute what happens inside the SB
-
-                Lum_t_tot[j] = Lum_t_sb[j] + Lum_t_shell[j]
-
-            else:   # the only relevant gamma luminosity is the one of the supershell
-
-                Lum_t_tot[j] = Lum_t_shell[j]
-
-            Lum_pwn_t[j] += pwn_emission(t0[i], time[j])
-            Lum_psr_t[j] += psr_emission(t0[i],time[j])
+        time_steps['evaluations'] += len(time)
+        time_steps['fixed'] += number_bin_tsn
 
             # Interpolation
 
-                # number of OB stars
-        for l in (indtob):
-            nob[l] -= 1
-
-                # Pulsar wind nebula
-
-        #for l in (indt_pwn):
-        #    n_pwn_tot[l] += 1
-
-                # Gamma luminosity + spectral index
-        """
-        Title_HESS = 'Gamma emission from 1 TeV to 10 TeV (t0 = %.2e yr)'%t0[i]
-        Title = 'Gamma emission from 100 MeV to 100 TeV (t0 = %.2e yr)'%t0[i]
-        xlabel = 'Time [Myr]'
-        ylabel = '$L_\gamma$ [erg s$^-1$]'
-        figure_HESS = figure_number
-        figure = figure_HESS + 1
-        """
-        for zone in (zones):
-
-            if zone == 1:       # in the SB
-
-                Lum_sb = interpolation1d(time, Lum_t_sb)
-
-
-            elif zone == 2:     # in the supershell
-
-                Lum_shell = interpolation1d(time, Lum_t_shell)
-
-
-            else:               # outside the SB
-
-                Lum_out = interpolation1d(time, Lum_t_out)
-
-
-        Lum_tot = interpolation1d(time, Lum_t_tot)
-
-        Flux_tot = interpolation2d(spectrum, time, Flux)
-
-        Lum_pwn_tot = interpolation1d(time, Lum_pwn_t)
-        Lum_psr_tot = interpolation1d(time, Lum_psr_t)
+                # only time corresponding to the time array
+        indt = numpy.where((t >= tmin) & (t <= tmax))[0]    # for the gamma luminosity
+        indtob = numpy.where(t >= t0[i])[0]                 # number of remained ob stars
 
-        Radius = interpolation1d(time, Rsb_t)
-        Velocity = interpolation1d(time, Vsb_t)
-        Mass_shell = interpolation1d(time, Ms_t)
-        Density_shell = interpolation1d(time, ns_t)
+                # number of OB stars
+        nob[indtob] -= 1
 
-        for l in (indt):
+                # Gamma luminosity of each zone, total gamma luminosity, PWN, PSR and intrinsic differential luminosity
+                # indices and weights computed once for all quantities
+        start = profile_clock()
+        weights = interpolation_weights(time, t[indt])
+        quantities_t = interpolation_stack(weights, quantities[:, :-4])
+        profile_add('interpolation', 0, start)
 
-            for zone in (zones):
+        start = profile_clock()
+        Lumzones_sn[indt] += quantities_t[:, :nz]
+        Lumtot_sn[indt] += quantities_t[:, nz]
 
-                if zone == 1:       # in the SB
+        if adaptive_time:
 
-                    Lumsb_sn[l] += Lum_sb(t[l])
+                # PWN and PSR computed at the times of the time array: they vary faster than the adaptive time steps can resolve (spin-down time of 500 yr)
+            for j in (indt):
 
-                elif zone == 2:     # in the supershell
+                Lum_pwn_sn[j] += pwn_emission(t0[i], t[j])
+                Lum_psr_sn[j] += psr_emission(t0[i], t[j])
 
-                    Lumshell_sn[l] += Lum_shell(t[l])
+        else:
 
-                else:               # outside the SB
+            Lum_pwn_sn[indt] += quantities_t[:, nz + 1]
+            Lum_psr_sn[indt] += quantities_t[:, nz + 2]
 
-                    Lumout_sn[l] += Lum_out(t[l])
+        Flux_sn[indt] += quantities_t[:, nz + 3:]
+        profile_add('accumulation', 0, start)
 
-            Lumtot_sn[l] += Lum_tot(t[l])
+        # Parameters of the SB during the evolution of the CRs of the last SN (from the table of its evolution, see Functions_SB.superbubble_table)
+    if nt0 > 0:
 
-            Flux_sn[l] += Flux_tot(spectrum, t[l])
-            Lum_pwn_sn[l] += Lum_pwn_tot(t[l])
-            Lum_psr_sn[l] += Lum_psr_tot(t[l])
+        start = profile_clock()
+        state = superbubble_state(correction_factor, t[indt] * yr26yr)
+        R_sb[indt] = state['Rsb']
+        V_sb[indt] = state['Vsb']
+        M_s[indt] = state['Mswept'] - state['Msb']
+        n_s[indt] = state['ns']
+        profile_add('weaver', 0, start)
 
-        R_sb = Radius(t)
-        V_sb = Velocity(t)
-        M_s = Mass_shell(t)
-        n_s = Density_shell(t)
+    profile_add('data', 0, start_data)
 
-    return Lumtot_sn, Flux_sn, Lum_pwn_sn, Lum_psr_sn, nob, R_sb, V_sb, M_s, n_s
+    return Lumtot_sn, Flux_sn, Lum_pwn_sn, Lum_psr_sn, nob, Lumzones_sn, R_sb, V_sb, M_s, n_s
 
 def energy_gamma(lum_gamma, time):
 
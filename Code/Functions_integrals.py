@@ -0,0 +1,136 @@
+"""
+Here are all functions needed to compute the integrals which only depend on the parameters of the system (exponents of the profiles, injection index)
+
+Each integral is computed once per set of parameters and then taken from the cache: in closed form (Beta function) when it converges, numerically otherwise.
+"""
+
+##----------##
+# Librairies #
+##----------##
+import numpy
+import scipy.integrate as integrate
+from scipy.special import beta
+
+##-----------------------------------------##
+# Physical constants and Conversion factors #
+##-----------------------------------------##
+from Physical_constants import *
+from Conversion_factors import *
+
+##---------##
+# Functions #
+##---------##
+
+    # integrals already computed for one set of parameters
+integral_cache = {}
+
+    # number of integrals taken from the cache (hits) and computed (misses) (see integral_report)
+integral_counter = {'hits': 0, 'misses': 0}
+
+def integral_memoized(key, compute):
+    """
+    Return an integral from the cache, or compute it and put it in the cache
+
+    Inputs:
+        key         :   parameters of the integral (tuple)
+        compute     :   function without argument computing the integral
+
+    Output:
+        value of the integral
+    """
+    if key in integral_cache:
+        integral_counter['hits'] += 1
+        return integral_cache[key]
+
+    integral_counter['misses'] += 1
+    integral_cache[key] = compute()
+
+    return integral_cache[key]
+
+def beta_integral(a, b, lower = 0, upper = 1):
+    """
+    Return the integral of x^a * (1-x)^b from lower to upper (0 <= lower, upper <= 1)
+    From 0 to 1 (or 1 to 0) it is the Beta function B(a+1, b+1) when a > -1 and b > -1, otherwise it is computed with scipy.integrate.quad.
+    When a bound is 0 with a <= -1 or 1 with b <= -1, the integral diverges: it is +inf (-inf if upper < lower), never the value of quad.
+
+    Inputs:
+        a       :   exponent of x
+        b       :   exponent of (1-x)
+        lower   :   lower bound of the integral (default = 0)
+        upper   :   upper bound of the integral (default = 1)
+
+    Output:
+        value of the integral
+    """
+    a = float(a)
+    b = float(b)
+    sign = 1.0 if upper >= lower else -1.0
+
+    if ((min(lower, upper) == 0) and (a <= -1)) or ((max(lower, upper) == 1) and (b <= -1)):
+
+        compute = lambda: sign * numpy.inf
+
+    elif (a > -1) and (b > -1) and (sorted((lower, upper)) == [0, 1]):
+
+        compute = lambda: sign * beta(a + 1, b + 1)
+
+    else:
+
+        compute = lambda: integrate.quad(lambda x: (1-x)**b * x**a, lower, upper)[0]
+
+    return integral_memoized(('beta', a, b, lower, upper), compute)
+
+def power_law_integral(alpha, Emin, Emax):
+    """
+    Return the integral of the energy of the power-law distribution of the CR (without its normalization constant)
+        int_Emin^Emax (E^2 + 2*mp*c^2*E)^(-(1+alpha)/2) * (E + mp*c^2) * E dE
+
+    Inputs:
+        alpha   :   exponent of the power-law distribution
+        Emin    :   minimum kinetic energy (GeV)
+        Emax    :   maximum kinetic energy (GeV)
+
+    Output:
+        value of the integral (GeV^(1-alpha))
+    """
+    mpgev = mp * MeV2GeV # mass of the proton in GeV
+
+    compute = lambda: integrate.quad(lambda E: (E**2 + 2 * mpgev * E)**(-(1 + alpha)/2.0) * (E + mpgev) * E, Emin, Emax)[0]
+
+    return integral_memoized(('power_law', float(alpha), float(Emin), float(Emax)), compute)
+
+def count_integrals(counts):
+    """
+    Add the integrals of one iteration (computed by a worker) to the count of this process (see integral_report)
+
+    Input:
+        counts      :   number of integrals taken from the cache and computed
+    """
+    integral_counter['hits'] += counts[0]
+    integral_counter['misses'] += counts[1]
+
+    return
+
+def integral_reset():
+    """
+    Set the count of the integrals of this process to zero (the cache is kept)
+    """
+    integral_counter['hits'] = 0
+    integral_counter['misses'] = 0
+
+    return
+
+def integral_report():
+    """
+    Return the number of integrals taken from the cache and computed (and print them)
+
+    Outputs:
+        hits        :   number of integrals taken from the cache
+        misses      :   number of integrals computed
+    """
+    hits = integral_counter['hits']
+    misses = integral_counter['misses']
+
+    print('integrals: %d taken from the cache, %d computed' %(hits, misses))
+
+    return hits, misses
@@ -0,0 +1,292 @@
+"""
+Here are all functions needed to run the iterations (samplings of the SN explosion times) in parallel
+"""
+
+##----------##
+# Librairies #
+##----------##
+import json
+import multiprocessing
+import os
+import pickle
+import numpy
+import Parameters_system
+from Functions_gamma import *
+from Functions_profile import *
+
+##-----------------------------------------##
+# Physical constants and Conversion factors #
+##-----------------------------------------##
+from Physical_constants import *
+from Conversion_factors import *
+from Parameters_system import *
+
+##---------##
+# Functions #
+##---------##
+
+def iteration_seeds(seed, nit):
+    """
+    Return one independent seed sequence per iteration
+    The seed sequence of the iteration i only depends on seed and i, so the results are the same for any number of workers.
+
+    Inputs:
+        seed    :   seed of the whole run (integer)
+        nit     :   number of iterations
+
+    Output:
+        seeds   :   list of numpy.random.SeedSequence (one per iteration)
+    """
+
+    return numpy.random.SeedSequence(seed).spawn(nit)
+
+def sn_explosion_times(seed_sequence, nsn = None):
+    """
+    Return the sorted SN explosion times of one iteration
+    The explosion times follow an uniform distribution from tsnmin to tsnmax and only the ones before tmax are kept.
+
+    Inputs:
+        seed_sequence   :   numpy.random.SeedSequence of the iteration
+        nsn             :   number of massive stars (default = None: Nob of Parameters_system when the function is called)
+
+    Output:
+        tsn             :   SN explosion times (yr)
+    """
+    if nsn is None:
+        nsn = Parameters_system.Nob
+
+    rng = numpy.random.default_rng(seed_sequence)
+
+    tsn = numpy.sort(rng.uniform(tsnmin, tsnmax, nsn)/yr26yr)    # yr
+
+    return tsn[tsn <= tmax]
+
+def data_iteration(arguments):
+    """
+    Return the outputs of data for one iteration (one argument to be used with a pool of workers)
+
+    Input:
+        arguments   :   tuple (correction_factor, tsn, t, zones) given to data
+
+    Outputs:
+        outputs     :   outputs of data (see Functions_gamma.data)
+        steps       :   number of time steps computed and number of time steps of the fixed grids for this iteration (see Functions_gamma.time_steps)
+        stages      :   wall time (s) and number of calls of each stage of data for this iteration (see Functions_profile.py)
+        integrals   :   number of integrals taken from the cache and computed for this iteration (see Functions_integrals.integral_counter)
+    """
+    evaluations = time_steps['evaluations']
+    fixed = time_steps['fixed']
+    hits = integral_counter['hits']
+    misses = integral_counter['misses']
+    before = profile_snapshot()
+
+    outputs = data(*arguments)
+
+    return (outputs, (time_steps['evaluations'] - evaluations, time_steps['fixed'] - fixed), profile_difference(before),
+            (integral_counter['hits'] - hits, integral_counter['misses'] - misses))
+
+def count_time_steps(steps):
+    """
+    Add the time steps of one iteration (computed by a worker) to the count of this process (see Functions_gamma.time_steps_report)
+
+    Input:
+        steps       :   number of time steps computed and number of time steps of the fixed grids
+    """
+    time_steps['evaluations'] += steps[0]
+    time_steps['fixed'] += steps[1]
+
+    return
+
+def run_iterations(correction_factor, tsn_it, t, zones, nworkers = 1):
+    """
+    Yield the outputs of data for each iteration, in the order of the iterations
+    The iterations are shared between nworkers processes (forked so that the script is not executed again in each worker).
+    The time steps, the profile of the stages of data and the count of the integrals computed by the workers are added to the ones of this process.
+
+    Inputs:
+        correction_factor   :   correction factor for the radius of the SB
+        tsn_it              :   SN explosion times of each iteration (yr)
+        t                   :   time array (yr)
+        zones               :   which zone do you want to compute (1: cavity of the SB, 2: supershell and 3: outside)
+        nworkers            :   number of worker processes (default = 1: no parallelisation)
+
+    Outputs:
+        i                   :   index of the iteration
+        outputs             :   outputs of data for the iteration i (see Functions_gamma.data)
+    """
+    arguments = [(correction_factor, tsn, t, zones) for tsn in (tsn_it)]
+
+        # the pion-decay kernel (and the table of the cavity) are computed before the fork so that all workers share them
+    pion_decay_kernel(ECR, spectrum)
+
+    if 1 in zones:
+        cavity_table()
+
+    if nworkers <= 1:
+
+        for i in range (len(arguments)):
+
+            yield i, data(*arguments[i])
+
+        return
+
+    context = multiprocessing.get_context('fork')
+
+    with context.Pool(nworkers) as pool:
+
+        for i, (outputs, steps, stages, integrals) in enumerate(pool.imap(data_iteration, arguments)):
+
+            count_time_steps(steps)
+            profile_merge(stages)
+            count_integrals(integrals)
+
+            yield i, outputs
+
+def checkpoint_file(path, i):
+    """
+    Return the name of the checkpoint file of one iteration
+
+    Inputs:
+        path    :   directory of the checkpoint files
+        i       :   index of the iteration
+
+    Output:
+        name of the file
+    """
+
+    return os.path.join(path, 'iteration_%06d' %i)
+
+def checkpoint_write(path, i, tsn, outputs):
+    """
+    Write durably the results of one completed iteration
+    The file is first written under a temporary name, synchronized on the disk and then renamed, so a killed job never leaves an incomplete checkpoint.
+
+    Inputs:
+        path        :   directory of the checkpoint files (created if needed)
+        i           :   index of the iteration
+        tsn         :   SN explosion times of the iteration (yr)
+        outputs     :   outputs of data for the iteration (see Functions_gamma.data)
+    """
+    if not os.path.isdir(path):
+        os.makedirs(path)
+
+    name = checkpoint_file(path, i)
+
+    with open(name + '.tmp', 'wb') as checkpoint_dump:
+
+        pickle.dump(tsn, checkpoint_dump)
+        pickle.dump(outputs, checkpoint_dump)
+        checkpoint_dump.flush()
+        os.fsync(checkpoint_dump.fileno())
+
+    os.replace(name + '.tmp', name)
+
+    return
+
+def checkpoint_read(path, i):
+    """
+    Return the results of one completed iteration
+
+    Inputs:
+        path        :   directory of the checkpoint files
+        i           :   index of the iteration
+
+    Outputs:
+        tsn         :   SN explosion times of the iteration (yr)
+        outputs     :   outputs of data for the iteration (see Functions_gamma.data)
+    """
+    with open(checkpoint_file(path, i), 'rb') as checkpoint_load:
+
+        tsn = pickle.load(checkpoint_load)
+        outputs = pickle.load(checkpoint_load)
+
+    return tsn, outputs
+
+def checkpoint_completed(path, nit):
+    """
+    Return the indices of the iterations already completed in the checkpoint directory
+
+    Inputs:
+        path        :   directory of the checkpoint files
+        nit         :   number of iterations of the run
+
+    Output:
+        done        :   sorted list of the completed iterations
+    """
+
+    return [i for i in range (nit) if os.path.isfile(checkpoint_file(path, i))]
+
+def checkpoint_run(seed, nit, zones, correction_factor):
+    """
+    Return the description of a run: everything which changes the results of its iterations
+
+    Inputs:
+        seed                :   seed of the run
+        nit                 :   number of iterations
+        zones               :   which zone do you want to compute (1: cavity of the SB, 2: supershell and 3: outside)
+        correction_factor   :   correction factor of the radius of the SB
+
+    Output:
+        run                 :   dictionary with the parameters of the run (as written in the JSON file of the checkpoint directory)
+    """
+    run = {'seed': seed, 'nit': nit, 'zones': list(zones), 'correction_factor': correction_factor,
+           'Nob': Parameters_system.Nob, 'Lob': Lob, 'lifetime': lifetime, 'n0': Parameters_system.n0, 'percentage': Parameters_system.percentage,
+           'D0': Parameters_system.D0, 'delta': Parameters_system.delta, 'alpha': Parameters_system.alpha, 'eta': eta, 'Esn': Esn, 'lis_file': lis_file,
+           'tsnmin': tsnmin, 'tsnmax': tsnmax, 'ECR': list(ECR), 'spectrum': list(spectrum),
+           't': [t_fix[0], t_fix[-1], len(t_fix)], 'number_bin_tsn': number_bin_tsn, 'adaptive_time': adaptive_time,
+           'tolerance_time': tolerance_time, 'number_bin_tsn0': number_bin_tsn0}
+
+        # same types as the ones read in the JSON file
+    return json.loads(json.dumps(run, default = float))
+
+def checkpoint_start(path, run, resume = True):
+    """
+    Return the iterations which can be taken from the checkpoint directory, after checking that they come from the same run
+    The description of the run is written in the directory (run.json). A run with other parameters cannot resume in it:
+    with resume = False, the checkpoint files of the directory are removed and the run starts from the first iteration.
+
+    Inputs:
+        path        :   directory of the checkpoint files (created if needed)
+        run         :   description of the run (see checkpoint_run)
+        resume      :   if the completed iterations of the same run are taken from the directory (default = True)
+
+    Output:
+        done        :   sorted list of the completed iterations (empty if resume = False)
+    """
+    name = os.path.join(path, 'run.json')
+
+    if resume:
+
+        done = checkpoint_completed(path, run['nit'])
+
+        if os.path.isfile(name):
+
+            with open(name, 'r') as run_load:
+
+                previous = json.load(run_load)
+
+            different = sorted([key for key in (set(run) | set(previous)) if run.get(key) != previous.get(key)])
+
+            if len(different) > 0:
+                raise ValueError('the checkpoints of %s come from another run (different %s): change the directory or set resume = False' %(path, ', '.join(different)))
+
+            return done
+
+        if len(done) > 0:
+            raise ValueError('the checkpoints of %s have no description of their run (run.json): change the directory or set resume = False' %path)
+
+    if not os.path.isdir(path):
+        os.makedirs(path)
+
+    for file_name in (os.listdir(path)):
+
+        if file_name.startswith('iteration_'):
+            os.remove(os.path.join(path, file_name))
+
+    with open(name + '.tmp', 'w') as run_dump:
+
+        json.dump(run, run_dump, indent = 1, sort_keys = True)
+
+    os.replace(name + '.tmp', name)
+
+    return []
@@ -0,0 +1,167 @@
+"""
+Here are all functions needed to compute the pion-decay emission from a precomputed response matrix (emissivity kernel)
+
+naima and astropy are only imported when a kernel is computed (or compared to naima), not when the kernel is taken from the cache or applied.
+"""
+
+##----------##
+# Librairies #
+##----------##
+import numpy
+import scipy.integrate as integrate
+from scipy.interpolate import interp1d
+
+##-----------------------------------------##
+# Physical constants and Conversion factors #
+##-----------------------------------------##
+from Physical_constants import *
+from Conversion_factors import *
+
+##---------##
+# Functions #
+##---------##
+
+    # kernels already computed for one (proton energy, gamma energy) grid
+kernel_cache = {}
+
+def pion_decay_kernel(E, Egamma, nuclear_enhancement = True):
+    """
+    Return the pion-decay response matrix for one grid of CR energies and one grid of gamma energies
+        flux(Egamma) = nh * sum_p K[Egamma, Ep] * N(Ep)
+    where N(Ep) is the particles distribution on the proton grid of naima (100 bins per decade).
+    The kernel is computed only once per grid and then taken from the cache.
+
+    Inputs:
+        E                   :   energy array of the CR particles distribution (GeV)
+        Egamma              :   energy array of the gamma photons (GeV)
+        nuclear_enhancement :   whether the nuclear enhancement factor is used (default = True)
+
+    Output:
+        kernel              :   dictionary with the CR energy array 'E' (GeV), the proton grid of naima 'Ep' (GeV)
+                                and the response matrix 'K' (cm^3 eV^-1 s^-1 per particle)
+    """
+    E = numpy.asarray(E, dtype = float)
+    Egamma = numpy.asarray(Egamma, dtype = float)
+    key = (E.tobytes(), Egamma.tobytes(), nuclear_enhancement)
+
+    if key in kernel_cache:
+        return kernel_cache[key]
+
+        # naima model only used for its proton grid and its differential cross section
+    import astropy.units as units
+    from naima.models import PionDecay, TableModel
+
+    model = TableModel(E * units.GeV, numpy.ones_like(E) * 1/units.GeV, amplitude = 1)
+    PD = PionDecay(model, nh = 1/units.cm**3, nuclear_enhancement = nuclear_enhancement, useLUT = False)
+    Ep = PD._Ep                                                 # GeV
+
+        # trapezoidal weights on the proton grid (GeV)
+        # like naima, an interval contributes only if the distribution is defined at both ends (E.min() <= Ep <= E.max())
+    inside = (Ep >= E.min()) & (Ep <= E.max())
+    dEp = 0.5 * numpy.diff(Ep) * (inside[1:] & inside[:-1])
+    wp = numpy.zeros_like(Ep)
+    wp[1:] += dEp
+    wp[:-1] += dEp
+
+        # response matrix (cm^3 eV^-1 s^-1)
+    K = numpy.zeros((len(Egamma), len(Ep)))
+
+    for i in range (len(Egamma)):
+
+        K[i] = PD._diffsigma(Ep, Egamma[i]) * wp            # cm^2
+
+    K = numpy.nan_to_num(K) * cl * 1.0/GeV2eV
+
+    kernel = {'E': E, 'Ep': Ep, 'K': K}
+    kernel_cache[key] = kernel
+
+    return kernel
+
+def proton_grid_distribution(N_part, kernel):
+    """
+    Return the particles distribution recast on the proton grid of the kernel
+    It follows the log-log cubic interpolation of naima.models.TableModel: a distribution with a non-positive value gives no emission.
+
+    Inputs:
+        N_part  :   particles distribution (GeV^-1), the last axis is the CR energy axis
+        kernel  :   pion-decay kernel (see pion_decay_kernel)
+
+    Output:
+        J       :   particles distribution on the proton grid (GeV^-1), the last axis is the proton energy axis
+    """
+    N_part = numpy.asarray(N_part, dtype = float)
+    positive = numpy.all(N_part > 0, axis = -1)
+
+    logN = numpy.log10(numpy.where(N_part > 0, N_part, 1.0))
+    itp = interp1d(numpy.log10(kernel['E']), logN, kind = 'cubic', axis = -1, bounds_error = False, fill_value = -numpy.inf)
+    J = 10**itp(numpy.log10(kernel['Ep']))
+
+    return J * positive[..., numpy.newaxis]
+
+def pion_decay_flux(N_part, nh, kernel):
+    """
+    Return the intrinsic differential luminosity of the pion-decay from the kernel
+
+    Inputs:
+        N_part  :   particles distribution (GeV^-1), the last axis is the CR energy axis
+        nh      :   density of the target gas (cm^-3), broadcastable to the other axes of N_part
+        kernel  :   pion-decay kernel (see pion_decay_kernel)
+
+    Output:
+        flux    :   intrinsic differential luminosity (eV^-1 s^-1), the last axis is the gamma energy axis
+    """
+    J = proton_grid_distribution(N_part, kernel)
+
+        # product with the kernel on a 2D array (numpy.dot only calls BLAS for 1D and 2D arrays), e.g. for the (zone, time) cube of Functions_zones.py
+    flux = numpy.dot(numpy.reshape(J, (-1, J.shape[-1])), kernel['K'].T)
+    flux = numpy.reshape(flux, J.shape[:-1] + (flux.shape[-1],)) * numpy.asarray(nh, dtype = float)[..., numpy.newaxis]
+
+    return numpy.nan_to_num(flux)
+
+def pion_decay_accuracy(N_part, nh, kernel, Egamma):
+    """
+    Return the accuracy of the kernel compared to the computation of naima (PionDecay without LUT)
+
+    Inputs:
+        N_part      :   set of particles distributions (GeV^-1), shape (number of distributions, number of CR energies)
+        nh          :   density of the target gas (cm^-3) of each distribution
+        kernel      :   pion-decay kernel (see pion_decay_kernel)
+        Egamma      :   energy array of the gamma photons (GeV)
+
+    Outputs:
+        err_flux    :   maximal relative error on the intrinsic differential luminosity for each gamma energy
+        err_lum     :   maximal relative error on the gamma luminosity in the whole energy range
+    """
+    import astropy.units as units
+    from naima.models import PionDecay, TableModel
+
+    N_part = numpy.atleast_2d(N_part)
+    nh = numpy.asarray(nh, dtype = float) * numpy.ones(len(N_part))
+    Egamma_ev = Egamma * GeV2eV
+    Egamma_erg = Egamma_ev * eV2erg
+
+    flux_K = pion_decay_flux(N_part, nh, kernel)
+
+    err_flux = numpy.zeros(len(Egamma))
+    err_lum = 0.0
+
+    for i in range (len(N_part)):
+
+        model = TableModel(kernel['E'] * units.GeV, N_part[i] * 1/units.GeV, amplitude = 1)
+        PD = PionDecay(model, nh = nh[i] * 1/units.cm**3, nuclear_enhancement = True, useLUT = False)
+        flux_PD = PD.flux(Egamma * units.GeV, distance = 0 * units.pc)
+        flux_PD = numpy.nan_to_num(numpy.asarray(flux_PD))
+
+        ind = numpy.where(flux_PD > 0)[0]
+        err_flux[ind] = numpy.maximum(err_flux[ind], numpy.abs(flux_K[i, ind]/flux_PD[ind] - 1))
+
+        lum_PD = integrate.trapz(flux_PD * Egamma_erg, Egamma_ev)
+        lum_K = integrate.trapz(flux_K[i] * Egamma_erg, Egamma_ev)
+
+        if lum_PD > 0:
+            err_lum = max(err_lum, abs(lum_K/lum_PD - 1))
+
+    print('maximal relative error on the differential luminosity: %.2e' %numpy.max(err_flux))
+    print('maximal relative error on the gamma luminosity: %.2e' %err_lum)
+
+    return err_flux, err_lum
@@ -0,0 +1,419 @@
+"""
+Here are all plotting functions of the Plotting programs (graphics with the style of the figures)
+
+They are kept apart from Functions.py so that the computation (Iterations.py, Sweep.py and their workers) never loads matplotlib.
+"""
+
+##----------##
+# Librairies #
+##----------##
+import matplotlib.pyplot as plt
+from matplotlib import rcParams
+from mpl_toolkits.axes_grid1 import host_subplot
+import mpl_toolkits.axisartist as AA
+import numpy
+
+##---------##
+# Functions #
+##---------##
+
+    # axes
+rcParams['xtick.bottom'] = True
+rcParams['xtick.top'] = True
+rcParams['xtick.minor.visible'] = True
+#rcParams['xtick.major.size'] = 10
+#rcParams['xtick.minor.size'] = 7
+
+rcParams['ytick.left'] = True
+rcParams['ytick.right'] = True
+rcParams['ytick.minor.visible'] = True
+
+plt.rc('font', family='serif', size = 12)
+figsize = (12, 8)
+
+#rcParams['lines.linewidth'] = 8
+
+def log_plot(figure_number, number_of_plot, x, y, xlabel, ylabel, symbol, linestyle, color, xmin, xmax, ymin, ymax, label_name = 'none', title = 'none', text = 'none'):
+    """
+    Plot a log-log graphic
+    Inputs:
+        figure_number   :   define the number of the figure
+        number_of_plot  :   define how many plot you want on one figure (with the same axis)
+        x               :   x-vector
+        y               :   y-array (line = one y-array and row = each different y-plot)
+        label_name      :   legend of one y (default = 'none')
+        title           :   title of the plot (default = 'none')
+        xlabel          :   label of the x-axis
+        ylabel          :   label of the y-axis
+        symbol          :   symbol of one y
+        linestyle       :   style of the line (drashed, etc)
+        text            :   important parameters that you will write on the figure (default = 'none')
+        xmin            :   minimum of x
+        xmax            :   maximum of x
+        ymin            :   minimum of y
+        ymax            :   maximum of y
+    """
+        # figure
+    fig = plt.figure(figure_number, figsize = figsize)
+    ax = fig.gca()      # shared by all plots of the figure
+
+        # limit
+    plt.xlim((xmin, xmax))
+    plt.ylim((ymin, ymax))
+
+        # Plot
+    if number_of_plot > 1:
+
+        for i in range (number_of_plot):
+            y_plot = y[i]
+
+            if len(symbol) > 1:
+                rcParams['lines.marker'] = symbol[i]
+                rcParams['lines.linestyle'] = linestyle[i]
+                col = color[i]
+
+            else:
+                rcParams['lines.marker'] = symbol
+                rcParams['lines.linestyle'] = linestyle
+                col = color
+
+            if label_name == 'none':
+                plt.loglog(x, y_plot, color = col)
+
+            else:
+                plt.loglog(x, y_plot, label = label_name[i], color = col)
+                plt.legend(loc = 'best')
+
+    elif label_name == 'none':
+
+        rcParams['lines.marker'] = symbol
+        rcParams['lines.linestyle'] = linestyle
+        col = color
+
+        plt.loglog(x, y, color = col)
+
+    else:
+        rcParams['lines.marker'] = symbol
+        rcParams['lines.linestyle'] = linestyle
+        col = color
+
+        plt.loglog(x, y, label = label_name, color = col)
+        plt.legend(loc = 'best')
+
+    if title != 'none':
+
+        plt.title(title)
+
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
+
+        # grid
+    plt.grid(color = 'k', alpha = 0.15, linestyle = ':')
+
+        # text
+    if text != 'none':
+        plt.text(0.5, 0.5, text, horizontalalignment='center', verticalalignment='center', transform = ax.transAxes)
+
+    return
+
+def plot(figure_number, number_of_plot, x, y, xlabel, ylabel, symbol, linestyle, color, xmin, xmax, ymin, ymax, label_name = 'none', title = 'none', text = 'none'):
+    """
+    Function to plot a linear graphic
+    Inputs:
+        figure_number   :   define the number of the figure
+        number_of_plot  :   define how many plot you want on one figure (with the same axis)
+        x               :   x-vector
+        y               :   y-array (line = one y-array and row = each different y-plot)
+        label_name      :   legend of one y (default = 'none')
+        title           :   title of the plot (default = 'none')
+        xlabel          :   label of the x-axis
+        ylabel          :   label of the y-axis
+        symbol          :   symbol of one y
+        linestyle       :   style of the line (drashed, etc)
+        text            :   important parameters that you will write on the figure (default = 'none')
+        xmin            :   minimum of x
+        xmax            :   maximum of x
+        ymin            :   minimum of y
+        ymax            :   maximum of y
+    """
+        # figure
+    fig = plt.figure(figure_number, figsize=figsize)
+    ax = fig.gca()      # shared by all plots of the figure
+
+        # limit
+    plt.xlim((xmin, xmax))
+    plt.ylim((ymin, ymax))
+
+        # Plot
+    if number_of_plot > 1:
+
+        for i in range (number_of_plot):
+            y_plot = y[i]
+
+            if len(symbol) > 1:
+                rcParams['lines.marker'] = symbol[i]
+                rcParams['lines.linestyle'] = linestyle[i]
+                col = color[i]
+
+            else:
+                rcParams['lines.marker'] = symbol
+                rcParams['lines.linestyle'] = linestyle
+                col = color
+
+            if label_name == 'none':
+                plt.plot(x, y_plot, color = col)
+
+            else:
+                plt.plot(x, y_plot, label = label_name[i], color = col)
+                plt.legend(loc = 'best')
+
+    elif label_name == 'none':
+        rcParams['lines.marker'] = symbol
+        rcParams['lines.linestyle'] = linestyle
+        col = color
+
+        plt.plot(x, y, color = col)
+
+    else:
+        rcParams['lines.marker'] = symbol
+        rcParams['lines.linestyle'] = linestyle
+        col = color
+
+        plt.plot(x, y, label = label_name, color = col)
+        plt.legend(loc = 'best')
+
+    if title != 'none':
+
+        plt.title(title)
+
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
+
+        # grid
+    plt.grid(color = 'k', alpha = 0.15, linestyle = ':')
+
+        # text
+    if text != 'none':
+        plt.text(0.5, 0.5, text, horizontalalignment='center', verticalalignment='center', transform = ax.transAxes)
+
+    return
+
+def semilog_plot(figure_number, number_of_plot, x, y, xlabel, ylabel, symbol, linestyle, color, xmin, xmax, ymin, ymax, label_name = 'none', title = 'none', text = 'none'):
+    """
+    Function to plot a linear graphic
+    Inputs:
+        figure_number   :   define the number of the figure
+        number_of_plot  :   define how many plot you want on one figure (with the same axis)
+        x               :   x-vector
+        y               :   y-array (line = one y-array and row = each different y-plot)
+        label_name      :   legend of one y (default = 'none')
+        title           :   title of the plot (default = 'none')
+        xlabel          :   label of the x-axis
+        ylabel          :   label of the y-axis
+        symbol          :   symbol of one y
+        linestyle       :   style of the line (drashed, etc)
+        text            :   important parameters that you will write on the figure (default = 'none')
+        xmin            :   minimum of x
+        xmax            :   maximum of x
+        ymin            :   minimum of y
+        ymax            :   maximum of y
+    """
+        # figure
+    fig = plt.figure(figure_number, figsize=figsize)
+    ax = fig.gca()      # shared by all plots of the figure
+
+        # limit
+    plt.xlim((xmin, xmax))
+    plt.ylim((ymin, ymax))
+
+        # Plot
+    if number_of_plot > 1:
+
+        for i in range (number_of_plot):
+            y_plot = y[i]
+
+            if len(symbol) > 1:
+                rcParams['lines.marker'] = symbol[i]
+                rcParams['lines.linestyle'] = linestyle[i]
+                col = color[i]
+
+            else:
+                rcParams['lines.marker'] = symbol
+                rcParams['lines.linestyle'] = linestyle
+                col = color
+
+            if label_name == 'none':
+                plt.plot(x, y_plot, color = col)
+
+            else:
+                plt.plot(x, y_plot, label = label_name[i], color = col)
+                plt.legend(loc = 'best')
+
+    elif label_name == 'none':
+        rcParams['lines.marker'] = symbol
+        rcParams['lines.linestyle'] = linestyle
+        col = color
+
+        plt.plot(x, y, color = col)
+
+    else:
+        rcParams['lines.marker'] = symbol
+        rcParams['lines.linestyle'] = linestyle
+        col = color
+
+        plt.plot(x, y, label = label_name, color = col)
+        plt.legend(loc = 'best')
+
+    plt.yscale('log')
+
+    if title != 'none':
+
+        plt.title(title)
+
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
+
+        # grid
+    plt.grid(color = 'k', alpha = 0.15, linestyle = ':')
+
+        # text
+    if text != 'none':
+        plt.text(0.5, 0.5, text, horizontalalignment='center', verticalalignment='center', transform = ax.transAxes)
+
+    return
+
+def log_plot_multi(figure_number, x, y, label_name, xlabel, ylabel, symbol, title = 'none'):
+    """
+    Plot a log-log graphic for two different y-axis
+    Inputs:
+        figure_number   :   define the number of the figure
+        x               :   x-vector
+        y               :   (2D) y-array
+        label_name      :   legend of one y
+        title           :   title of the plot (default = 'none')
+        xlabel          :   label of the x-axis
+        ylabel          :   labels of the y-axis
+        symbol          :   symbol of one y
+    """
+
+        # figure
+    fig = plt.figure(figure_number, figsize = figsize)
+
+        # axes
+    host = host_subplot(111, axes_class=AA.Axes)
+    plt.subplots_adjust(right=0.75)
+
+    par = host.twinx()
+
+    par.axis["right"].toggle(all=True)
+
+    host.set_xlabel(xlabel)
+    host.set_ylabel(ylabel[0])
+    p1, = host.loglog(x, y[0], symbol[0], label = label_name[0])
+
+            # second axes
+    par.set_ylabel(ylabel[1])
+    p2, = par.loglog(x, y[1], symbol[1], label = label_name[1])
+
+        # legend
+    host.legend()
+    host.axis["left"].label.set_color(p1.get_color())
+    par.axis["right"].label.set_color(p2.get_color())
+
+        # grid
+    plt.grid(color = 'k', alpha = 0.15, linestyle = ':')
+
+        # Title
+    if title != 'none':
+
+        plt.title(title)
+
+        # Draw
+    plt.draw()
+
+    return
+
+def plot_multi(figure_number, x, y, xlabel, ylabel, symbol, label_name, title = 'none'):
+    """
+    Plot a linear graphic for two different y-axis
+    Inputs:
+        figure_number   :   define the number of the figure
+        x               :   x-vector
+        y               :   (2D) y-array
+        label_name      :   legend of one y
+        title           :   title of the plot (default = 'none')
+        xlabel          :   label of the x-axis
+        ylabel          :   labels of the y-axis
+        symbol          :   symbol of one y
+    """
+
+        # figure
+    fig = plt.figure(figure_number, figsize = figsize)
+
+        # axes
+    host = host_subplot(111, axes_class=AA.Axes)
+    plt.subplots_adjust(right=0.75)
+
+    par = host.twinx()
+
+    par.axis["right"].toggle(all=True)
+
+            # host axes
+    host.set_xlabel(xlabel)
+    host.set_ylabel(ylabel[0])
+    p1, = host.plot(x, y[0], symbol[0], label = label_name[0])
+
+            # second axes
+    par.set_ylabel(ylabel[1])
+    p2, = par.plot(x, y[1], symbol[1], label = label_name[1])
+
+        # legend
+    host.legend()
+    host.axis["left"].label.set_color(p1.get_color())
+    par.axis["right"].label.set_color(p2.get_color())
+
+        # grid
+    plt.grid(color = 'k', alpha = 0.15, linestyle = ':')
+
+        # Title
+    if title != 'none':
+
+        plt.title(title)
+
+        # Draw
+    plt.draw()
+
+    return
+
+def histogramme(figure_number, hist, xlabel, ylabel, len_bins, label_name = 'none', title = 'none'):
+    """
+    Return the histogramme of hist
+    Inputs:
+        figure_number   :   define the number of the figure
+        hist            :   what you want to make the histogramme
+        label_name      :   label of the data (default = 'none')
+        title           :   title of the histogramme (default = 'none')
+        xlabel          :   label of the x-axis
+        ylabel          :   label of the y axis
+    """
+    plt.figure(figure_number, figsize=figsize)
+    hist_max = numpy.max(hist)
+    hist_min = numpy.min(hist)
+    bins = max(int((hist_max - hist_min)/len_bins), 1)
+
+    if label_name == 'none':
+        plt.hist(hist, histtype = 'step', bins = bins, align = 'mid')
+
+    else:
+        plt.hist(hist, histtype = 'step', bins = bins, align = 'mid', label = label_name)
+        plt.legend(loc = 'best')
+
+    if title != 'none':
+
+        plt.title(title)
+
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
+
+
+    return
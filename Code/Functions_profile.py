@@ -0,0 +1,151 @@
+"""
+Here are all functions needed to profile the computation of the gamma emission (wall time and number of calls of each stage of data, for each zone)
+
+The profiling is enabled with profiling = True in the Parameters_system. When it is disabled, each stage only costs one test of this flag.
+The stages computed by the workers are added to the ones of the main process (see Functions_iterations.run_iterations), so the report covers all iterations.
+"""
+
+##----------##
+# Librairies #
+##----------##
+from time import perf_counter
+
+##-----------------------------------------##
+# Physical constants and Conversion factors #
+##-----------------------------------------##
+from Parameters_system import *
+
+##---------##
+# Functions #
+##---------##
+
+    # wall time (s) and number of calls of each stage: {(stage, zone): [time, calls]}, zone = 0 for the stages common to all zones
+profile_stages = {}
+
+def profile_clock():
+    """
+    Return the start time of a stage (see profile_add)
+
+    Output:
+        start   :   wall time (s), 0 when the profiling is disabled
+    """
+    if not profiling:
+        return 0.0
+
+    return perf_counter()
+
+def profile_add(stage, zone, start):
+    """
+    Add the wall time since start and one call to a stage
+
+    Inputs:
+        stage   :   name of the stage
+        zone    :   zone of the stage (1: cavity of the SB, 2: supershell, 3: outside and 0: all zones)
+        start   :   start time of the stage (see profile_clock)
+    """
+    if not profiling:
+        return
+
+    duration = perf_counter() - start
+
+    if (stage, zone) in profile_stages:
+
+        profile_stages[(stage, zone)][0] += duration
+        profile_stages[(stage, zone)][1] += 1
+
+    else:
+
+        profile_stages[(stage, zone)] = [duration, 1]
+
+    return
+
+def profile_snapshot():
+    """
+    Return a copy of the profile of this process (e.g. before an iteration, see profile_difference)
+
+    Output:
+        stages  :   wall time (s) and number of calls of each stage
+    """
+
+    return {key: list(value) for key, value in (profile_stages.items())}
+
+def profile_difference(before):
+    """
+    Return the profile of this process since a snapshot
+
+    Input:
+        before  :   snapshot of the profile (see profile_snapshot)
+
+    Output:
+        stages  :   wall time (s) and number of calls of each stage since the snapshot
+    """
+    stages = {}
+
+    for key in (profile_stages):
+
+        duration, calls = before.get(key, [0.0, 0])
+        stages[key] = [profile_stages[key][0] - duration, profile_stages[key][1] - calls]
+
+    return stages
+
+def profile_merge(stages):
+    """
+    Add a profile (e.g. computed by a worker) to the profile of this process
+
+    Input:
+        stages  :   wall time (s) and number of calls of each stage
+    """
+    for key in (stages):
+
+        if key in profile_stages:
+
+            profile_stages[key][0] += stages[key][0]
+            profile_stages[key][1] += stages[key][1]
+
+        else:
+
+            profile_stages[key] = list(stages[key])
+
+    return
+
+def profile_reset():
+    """
+    Remove all stages from the profile of this process
+    """
+    profile_stages.clear()
+
+    return
+
+def profile_report(path = None):
+    """
+    Return the lines of the profile report (stages sorted by decreasing wall time), print them and write them in a file
+
+    Input:
+        path    :   name of the file of the report, None to only print it (default = None)
+
+    Output:
+        lines   :   lines of the report
+    """
+    total = sum([profile_stages[key][0] for key in (profile_stages) if key[0] == 'data'])
+
+    lines = ['%-16s %6s %10s %12s %14s %8s' %('stage', 'zone', 'calls', 'time (s)', 'per call (ms)', '% data')]
+
+    for key in (sorted(profile_stages, key = lambda key: -profile_stages[key][0])):
+
+        duration, calls = profile_stages[key]
+        zone = 'all' if key[1] == 0 else str(key[1])
+        fraction = 100 * duration/total if total > 0 else 0.0
+
+        lines.append('%-16s %6s %10d %12.3f %14.4f %8.1f' %(key[0], zone, calls, duration, 1e3 * duration/max(calls, 1), fraction))
+
+    for line in (lines):
+
+        print(line)
+
+    if path is not None:
+
+        with open(path, 'w') as profile_dump:
+
+            profile_dump.write('\n'.join(lines) + '\n')
+
+    return lines
@@ -0,0 +1,149 @@
+"""
+Here are all functions needed to build the energy grids (CR and gamma photons) and their integration weights
+
+Two quadratures in log(E) are available:
+    'trapezoid' :   logarithmic bins and trapezoidal rule (as before)
+    'gauss'     :   Gauss-Lobatto-Legendre nodes and weights in log(E): the first and last nodes are the bounds of the grid and the integral
+                    of a smooth spectrum is much more accurate for the same number of bins
+"""
+
+##----------##
+# Librairies #
+##----------##
+import numpy
+from numpy.polynomial import legendre
+
+##---------##
+# Functions #
+##---------##
+
+    # number of nodes of the local interpolating polynomial of the weights of a band with 'gauss' (see log_quadrature_band)
+quadrature_band_order = 4
+
+def gauss_lobatto(n):
+    """
+    Return the Gauss-Lobatto-Legendre nodes and weights on [-1, 1]
+
+    Input:
+        n       :   number of nodes (at least 2)
+
+    Outputs:
+        s       :   nodes (sorted, the first and last ones are -1 and 1)
+        w       :   weights
+    """
+    if n < 2:
+        raise ValueError('the Gauss-Lobatto-Legendre quadrature needs at least 2 nodes')
+
+    Pn = legendre.Legendre.basis(n - 1)
+
+    s = numpy.concatenate(([-1.0], numpy.sort(Pn.deriv().roots().real), [1.0]))
+    w = 2.0/(n * (n - 1) * Pn(s)**2)
+
+    return s, w
+
+def log_quadrature(xmin, xmax, n, quadrature = 'trapezoid'):
+    """
+    Return the nodes and the weights of a quadrature in log(x)
+        int_xmin^xmax f(x) dx = sum_i w_i * f(x_i)
+
+    Inputs:
+        xmin        :   lower bound
+        xmax        :   upper bound
+        n           :   number of nodes
+        quadrature  :   'trapezoid' (logarithmic bins) or 'gauss' (Gauss-Lobatto-Legendre nodes in log(x)) (default = 'trapezoid')
+
+    Outputs:
+        x           :   nodes (sorted, the first and last ones are xmin and xmax)
+        w           :   weights (same unit as x)
+    """
+    if quadrature == 'trapezoid':
+
+        x = numpy.logspace(numpy.log10(xmin), numpy.log10(xmax), n)
+        dx = 0.5 * numpy.diff(x)
+        w = numpy.zeros(n)
+        w[1:] += dx
+        w[:-1] += dx
+
+    elif quadrature == 'gauss':
+
+        s, ws = gauss_lobatto(n)
+        length = numpy.log(xmax) - numpy.log(xmin)
+
+        x = numpy.exp(numpy.log(xmin) + 0.5 * (s + 1) * length)
+        x[0] = xmin
+        x[-1] = xmax
+        w = 0.5 * length * ws * x
+
+    else:
+        raise ValueError("unknown quadrature %s ('trapezoid' or 'gauss')" %quadrature)
+
+    return x, w
+
+def log_quadrature_band(x, a, b, quadrature = 'trapezoid'):
+    """
+    Return the weights of the integral from a to b of a function known on the nodes of log_quadrature
+        int_a^b f(x) dx = sum_i w_i * f(x_i)
+    With 'trapezoid', it is the trapezoidal rule on the nodes between a and b (as numpy.trapz on these nodes).
+    With 'gauss', a band covering the whole grid has the Gauss-Lobatto-Legendre weights of the grid. Otherwise the function times x is interpolated
+    in log(x), on each interval between two nodes, by the polynomial through the quadrature_band_order nearest nodes (local cubic: stable for any part
+    of the grid, unlike the polynomial through all the nodes), which is integrated on the part of the interval inside the band.
+
+    Inputs:
+        x           :   nodes of log_quadrature
+        a           :   lower bound of the integral
+        b           :   upper bound of the integral
+        quadrature  :   quadrature of the nodes (default = 'trapezoid')
+
+    Output:
+        w           :   weights (same unit as x), zero for the nodes which do not contribute
+    """
+    x = numpy.asarray(x, dtype = float)
+    w = numpy.zeros(len(x))
+
+    if quadrature == 'trapezoid':
+
+        ind = numpy.where((x >= a) & (x <= b))[0]
+        dx = 0.5 * numpy.diff(x[ind])
+        w[ind[1:]] += dx
+        w[ind[:-1]] += dx
+
+        return w
+
+    if quadrature != 'gauss':
+        raise ValueError("unknown quadrature %s ('trapezoid' or 'gauss')" %quadrature)
+
+        # whole grid
+    if (a <= x[0]) and (b >= x[-1]):
+        return log_quadrature(x[0], x[-1], len(x), quadrature)[1]
+
+        # nodes in [-1, 1] and bounds of the integral (inside the grid)
+    length = numpy.log(x[-1]) - numpy.log(x[0])
+    s = 2 * (numpy.log(x) - numpy.log(x[0]))/length - 1
+    sa = 2 * (numpy.log(max(a, x[0])) - numpy.log(x[0]))/length - 1
+    sb = 2 * (numpy.log(min(b, x[-1])) - numpy.log(x[0]))/length - 1
+
+    if sb <= sa:
+        return w
+
+    order = min(quadrature_band_order, len(x))
+
+    for j in range (len(x) - 1):
+
+        lower = max(s[j], sa)
+        upper = min(s[j + 1], sb)
+
+        if upper <= lower:
+            continue
+
+            # nearest nodes of the interval (j-1 to j+2 for a cubic)
+        first = min(max(j - (order - 1)//2, 0), len(x) - order)
+        nodes = s[first:first + order]
+
+        for i in range (order):
+
+                # Lagrange polynomial of the node first + i, integrated on the part of the interval inside the band
+            others = numpy.delete(nodes, i)
+            primitive = numpy.polynomial.polynomial.polyint(numpy.polynomial.polynomial.polyfromroots(others)/numpy.prod(nodes[i] - others))
+            w[first + i] += numpy.polynomial.polynomial.polyval(upper, primitive) - numpy.polynomial.polynomial.polyval(lower, primitive)
+
+    return 0.5 * length * w * x
@@ -0,0 +1,201 @@
+"""
+Here are all functions needed to reduce the iterations one after the other (streaming) and to write their results in a store
+
+Each iteration is reduced as soon as it is computed (or read in the checkpoint directory): its luminosities, the results of the registered bands
+(see Functions_bands.py) and the statistics of each time bin (see Functions_statistics.py) are written in memory-mapped arrays, and its full intrinsic
+differential luminosity is only kept for some iterations (flux_iterations) and/or down-sampled in time for all iterations (flux_time_step).
+The memory used does not depend on the number of iterations.
+"""
+
+##----------##
+# Librairies #
+##----------##
+import os
+import numpy
+from Functions_bands import *
+from Functions_store import *
+from Functions_statistics import *
+
+##---------##
+# Functions #
+##---------##
+
+    # results of data written for each iteration (see Functions_gamma.data), with their unit
+reduction_outputs = (('Lum', 'erg s^-1'), ('Flux', 'eV^-1 s^-1'), ('Lum_pwn', 'erg s^-1'), ('Lum_psr', 'erg s^-1'), ('nob', ''), ('Lum_zones', 'erg s^-1'))
+
+    # parameters of the SB (the same for all iterations), with their unit
+reduction_SB = (('Rsb', 'pc'), ('Vsb', 'km s^-1'), ('Ms', 'Msun'), ('ns', 'cm^-3'))
+
+def reduction_start(path, path_statistics, t, nit, flux_iterations = None, flux_time_step = None, precision = 'float64', zones = None):
+    """
+    Return an empty reduction of the iterations
+
+    Inputs:
+        path            :   directory of the store of the results
+        path_statistics :   directory of the store of the accumulators (see Functions_statistics.accumulator_write)
+        t               :   time array (yr)
+        nit             :   number of iterations
+        flux_iterations :   iterations whose full intrinsic differential luminosity is kept (default = None: all iterations)
+        flux_time_step  :   number of time bins averaged in the down-sampled intrinsic differential luminosity of all iterations (default = None: not computed)
+        precision       :   precision of the luminosities in the store (see Functions_store.store_encode) (default = 'float64')
+        zones           :   zones of the run, written in the store for the luminosity of each zone 'Lum_zones' (default = None: not written)
+
+    Output:
+        reduction       :   dictionary with the settings, the memory-mapped arrays 'arrays', the accumulators 'accumulators', the parameters of the SB 'SB'
+                            and the maximal relative errors of the precision 'errors'
+    """
+    nt = len(t)
+
+    if flux_iterations is None:
+        flux_iterations = range (nit)
+
+    flux_iterations = [int(i) for i in (flux_iterations)]
+
+    reduction = {'path': path, 'path_statistics': path_statistics, 'nit': nit, 'nt': nt, 'precision': precision,
+                 'flux_iterations': {flux_iterations[k]: k for k in range (len(flux_iterations))}, 'flux_time_step': flux_time_step,
+                 'arrays': {}, 'accumulators': {name: accumulator(nt, statistics_quantities[name]['edges']) for name in (statistics_quantities)},
+                 'SB': numpy.zeros((len(reduction_SB), nt)), 'errors': {}}
+
+    store_write(path, 'Flux_iterations', numpy.asarray(flux_iterations, dtype = int), ['iteration'])
+
+    if zones is not None:
+        store_write(path, 'zones', numpy.asarray(zones, dtype = int), ['zone'])
+
+        # time of the down-sampled intrinsic differential luminosity: mean time of each group of flux_time_step time bins (yr)
+    if flux_time_step is not None:
+
+        nt_down = nt//flux_time_step
+        store_write(path, 't_down', numpy.mean(numpy.reshape(t[:nt_down * flux_time_step], (nt_down, flux_time_step)), axis = 1), ['time'], 'yr')
+
+    return reduction
+
+def reduction_write(reduction, name, row, values, shape, axes, unit, precision):
+    """
+    Write one row of an array of the reduction (the memory-mapped array is created with the first row)
+    The offset of the logarithmic precision is the one of the unit (see Functions_store.store_offset) and the relative error of the stored values is kept in the errors of the reduction.
+
+    Inputs:
+        reduction   :   reduction (see reduction_start)
+        name        :   name of the array
+        row         :   index of the row (iteration)
+        values      :   values of the row
+        shape       :   shape of the array
+        axes        :   name of each axis of the array
+        unit        :   unit of the array
+        precision   :   precision of the array (see Functions_store.store_encode), None to write the values as they are
+    """
+    if name not in reduction['arrays']:
+
+        offset = store_offset(values, unit) if (precision is not None) and store_precisions[precision][1] else 0.0
+        array = store_create(reduction['path'], name, shape, axes, unit, precision = precision, offset = offset)
+        reduction['arrays'][name] = (array, offset)
+
+    array, offset = reduction['arrays'][name]
+
+    if precision is None:
+        array[row] = values
+
+    else:
+        array[row] = store_encode(values, precision, offset)
+
+    if precision not in (None, 'float64'):
+
+        error = relative_error(store_decode(array[row], precision, offset), numpy.asarray(values, dtype = float))
+        reduction['errors'][name] = max(reduction['errors'].get(name, 0.0), error)
+
+    return
+
+def reduction_update(reduction, i, outputs):
+    """
+    Reduce one iteration
+
+    Inputs:
+        reduction   :   reduction (see reduction_start)
+        i           :   index of the iteration
+        outputs     :   outputs of data for this iteration (see Functions_gamma.data)
+    """
+    nit = reduction['nit']
+    nt = reduction['nt']
+    precision = reduction['precision']
+    axes = ['iteration', 'time']
+
+    quantities = {reduction_outputs[k][0]: numpy.asarray(outputs[k], dtype = float) for k in range (len(reduction_outputs))}
+    Flux = quantities.pop('Flux')
+    nE = Flux.shape[1]
+
+        # Gamma-ray luminosities and photon spectral indices of the bands, computed from the intrinsic differential luminosity before its storage
+    quantities.update(band_quantities(Flux))
+
+    for name in (sorted(quantities)):
+
+        if name == 'nob':
+            reduction_write(reduction, name, i, quantities[name], (nit, nt), axes, '', None)
+
+        elif name == 'Lum_zones':
+            reduction_write(reduction, name, i, quantities[name], (nit,) + quantities[name].shape, axes + ['zone'], 'erg s^-1', precision)
+
+        elif name.startswith('Gamma_'):
+            reduction_write(reduction, name, i, quantities[name], (nit, nt), axes, '', store_signed[precision])
+
+        else:
+            reduction_write(reduction, name, i, quantities[name], (nit, nt), axes, 'erg s^-1', precision)
+
+        # Full intrinsic differential luminosity of the selected iterations
+    if i in reduction['flux_iterations']:
+
+        nflux = len(reduction['flux_iterations'])
+        reduction_write(reduction, 'Flux', reduction['flux_iterations'][i], Flux, (nflux, nt, nE), axes + ['energy'], 'eV^-1 s^-1', precision)
+
+        # Down-sampled intrinsic differential luminosity of all iterations
+    step = reduction['flux_time_step']
+
+    if step is not None:
+
+        nt_down = nt//step
+        Flux_down = numpy.mean(numpy.reshape(Flux[:nt_down * step], (nt_down, step, nE)), axis = 1)
+        reduction_write(reduction, 'Flux_down', i, Flux_down, (nit, nt_down, nE), axes + ['energy'], 'eV^-1 s^-1', precision)
+
+        # Statistics of each time bin
+    for name in (reduction['accumulators']):
+
+        reduction['accumulators'][name] = accumulator_update(reduction['accumulators'][name], quantities[name])
+
+        # Parameters of the SB
+    SB = numpy.asarray(outputs[len(reduction_outputs):], dtype = float)
+    ind = numpy.where(SB[0] > 0.0)[0]
+    reduction['SB'][:, ind] = SB[:, ind]
+
+        # Validation of the precision: maximal relative error of the results of the bands computed from the stored intrinsic differential luminosity
+        # (the errors of all stored arrays are kept by reduction_write)
+    if precision != 'float64':
+
+        offset = reduction['arrays']['Flux'][1] if 'Flux' in reduction['arrays'] else None
+        errors = band_precision_errors(Flux, precision, offset)
+        reduction['errors'].update({name: max(reduction['errors'].get(name, 0.0), errors[name]) for name in (errors)})
+
+    return
+
+def reduction_finish(reduction):
+    """
+    Write the parameters of the SB and the accumulators of a reduction, and flush its memory-mapped arrays
+
+    Input:
+        reduction   :   reduction (see reduction_start)
+
+    Output:
+        errors      :   maximal relative errors introduced by the precision on each stored array and on the results of the bands computed from
+                        the stored intrinsic differential luminosity (see Functions_bands.band_precision_errors), empty for 'float64'
+    """
+    for name in (reduction['arrays']):
+
+        reduction['arrays'][name][0].flush()
+
+    for k, (name, unit) in enumerate(reduction_SB):
+
+        store_write(reduction['path'], name, reduction['SB'][k], ['time'], unit)
+
+    for name in (reduction['accumulators']):
+
+        accumulator_write(reduction['path_statistics'], name, reduction['accumulators'][name])
+
+    return reduction['errors']
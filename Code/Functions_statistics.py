@@ -0,0 +1,194 @@
+"""
+Here are all functions needed to compute the statistics of the iterations for each time bin without keeping all the iterations in memory
+
+An accumulator is a dictionary updated with one or several iterations at a time.
+Two accumulators (e.g. of two files of iterations) can be merged and both give exactly the same mean and standard deviation as all the iterations together.
+"""
+
+##----------##
+# Librairies #
+##----------##
+import numpy
+from Functions_store import *
+
+##---------##
+# Functions #
+##---------##
+
+    # quantities of the iterations followed by an accumulator, with their histogram edges (for the quantiles), if their mean is a log-mean and their unit
+statistics_quantities = {'Lum_HESS': {'edges': numpy.logspace(25, 40, 301), 'log': False, 'unit': 'erg s^-1'},
+                         'Lum_Fermi': {'edges': numpy.logspace(25, 40, 301), 'log': False, 'unit': 'erg s^-1'},
+                         'Lum': {'edges': numpy.logspace(25, 40, 301), 'log': False, 'unit': 'erg s^-1'},
+                         'Gamma_HESS': {'edges': numpy.linspace(-1, 6, 701), 'log': False, 'unit': ''},
+                         'Gamma_GeV': {'edges': numpy.linspace(-1, 6, 701), 'log': False, 'unit': ''},
+                         'Gamma_MeV': {'edges': numpy.linspace(-1, 6, 701), 'log': False, 'unit': ''},
+                         'Lum_pwn': {'edges': numpy.logspace(25, 40, 301), 'log': True, 'unit': 'erg s^-1'},
+                         'Lum_psr': {'edges': numpy.logspace(25, 40, 301), 'log': True, 'unit': 'erg s^-1'}}
+
+def accumulator(number_bin_t, edges):
+    """
+    Return an empty accumulator
+
+    Inputs:
+        number_bin_t    :   number of time bins
+        edges           :   edges of the histogram used for the quantiles (values outside are put on the first or last edge)
+
+    Output:
+        acc             :   dictionary with, for each time bin, the number of iterations 'n', the mean 'mean', the sum of the squared deviations 'm2',
+                            the number of positive values 'npos', the sum of their log10 'logsum' and the histogram 'hist'
+    """
+    edges = numpy.asarray(edges, dtype = float)
+
+    return {'n': numpy.zeros(number_bin_t), 'mean': numpy.zeros(number_bin_t), 'm2': numpy.zeros(number_bin_t),
+            'npos': numpy.zeros(number_bin_t), 'logsum': numpy.zeros(number_bin_t),
+            'edges': edges, 'hist': numpy.zeros((number_bin_t, len(edges) + 1))}
+
+def accumulator_merge(acc_a, acc_b):
+    """
+    Return the accumulator of the iterations of two accumulators (Chan et al. formula for the mean and the variance)
+
+    Inputs:
+        acc_a   :   first accumulator
+        acc_b   :   second accumulator (same time bins and histogram edges)
+
+    Output:
+        acc     :   merged accumulator
+    """
+    if not numpy.array_equal(acc_a['edges'], acc_b['edges']):
+        raise ValueError('the accumulators do not have the same histogram edges')
+
+    n = acc_a['n'] + acc_b['n']
+    n_safe = numpy.where(n > 0, n, 1.0)
+    delta = acc_b['mean'] - acc_a['mean']
+
+    return {'n': n,
+            'mean': acc_a['mean'] + delta * acc_b['n']/n_safe,
+            'm2': acc_a['m2'] + acc_b['m2'] + delta**2 * acc_a['n'] * acc_b['n']/n_safe,
+            'npos': acc_a['npos'] + acc_b['npos'],
+            'logsum': acc_a['logsum'] + acc_b['logsum'],
+            'edges': acc_a['edges'],
+            'hist': acc_a['hist'] + acc_b['hist']}
+
+def accumulator_update(acc, x):
+    """
+    Return the accumulator updated with one or several iterations
+
+    Inputs:
+        acc     :   accumulator
+        x       :   values of the iterations, shape (number of time bins) or (number of iterations, number of time bins)
+
+    Output:
+        acc     :   updated accumulator
+    """
+    x = numpy.atleast_2d(numpy.asarray(x, dtype = float))
+    m, number_bin_t = x.shape
+
+        # accumulator of the new iterations
+    mean = numpy.mean(x, axis = 0)
+    positive = x > 0
+    bins = numpy.searchsorted(acc['edges'], x) + numpy.arange(number_bin_t) * (len(acc['edges']) + 1)
+
+    acc_x = {'n': numpy.full(number_bin_t, float(m)),
+             'mean': mean,
+             'm2': numpy.sum((x - mean)**2, axis = 0),
+             'npos': numpy.sum(positive, axis = 0),
+             'logsum': numpy.sum(numpy.log10(numpy.where(positive, x, 1.0)), axis = 0),
+             'edges': acc['edges'],
+             'hist': numpy.bincount(bins.ravel(), minlength = acc['hist'].size).reshape(acc['hist'].shape)}
+
+    return accumulator_merge(acc, acc_x)
+
+def accumulator_statistics(acc, log = False, positive = True):
+    """
+    Return the mean and the standard deviation of the iterations for each time bin
+    The log-mean of the positive values is the one of the plotting scripts before the accumulators (the iterations with x = 0 were removed before the log10):
+    it is nan for a time bin without positive value. With positive = False, it is the log-mean of all iterations, which is 0 as soon as one iteration is 0.
+
+    Inputs:
+        acc         :   accumulator
+        log         :   if True, the mean is the log-mean 10**(mean(log10(x))) (default = False)
+        positive    :   if True, the log-mean is over the positive values only, otherwise over all iterations (default = True)
+
+    Outputs:
+        mean    :   mean (nan when there is no value)
+        std     :   standard deviation (nan when there is no value)
+    """
+    with numpy.errstate(invalid = 'ignore', divide = 'ignore'):
+
+        std = numpy.sqrt(acc['m2']/acc['n'])
+
+        if log and positive:
+            mean = 10**(acc['logsum']/acc['npos'])
+
+        elif log:
+            mean = numpy.where(acc['npos'] < acc['n'], 0.0, 10**(acc['logsum']/acc['n']))
+
+        else:
+            mean = numpy.where(acc['n'] > 0, acc['mean'], numpy.nan)
+
+    return mean, std
+
+def accumulator_quantiles(acc, q):
+    """
+    Return approximate quantiles of the iterations for each time bin (linear interpolation in the bins of the histogram)
+
+    Inputs:
+        acc     :   accumulator
+        q       :   quantile or list of quantiles (between 0 and 1)
+
+    Output:
+        quantiles of each time bin, shape (number of quantiles, number of time bins)
+    """
+    q = numpy.atleast_1d(q)
+    edges = acc['edges']
+
+        # number of values below each edge (the values outside the edges are put on the first or last edge)
+    cumulative = numpy.cumsum(acc['hist'][:, :-1], axis = 1)
+    cumulative[:, -1] += acc['hist'][:, -1]
+
+    quantiles = numpy.zeros((len(q), len(cumulative)))
+
+    for j in range (len(cumulative)):
+
+        quantiles[:, j] = numpy.interp(q * acc['n'][j], cumulative[j], edges)
+
+    return quantiles
+
+def accumulator_write(path, name, acc):
+    """
+    Write one accumulator in a store (see Functions_store.py), with the unit of the quantity (see statistics_quantities)
+    The mean and the edges have the unit of the quantity, the sum of the squared deviations its square and logsum is the sum of log10 of the values in this unit.
+
+    Inputs:
+        path    :   directory of the store
+        name    :   name of the quantity (e.g. 'Lum_HESS')
+        acc     :   accumulator
+    """
+    unit = statistics_quantities[name]['unit'] if name in statistics_quantities else ''
+
+        # square of the unit (e.g. 'erg^2 s^-2')
+    parts = [part.split('^') for part in unit.split()]
+    unit2 = ' '.join(['%s^%d' %(part[0], 2 * (int(part[1]) if len(part) > 1 else 1)) for part in (parts)])
+
+    for key, unit_key in (('n', ''), ('mean', unit), ('m2', unit2), ('npos', ''), ('logsum', '')):
+
+        store_write(path, name + '_' + key, acc[key], ['time'], unit_key)
+
+    store_write(path, name + '_edges', acc['edges'], ['bin'], unit)
+    store_write(path, name + '_hist', acc['hist'], ['time', 'bin'])
+
+    return
+
+def accumulator_read(path, name):
+    """
+    Return one accumulator from a store (see Functions_store.py)
+
+    Inputs:
+        path    :   directory of the store
+        name    :   name of the quantity (e.g. 'Lum_HESS')
+
+    Output:
+        acc     :   accumulator
+    """
+
+    return {key: store_read(path, name + '_' + key) for key in ('n', 'mean', 'm2', 'npos', 'logsum', 'edges', 'hist')}
@@ -0,0 +1,353 @@
+"""
+Here are all functions needed to write and read the results as a store of named arrays
+
+A store is a directory with one memory-mapped file (.npy) per named array and an index (index.json) giving for each array its shape, its type, the name of its axes and its unit.
+Any array can then be read alone, and only for some iterations or some times, without loading the other arrays.
+
+An array can be written with a reduced precision (see store_encode): 'float32' or 'log16' (log10 of the values minus an offset in float16, for the luminosities
+which span many decades). The precision and the offset are recorded in the index and store_read always returns the decoded values (float64).
+
+The arrays are plain floats in the units of the computation (see Parameters_system.py) and their unit is only a string of the index:
+astropy is only imported by store_quantity and store_export, which attach the unit when a result is exported.
+"""
+
+##----------##
+# Librairies #
+##----------##
+import json
+import os
+import numpy
+from numpy.lib.format import open_memmap
+
+##---------##
+# Functions #
+##---------##
+
+    # precisions of the stored arrays: type in the file and if the log10 of the values is stored
+store_precisions = {'float64': (numpy.float64, False), 'float32': (numpy.float32, False), 'log16': (numpy.float16, True)}
+
+    # precision used for the arrays which can be negative (e.g. spectral indices) when the luminosities are stored with a given precision
+store_signed = {'float64': 'float64', 'float32': 'float32', 'log16': 'float32'}
+
+    # offset of the logarithmic precision for the arrays of a unit: decade of its physical scale (luminosities of a SB about 10^34 erg s^-1)
+store_scales = {'erg s^-1': 34.0, 'eV^-1 s^-1': 22.0}
+
+def store_offset(array, unit = None):
+    """
+    Return the offset of the logarithmic precision for an array: the decade of the physical scale of its unit (see store_scales),
+    otherwise the mean decade of its positive values
+    The float16 are more accurate close to 0: the relative error is below 0.5 % while |log10(array) - offset| < 8 and below 1 % while it is < 16.
+
+    Inputs:
+        array       :   array to write
+        unit        :   unit of the array (default = None: no physical scale)
+
+    Output:
+        offset      :   offset (integer number of decades)
+    """
+    if unit in store_scales:
+        return store_scales[unit]
+
+    array = numpy.asarray(array, dtype = float)
+    positive = array[array > 0]
+
+    if len(positive) == 0:
+        return 0.0
+
+    return float(numpy.round(numpy.mean(numpy.log10(positive))))
+
+def store_encode(array, precision = 'float64', offset = 0.0):
+    """
+    Return the values written in the store for an array and a precision
+
+    Inputs:
+        array       :   array to write (non-negative for 'log16')
+        precision   :   'float64', 'float32' or 'log16' (log10 of the values minus offset in float16, 0 gives -inf) (default = 'float64')
+        offset      :   offset of 'log16' (see store_offset) (default = 0)
+
+    Output:
+        encoded     :   array of the type of the precision
+    """
+    if precision not in store_precisions:
+        raise ValueError('unknown precision %s (%s)' %(precision, ', '.join(sorted(store_precisions))))
+
+    dtype, logarithm = store_precisions[precision]
+    array = numpy.asarray(array, dtype = float)
+
+    if not logarithm:
+        return array.astype(dtype)
+
+    if numpy.any(array < 0):
+        raise ValueError('the precision %s needs non-negative values' %precision)
+
+    with numpy.errstate(divide = 'ignore'):
+
+        return (numpy.log10(array) - offset).astype(dtype)
+
+def store_decode(array, precision = 'float64', offset = 0.0):
+    """
+    Return the values of an array read in the store (see store_encode)
+
+    Inputs:
+        array       :   array read in the store
+        precision   :   precision of the array (default = 'float64')
+        offset      :   offset of 'log16' (default = 0)
+
+    Output:
+        decoded     :   values of the array (float64)
+    """
+    if store_precisions[precision][1]:
+        return 10**(numpy.asarray(array, dtype = float) + offset)
+
+    return numpy.asarray(array, dtype = float)
+
+def store_file(path, name):
+    """
+    Return the name of the file of one array of the store
+
+    Inputs:
+        path    :   directory of the store
+        name    :   name of the array
+
+    Output:
+        name of the file
+    """
+
+    return os.path.join(path, name + '.npy')
+
+def store_index(path):
+    """
+    Return the index of the store
+
+    Input:
+        path    :   directory of the store
+
+    Output:
+        index   :   dictionary with, for each array, its shape 'shape', its type 'dtype', the name of its axes 'axes', its unit 'unit', if it is ragged 'ragged'
+                    its precision 'precision' (None for the arrays written as they are) and the offset of the logarithmic precision 'offset'
+    """
+    name = os.path.join(path, 'index.json')
+
+    if not os.path.isfile(name):
+        return {}
+
+    with open(name, 'r') as index_load:
+
+        return json.load(index_load)
+
+def store_names(path):
+    """
+    Return the names of the arrays of the store
+
+    Input:
+        path    :   directory of the store
+
+    Output:
+        sorted list of the names
+    """
+
+    return sorted(store_index(path))
+
+def store_describe(path, name, array, axes, unit, ragged, precision = None, offset = 0.0):
+    """
+    Record one array in the index of the store (the index is written under a temporary name and then renamed)
+
+    Inputs:
+        path        :   directory of the store
+        name        :   name of the array
+        array       :   array (or memory-mapped array) recorded
+        axes        :   name of each axis of the array (e.g. ['iteration', 'time'])
+        unit        :   unit of the array
+        ragged      :   if the rows of the array are padded with nan
+        precision   :   precision of the array (see store_encode), None if it is written as it is (default = None)
+        offset      :   offset of the logarithmic precision (default = 0)
+    """
+    if len(axes) != array.ndim:
+        raise ValueError('%s: %d axes given for an array with %d dimensions' %(name, len(axes), array.ndim))
+
+    index = store_index(path)
+    index[name] = {'shape': list(array.shape), 'dtype': array.dtype.str, 'axes': list(axes), 'unit': unit, 'ragged': ragged, 'precision': precision, 'offset': offset}
+
+    index_name = os.path.join(path, 'index.json')
+
+    with open(index_name + '.tmp', 'w') as index_write:
+
+        json.dump(index, index_write, indent = 1, sort_keys = True)
+
+    os.replace(index_name + '.tmp', index_name)
+
+    return
+
+def store_write(path, name, array, axes, unit = '', ragged = False, precision = None):
+    """
+    Write one array in the store (the file is written under a temporary name and then renamed)
+
+    Inputs:
+        path        :   directory of the store (created if needed)
+        name        :   name of the array
+        array       :   array to write
+                        if ragged, list of 1D arrays of different lengths (padded with nan in the store)
+        axes        :   name of each axis of the array (e.g. ['iteration', 'time'])
+        unit        :   unit of the array (default = '')
+        ragged      :   if the rows of the array have different lengths (default = False)
+        precision   :   precision of the array (see store_encode, the offset of 'log16' is given by store_offset of the unit), None to write it as it is (default = None)
+    """
+    if not os.path.isdir(path):
+        os.makedirs(path)
+
+    offset = 0.0
+
+    if ragged:
+
+        rows = [numpy.asarray(row, dtype = float) for row in (array)]
+        length = max([len(row) for row in (rows)] + [0])
+        array = numpy.full((len(rows), length), numpy.nan)
+
+        for i in range (len(rows)):
+
+            array[i, :len(rows[i])] = rows[i]
+
+    elif precision is not None:
+        offset = store_offset(array, unit) if store_precisions[precision][1] else 0.0
+        array = store_encode(array, precision, offset)
+
+    else:
+        array = numpy.asarray(array)
+
+    name_file = store_file(path, name)
+    numpy.save(name_file + '.tmp.npy', array)
+    os.replace(name_file + '.tmp.npy', name_file)
+
+    store_describe(path, name, array, axes, unit, ragged, precision, offset)
+
+    return
+
+def store_create(path, name, shape, axes, unit = '', dtype = float, precision = None, offset = 0.0):
+    """
+    Return a new memory-mapped array of the store, to be filled in place (e.g. one iteration after the other)
+    With a precision, the values must be encoded before they are written (e.g. array[i] = store_encode(values, precision, offset)).
+
+    Inputs:
+        path        :   directory of the store (created if needed)
+        name        :   name of the array
+        shape       :   shape of the array
+        axes        :   name of each axis of the array (e.g. ['iteration', 'time', 'energy'])
+        unit        :   unit of the array (default = '')
+        dtype       :   type of the array, not used with a precision (default = float)
+        precision   :   precision of the array (see store_encode) (default = None)
+        offset      :   offset of the logarithmic precision (e.g. store_offset of the unit) (default = 0)
+
+    Output:
+        array       :   memory-mapped array (filled with zeros)
+    """
+    if not os.path.isdir(path):
+        os.makedirs(path)
+
+    if precision is not None:
+        dtype = store_precisions[precision][0]
+
+    array = open_memmap(store_file(path, name), mode = 'w+', dtype = dtype, shape = tuple(shape))
+
+    store_describe(path, name, array, axes, unit, False, precision, offset)
+
+    return array
+
+def store_read(path, name, iterations = None, times = None):
+    """
+    Return one array of the store
+    Only the selected iterations and times are read from the memory-mapped file.
+
+    Inputs:
+        path        :   directory of the store
+        name        :   name of the array
+        iterations  :   index, slice or list of the iterations (default = None: all iterations)
+        times       :   index, slice or list of the times (default = None: all times)
+
+    Output:
+        array       :   selected part of the array (decoded if it was written with a precision, see store_decode)
+                        if the array is ragged, list of 1D arrays (or one 1D array for one iteration)
+    """
+    index = store_index(path)
+
+    if name not in index:
+        raise KeyError('%s is not in the store %s (arrays: %s)' %(name, path, ', '.join(sorted(index))))
+
+    axes = index[name]['axes']
+    array = numpy.load(store_file(path, name), mmap_mode = 'r')
+
+        # the time axis is always after the iteration axis, so it is selected first
+    for selection, axis in ((times, 'time'), (iterations, 'iteration')):
+
+        if selection is None:
+            continue
+
+        if axis not in axes:
+            raise ValueError('%s has no %s axis (axes: %s)' %(name, axis, ', '.join(axes)))
+
+        array = array[(slice(None),) * axes.index(axis) + (selection,)]
+
+    array = numpy.array(array)
+
+    if index[name].get('precision') is not None:
+        array = store_decode(array, index[name]['precision'], index[name].get('offset', 0.0))
+
+    if index[name]['ragged']:
+
+        if array.ndim == 1:
+            return array[~numpy.isnan(array)]
+
+        return [row[~numpy.isnan(row)] for row in (array)]
+
+    return array
+
+def store_quantity(path, name, iterations = None, times = None):
+    """
+    Return one array of the store as an astropy Quantity, with the unit of the index
+
+    Inputs:
+        path        :   directory of the store
+        name        :   name of the array
+        iterations  :   index, slice or list of the iterations (default = None: all iterations)
+        times       :   index, slice or list of the times (default = None: all times)
+
+    Output:
+        quantity    :   selected part of the array (see store_read) with its unit (dimensionless if the unit is '')
+                        if the array is ragged, list of Quantities
+    """
+    import astropy.units as units
+
+    unit = units.Unit(store_index(path)[name]['unit'])
+    array = store_read(path, name, iterations, times)
+
+    if isinstance(array, list):
+        return [row * unit for row in (array)]
+
+    return array * unit
+
+def store_export(path, names, file_name, t = None, iterations = None, times = None):
+    """
+    Write arrays of the store in a table with their units (ECSV file, read back with astropy.table.QTable.read)
+
+    Inputs:
+        path        :   directory of the store
+        names       :   names of the arrays (same length of the first axis)
+        file_name   :   name of the ECSV file
+        t           :   time array written as the first column (yr) (default = None: no time column)
+        iterations  :   index, slice or list of the iterations (default = None: all iterations)
+        times       :   index, slice or list of the times (default = None: all times)
+    """
+    from astropy.table import QTable
+    import astropy.units as units
+
+    table = QTable()
+
+    if t is not None:
+        table['t'] = numpy.asarray(t, dtype = float)[times if times is not None else slice(None)] * units.yr
+
+    for name in (names):
+
+        table[name] = store_quantity(path, name, iterations, times)
+
+    table.write(file_name, format = 'ascii.ecsv', overwrite = True)
+
+    return
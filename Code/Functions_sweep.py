@@ -0,0 +1,290 @@
+"""
+Here are all functions needed to run a parametric study (sweep over a grid of parameters) and to write its results in one catalogue
+
+A catalogue is a directory with one store (see Functions_store.py) per point of the grid and an index (catalogue.json) giving for each point its parameters.
+The work which does not depend on the point is done only once: the energy grids and the pion-decay kernel are computed before the workers are forked,
+the SN explosion times only depend on the seed and the correction factor of the Weaver model is computed once per (n0, Nob).
+"""
+
+##----------##
+# Librairies #
+##----------##
+import itertools
+import json
+import multiprocessing
+import os
+import numpy
+import Parameters_system
+from Functions_iterations import *
+from Functions_bands import *
+from Functions_store import *
+from Functions_statistics import *
+from Functions_profile import *
+from Functions_reduction import *
+
+##-----------------------------------------##
+# Physical constants and Conversion factors #
+##-----------------------------------------##
+from Physical_constants import *
+from Conversion_factors import *
+from Parameters_system import *
+
+##---------##
+# Functions #
+##---------##
+
+    # parameters which can be changed by a sweep
+sweep_parameters = ('D0', 'delta', 'alpha', 'n0', 'Nob', 'percentage')
+
+    # correction factors of the radius of the SB already computed for one (n0, Nob, t_end_6, Rsb)
+correction_cache = {}
+
+def sweep_grid(grid):
+    """
+    Return the points of a grid of parameters
+    The points with the same n0 and Nob (same Weaver model) follow each other.
+
+    Input:
+        grid    :   dictionary with, for each parameter of sweep_parameters, the list of its values (e.g. {'D0': [1e25, 1e26], 'n0': [1, 10]})
+
+    Output:
+        points  :   list of dictionaries (one per point) with the value of each parameter of the grid
+    """
+    unknown = [name for name in (grid) if name not in sweep_parameters]
+
+    if len(unknown) > 0:
+        raise ValueError('%s cannot be swept (parameters: %s)' %(', '.join(unknown), ', '.join(sweep_parameters)))
+
+    names = sorted(grid, key = lambda name: ('n0', 'Nob').index(name) if name in ('n0', 'Nob') else 2)
+
+        # Nob is a number of stars, the other parameters are real numbers
+    values = [[int(value) if name == 'Nob' else float(value) for value in (grid[name])] for name in (names)]
+
+    return [dict(zip(names, point)) for point in itertools.product(*values)]
+
+def sweep_set(point):
+    """
+    Set the parameters of one point in Parameters_system and recompute the parameters depending on them (Pob, L36, L38 and pISM)
+    The functions of the model read the swept parameters from Parameters_system when they are called (not the copies made by from Parameters_system import *).
+
+    Input:
+        point   :   dictionary with the value of each swept parameter
+    """
+    for name in (point):
+
+        setattr(Parameters_system, name, point[name])
+
+    Parameters_system.Pob = Parameters_system.Nob * Lob                         # erg s^-1
+    Parameters_system.L36 = Parameters_system.Pob * erg236erg                   # 10^36 erg s^-1
+    Parameters_system.L38 = Parameters_system.L36 * t36erg238erg                # 10^38 erg s^-1
+    Parameters_system.pISM = Parameters_system.n0 * kb * TISM                   # dyne cm^-2
+
+    return
+
+def sweep_correction(t_end_6, Rsb):
+    """
+    Return the correction factor for the radius of the SB of the current parameters (taken from the cache when the Weaver model is the same)
+
+    Inputs:
+        t_end_6     :   age of the SB (Myr), None if no correction is needed
+        Rsb         :   observed radius of the SB (pc)
+
+    Output:
+        correction_factor
+    """
+    if t_end_6 is None:
+        return 1
+
+    key = (Parameters_system.n0, Parameters_system.Nob, t_end_6, Rsb)
+
+    if key not in correction_cache:
+        correction_cache[key] = Rsb/radius_velocity_SB(t_end_6)[0]
+
+    return correction_cache[key]
+
+def sweep_point(arguments):
+    """
+    Compute the iterations of one point of the sweep and write them in the store of the point (one argument to be used with a pool of workers)
+    With profiling, the report of the stages of data (see Functions_profile.py) is written in the store of the point (Profile.txt).
+    The SN explosion times of the iteration i are drawn from the same random stream for all the points with the same Nob.
+
+    Input:
+        arguments   :   tuple (path of the store of the point, point, nit, seed, zones, t_end_6, Rsb) (see run_sweep)
+
+    Output:
+        path        :   path of the store of the point
+    """
+    path, point, nit, seed, zones, t_end_6, Rsb = arguments
+
+    sweep_set(point)
+    correction_factor = sweep_correction(t_end_6, Rsb)
+    profile_reset()
+    integral_reset()
+
+    seeds = iteration_seeds(seed, nit)
+    tsn_it = [sn_explosion_times(seeds[i]) for i in range (nit)]
+
+    store_write(path, 'tsn', tsn_it, ['iteration', 'sn'], 'yr', ragged = True)
+    store_write(path, 'nsn', [len(tsn) for tsn in (tsn_it)], ['iteration'])
+
+        # each iteration is reduced as soon as it is computed (see Functions_reduction.py)
+    reduction = reduction_start(path, os.path.join(path, 'Statistics'), t_fix, nit, precision = storage_precision, zones = zones)
+
+    for i, outputs in run_iterations(correction_factor, tsn_it, t_fix, zones):
+
+        reduction_update(reduction, i, outputs)
+
+    reduction_finish(reduction)
+
+        # wall time and number of calls of each stage of data for this point
+    if profiling:
+        profile_report(os.path.join(path, 'Profile.txt'))
+
+        # integrals taken from the cache (shared by the points computed by the same process) and computed for this point
+    integral_report()
+
+    return path
+
+def catalogue_index(path):
+    """
+    Return the index of a catalogue
+
+    Input:
+        path    :   directory of the catalogue
+
+    Output:
+        index   :   dictionary with, for each point (name of its store), its parameters 'parameters' and the settings of its run 'nit', 'seed', 'zones'
+    """
+    name = os.path.join(path, 'catalogue.json')
+
+    if not os.path.isfile(name):
+        return {}
+
+    with open(name, 'r') as catalogue_load:
+
+        return json.load(catalogue_load)
+
+def catalogue_record(path, point_name, entry):
+    """
+    Record one completed point in the index of a catalogue (the index is written under a temporary name and then renamed)
+
+    Inputs:
+        path        :   directory of the catalogue
+        point_name  :   name of the store of the point
+        entry       :   parameters and settings of the point (see catalogue_index)
+    """
+    index = catalogue_index(path)
+    index[point_name] = entry
+
+    name = os.path.join(path, 'catalogue.json')
+
+    with open(name + '.tmp', 'w') as catalogue_dump:
+
+        json.dump(index, catalogue_dump, indent = 1, sort_keys = True)
+
+    os.replace(name + '.tmp', name)
+
+    return
+
+def catalogue_find(path, **parameters):
+    """
+    Return the stores of the points of a catalogue with the given parameters
+
+    Inputs:
+        path        :   directory of the catalogue
+        parameters  :   values of some parameters (e.g. D0 = 1e25, n0 = 10)
+
+    Output:
+        stores      :   sorted list of the paths of the stores of the points (to be used with store_read)
+    """
+    index = catalogue_index(path)
+    stores = []
+
+    for point_name in (index):
+
+        point = index[point_name]['parameters']
+
+        if all([name in point and numpy.isclose(point[name], parameters[name]) for name in (parameters)]):
+            stores.append(os.path.join(path, point_name))
+
+    return sorted(stores)
+
+def run_sweep(path, grid, nit, zones, nworkers = 1, seed = 0, t_end_6 = None, Rsb = None):
+    """
+    Compute all the points of a grid of parameters and write them in a catalogue
+    The points are shared between nworkers processes (forked after the pion-decay kernel is computed) and the points already in the catalogue
+    (same parameters, nit, seed and zones) are not computed again.
+
+    Inputs:
+        path        :   directory of the catalogue (created if needed)
+        grid        :   dictionary with the list of the values of each swept parameter (see sweep_grid)
+        nit         :   number of iterations of each point
+        zones       :   which zone do you want to compute (1: cavity of the SB, 2: supershell and 3: outside)
+        nworkers    :   number of worker processes (default = 1: no parallelisation)
+        seed        :   seed of the SN explosion times (default = 0)
+        t_end_6     :   age of the SB (Myr) to correct the radius of the SB, None for no correction (default = None)
+        Rsb         :   observed radius of the SB (pc) to correct the radius of the SB (default = None)
+
+    Output:
+        index       :   index of the catalogue (see catalogue_index)
+    """
+    if not os.path.isdir(path):
+        os.makedirs(path)
+
+    index = catalogue_index(path)
+    default = {name: getattr(Parameters_system, name) for name in (sweep_parameters)}
+
+    arguments = []
+    entries = {}
+
+    for point in (sweep_grid(grid)):
+
+        parameters = dict(default, **point)
+        entry = {'parameters': parameters, 'nit': nit, 'seed': seed, 'zones': list(zones)}
+
+        done = [point_name for point_name in (index) if index[point_name] == json.loads(json.dumps(entry))]
+
+        if len(done) > 0:
+            continue
+
+        point_name = 'point_%04d' %(len(index) + len(arguments))
+        entries[point_name] = entry
+        arguments.append((os.path.join(path, point_name), parameters, nit, seed, zones, t_end_6, Rsb))
+
+    print('%d points to compute (%d already in the catalogue)' %(len(arguments), len(index)))
+
+        # the pion-decay kernel (and the table of the cavity) are computed before the fork so that all workers share them
+    pion_decay_kernel(ECR, spectrum)
+
+    if 1 in zones:
+        cavity_table()
+
+    if nworkers <= 1:
+
+        completed = map(sweep_point, arguments)
+
+    else:
+
+        context = multiprocessing.get_context('fork')
+        pool = context.Pool(nworkers)
+        completed = pool.imap_unordered(sweep_point, arguments)
+
+    try:
+
+        for point_path in (completed):
+
+            point_name = os.path.basename(point_path)
+            catalogue_record(path, point_name, entries[point_name])
+
+            print('end of the point %s: %s' %(point_name, entries[point_name]['parameters']))
+
+    finally:
+
+            # the parameters of the system are set back for the main process
+        sweep_set(default)
+
+        if nworkers > 1:
+            pool.close()
+            pool.join()
+
+    return catalogue_index(path)
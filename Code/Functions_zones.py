@@ -0,0 +1,116 @@
+"""
+Here are all functions needed to compute the particles content and the gamma emission of the zones (1: cavity of the SB, 2: supershell and 3: outside) in one pass
+
+The zones share the time grid, the diffusion coefficient and the boundaries of the SB (Rsb - hs and Rsb): the fractions of particles at these radii
+(see Functions_CR.diffusion_fractions) are computed once for the supershell and the outside, the cavity is integrated analytically (see Functions_cavity.py)
+and the pion-decay emission of all zones is one product with the kernel (see Functions_kernel.pion_decay_flux).
+Any subset of the zones can be requested: only the boundaries needed by these zones are evaluated.
+"""
+
+##----------##
+# Librairies #
+##----------##
+import numpy
+from Functions_CR import *
+from Functions_kernel import *
+from Functions_cavity import *
+from Functions_profile import *
+
+##-----------------------------------------##
+# Physical constants and Conversion factors #
+##-----------------------------------------##
+from Physical_constants import *
+from Conversion_factors import *
+from Parameters_system import *
+
+##---------##
+# Functions #
+##---------##
+
+    # name of each zone
+zone_names = {1: 'cavity', 2: 'supershell', 3: 'outside'}
+
+def zone_particles(zones, NE, D, deltat, state, t7):
+    """
+    Return the particles distribution and the density of the gas of each zone, for all times and energies in one call
+
+    Inputs:
+        zones       :   which zone do you want to compute (1: cavity of the SB, 2: supershell and 3: outside)
+        NE          :   initial particles distribution (GeV^-1)
+        D           :   diffusion coefficient (cm^2 s^-1)
+        deltat      :   time after the SN explosion (yr), shape (number of times)
+        state       :   parameters of the SB at each time (see Functions_SB.superbubble_state), with 'Rsb' (pc), 'hs' (pc), 'ns' (cm^-3) and 'n0' (cm^-3)
+        t7          :   age of the SB (10 Myr), shape (number of times)
+
+    Outputs:
+        N           :   particles distribution of each zone (GeV^-1), shape (number of zones, number of times, number of energies)
+                        (the one of the cavity is already weighted by the density of the gas, see Functions_cavity.cavity_particles)
+        nh          :   density of the gas of each zone (cm^-3), shape (number of zones, number of times) (1 for the cavity)
+    """
+    deltat = numpy.atleast_1d(numpy.asarray(deltat, dtype = float))
+    Rsb = state['Rsb']
+    hs = state['hs']
+
+    N = numpy.zeros((len(zones), len(deltat), len(NE)))
+    nh = numpy.ones((len(zones), len(deltat)))
+
+        # Fractions of particles inside and outside the boundaries of the SB, computed once for the supershell and the outside
+    if 2 in zones:
+        r = numpy.column_stack((Rsb - hs, Rsb))     # inner and outer radii of the supershell (pc)
+
+    else:
+        r = Rsb[:, numpy.newaxis]                   # outer radius of the SB (pc)
+
+    if (2 in zones) or (3 in zones):
+
+        start = profile_clock()
+        x, F, G = diffusion_fractions(r, D, deltat)
+        profile_add('particles', 0, start)
+
+        # Particles distribution of each zone
+    for k, zone in enumerate(zones):
+
+        start = profile_clock()
+
+        if zone == 1:       # in the SB
+
+            N[k] = cavity_particles(NE, D, deltat, Rsb, hs, t7)
+
+        elif zone == 2:     # in the supershell
+
+                # difference of the enclosed fractions close to the center and of the escaped fractions far from it (see Functions_CR.shell_particles_cube)
+            N[k] = NE * numpy.where(x[:, 0] < 1, F[:, 1] - F[:, 0], G[:, 0] - G[:, 1])
+            nh[k] = state['ns']
+
+        else:               # outside the SB
+
+            N[k] = NE * G[:, -1]
+            nh[k] = state['n0']
+
+        profile_add('particles', zone, start)
+
+    return N, nh
+
+def zone_emission(zones, NE, D, deltat, state, t7, kernel):
+    """
+    Return the intrinsic differential luminosity of the pion-decay of each zone, for all times and energies in one call
+
+    Inputs:
+        zones       :   which zone do you want to compute (1: cavity of the SB, 2: supershell and 3: outside)
+        NE          :   initial particles distribution (GeV^-1)
+        D           :   diffusion coefficient (cm^2 s^-1)
+        deltat      :   time after the SN explosion (yr), shape (number of times)
+        state       :   parameters of the SB at each time (see Functions_SB.superbubble_state)
+        t7          :   age of the SB (10 Myr), shape (number of times)
+        kernel      :   pion-decay kernel (see Functions_kernel.pion_decay_kernel)
+
+    Output:
+        Flux        :   intrinsic differential luminosity (eV^-1 s^-1), shape (number of zones, number of times, number of gamma energies)
+    """
+    N, nh = zone_particles(zones, NE, D, deltat, state, t7)
+
+    start = profile_clock()
+    Flux = pion_decay_flux(N, nh, kernel)
+    profile_add('pion_decay', 0, start)
+
+    return Flux
@@ -7,18 +7,20 @@ All the parameters must be given in the Parameters_system
 ##------------------------##
 # Librairies and functions #
 ##------------------------##
-import matplotlib.pyplot as plt
 import numpy
 import scipy.integrate as integrate
-import astropy.units as units
 import os
 import pickle
-import naima
-from naima.models import PionDecay, TableModel
 from Functions import *
 from Functions_CR import *
 from Functions_SB import *
 from Functions_gamma import *
+from Functions_iterations import *
+from Functions_bands import *
+from Functions_store import *
+from Functions_statistics import *
+from Functions_profile import *
+from Functions_reduction import *
 
 # Physical constants and conversion factors
 from Physical_constants import *
@@ -42,6 +44,18 @@ nit = 100                                                                      #
     # Which zone for the Computation
 zones = [2]                                                                     #you need to change it for your simulations
 
+    # Parallelisation
+nworkers = 1        # number of worker processes for the iterations            #you need to change it for your simulations
+seed = 0            # seed of the run (each iteration has its own random stream derived from it)
+
+    # Checkpoints
+checkpoint = 'Checkpoint'   # directory where each completed iteration is written
+resume = True               # only compute the iterations missing in the checkpoint directory (of the same run), False to start again from the first iteration
+
+    # Streaming reduction of the iterations (see Functions_reduction.py)
+flux_iterations = None      # iterations whose full intrinsic differential luminosity is kept (None: all iterations, []: none)   #you need to change it for your simulations
+flux_time_step = None       # number of time bins averaged in the down-sampled intrinsic differential luminosity of all iterations (None: not computed)
+
     # Correction factor
 
 need_correction = True
@@ -59,21 +73,10 @@ else:
     # Initialization
 figure_number = 1
 
-        # For the gamma-ray emission of the superbubble
-Lum_it = []                 # total gamma luminosity for the whole energy range
-Flux_it = []                # photon flux for the whole energy range
-Lum_pwn_it = []             # TeV emission of PWNe
-Lum_psr_it = []             # GeV emission of PSRs
-nob_it = []                 # total of remained OB stars
+        # For the SN explosions of the superbubble
 tsn_it = []                 # SN explosion times (yr)
 nsn_it = []                 # number of supernova per iterations
 
-        # For the parameters of the SB
-Rsb = numpy.zeros(number_bin_t)     # size of the superbubble (pc)
-Vsb = numpy.zeros(number_bin_t)     # velocity of the shock (km/s)
-Ms = numpy.zeros(number_bin_t)      # mass of the supershell (solar mass)
-ns = numpy.zeros(number_bin_t)      # density of the supershell (cm^-3)
-
     ##----------##
     # Iterations #
     ##----------##
@@ -81,131 +84,66 @@ print('For %d SN'%Nob)
 print('For %d iterations' %nit)
 
         # SN explosions time (yr)
+seeds = iteration_seeds(seed, nit)
+
+for i in range (nit):
+
+    tsn = sn_explosion_times(seeds[i])                      # random SN explosion times with an uniform distribution from t0min to t0max
+    nsn = len(tsn)
+
+    tsn_it.append(tsn)
+    nsn_it.append(nsn)
+
+        # Completed iterations of the same run (the checkpoint directory of another run is refused, see Functions_iterations.checkpoint_start)
+done = checkpoint_start(checkpoint, checkpoint_run(seed, nit, zones, correction_factor), resume)
+missing = [i for i in range (nit) if i not in done]
+
+print('%d iterations already completed' %len(done))
+
+        # Results (store of named arrays with the precision storage_precision, see Functions_store.py)
+        # each iteration is reduced as soon as it is computed or read (see Functions_reduction.py): the memory used does not depend on nit
+reduction = reduction_start('General', 'Statistics', t_fix, nit, flux_iterations, flux_time_step, storage_precision, zones)
+
+for i in (done):
+
+    tsn_it[i], outputs = checkpoint_read(checkpoint, i)
+    nsn_it[i] = len(tsn_it[i])
+    reduction_update(reduction, i, outputs)
+
+store_write('SB', 'tsn', tsn_it, ['iteration', 'sn'], 'yr', ragged = True)
+store_write('SB', 'nsn', numpy.asarray(nsn_it), ['iteration'])
+
+        # Computation (each completed iteration is written in the checkpoint directory)
+
+for k, outputs in run_iterations(correction_factor, [tsn_it[i] for i in missing], t_fix, zones, nworkers):
+
+    i = missing[k]
+    checkpoint_write(checkpoint, i, tsn_it[i], outputs)
+    reduction_update(reduction, i, outputs)
+
+    print('end of the iteration %d' %i)
+
+if adaptive_time:
+    time_steps_report()
+
+    # Integrals of the parameters of the system taken from the cache and computed (see Functions_integrals.py)
+integral_report()
+
+    # Wall time and number of calls of each stage of data (see Functions_profile.py)
+if profiling:
+    profile_report('Profile.txt')
+
+    # Statistics of the iterations for each time bin (mergeable with the ones of the other runs, see Functions_statistics.py)
+errors = reduction_finish(reduction)
+
+    # Validation of the storage precision: maximal relative error on the intrinsic differential luminosity and on the results of the bands
+if storage_precision != 'float64':
+
+    print('maximal relative error of the storage precision %s:' %storage_precision)
 
-with open('SB', 'wb') as SB_write:
+    for name in (sorted(errors)):
 
-    for i in range (nit):
-
-        nsn = Nob
-
-        tsn = numpy.random.uniform(tsnmin, tsnmax, nsn)/yr26yr  # random SN explosion times with an uniform distribution from t0min to t0max
-        tsn = sorted(tsn)                                       # sorted random tsn
-        tsn = numpy.asarray(tsn)
-        indsn = numpy.where(tsn <= tmax)[0]
-        tsn = tsn[indsn]
-        nsn = len(tsn)
-
-        tsn_it.append(tsn)
-        nsn_it.append(nsn)
-
-    tsn_it = numpy.asarray(tsn_it)
-    nsn_it = numpy.asarray(nsn_it)
-
-    pickle.dump(tsn_it, SB_write)
-    pickle.dump(nsn_it, SB_write)
-
-        # Computation
-
-with open('General', 'wb') as data_write:
-
-    for i in range (nit):
-
-        tsn = tsn_it[i]
-
-        Lum, Flux, Lum_pwn, Lum_psr, nob, R_sb, V_sb, M_s, n_s = data(correction_factor, tsn, t_fix, zones)
-        ind = numpy.where(R_sb > 0.0)[0]
-
-        for j in (ind):
-
-            Rsb[j] = R_sb[j]
-            Vsb[j] = V_sb[j]
-            Ms[j] = M_s[j]
-            ns[j] = n_s[j]
-
-        Lum_it.append(Lum)
-        Flux_it.append(Flux)
-        Lum_pwn_it.append(Lum_pwn)
-        Lum_psr_it.append(Lum_psr)
-        nob_it.append(nob)
-
-        print('end of the iteration %d' %i)
-
-    Lum_it = numpy.asarray(Lum_it)
-    Flux_it = numpy.asarray(Flux_it)
-
-        # In each energy range
-
-            # VHE range
-    Emin = 1 * TeV2GeV                  # 1 TeV (GeV)
-    Emax = 10 * TeV2GeV                 # 10 TeV (GeV)
-    indE = numpy.where((spectrum >= Emin) & (spectrum <= Emax))[0]
-
-                # Gamma-ray luminosity
-    spectrum_HESS = spectrum[indE]
-    spectrum_erg = spectrum_HESS * 1.0/erg2GeV     # only in the energy range (erg)
-    spectrum_ev = spectrum_erg * 1.0/eV2erg         # eV
-    lum_HESS = Flux_it[:, :, indE] * spectrum_erg   # erg s^-1 eV^-1
-    Lum_HESS_it = luminosity(lum_HESS, spectrum_ev) # erg s^-1
-
-                # Spectral photon index
-    Fluxmin = Flux_it[:, :, indE[0]]
-    Fluxmax = Flux_it[:, :, indE[-1]]
-    Emin = spectrum[indE[0]]
-    Emax = spectrum[indE[-1]]
-    Gamma_HESS_it = spectral_index(Emin, Emax, Fluxmin, Fluxmax)
-    Gamma_HESS_it = numpy.nan_to_num(Gamma_HESS_it)
-
-            # HE range
-    Emin = 100 * MeV2GeV                # 100 MeV (GeV)
-    Emax = 100                          # 100 GeV
-    indE = numpy.where((spectrum >= Emin) & (spectrum <= Emax))[0]
-
-                # Gamma-ray luminosity
-    spectrum_Fermi = spectrum[indE]
-    spectrum_erg = spectrum_Fermi * 1.0/erg2GeV     # only in the energy range (erg)
-    spectrum_ev = spectrum_erg * 1.0/eV2erg         # eV
-    lum_Fermi = Flux_it[:, :, indE] * spectrum_erg   # erg s^-1 eV^-1
-    Lum_Fermi_it = luminosity(lum_Fermi, spectrum_ev) # erg s^-1
-
-                # Spectral photon index (1 GeV to 10 GeV)
-    Emin = 1        # 1 GeV
-    Emax = 10       # 10 GeV
-    indE = numpy.where((spectrum >= Emin) & (spectrum <= Emax))[0]
-    Fluxmin = Flux_it[:, :, indE[0]]
-    Fluxmax = Flux_it[:, :, indE[-1]]
-    Emin = spectrum[indE[0]]
-    Emax = spectrum[indE[-1]]
-    Gamma_GeV_it = spectral_index(Emin, Emax, Fluxmin, Fluxmax)
-    Gamma_GeV_it = numpy.nan_to_num(Gamma_GeV_it)
-
-                # Spectral photon index (100 MeV to 1 GeV)
-    Emin = 100 * MeV2GeV    # 100 MeV
-    Emax = 1                # 1 GeV
-    indE = numpy.where((spectrum >= Emin) & (spectrum <= Emax))[0]
-    Fluxmin = Flux_it[:, :, indE[0]]
-    Fluxmax = Flux_it[:, :, indE[-1]]
-    Emin = spectrum[indE[0]]
-    Emax = spectrum[indE[-1]]
-    Gamma_MeV_it = spectral_index(Emin, Emax, Fluxmin, Fluxmax)
-    Gamma_MeV_it = numpy.nan_to_num(Gamma_MeV_it)
-
-    Lum_pwn_it = numpy.asarray(Lum_pwn_it)
-    Lum_psr_it = numpy.asarray(Lum_psr_it)
-    nob_it = numpy.asarray(nob_it)
-
-    pickle.dump(Lum_HESS_it, data_write)
-    pickle.dump(Lum_Fermi_it, data_write)
-    pickle.dump(Lum_it, data_write)
-    pickle.dump(Gamma_HESS_it, data_write)
-    pickle.dump(Gamma_GeV_it, data_write)
-    pickle.dump(Gamma_MeV_it, data_write)
-    pickle.dump(Lum_pwn_it, data_write)
-    pickle.dump(Lum_psr_it, data_write)
-    pickle.dump(nob_it, data_write)
-    pickle.dump(Rsb, data_write)
-    pickle.dump(Vsb, data_write)
-    pickle.dump(Ms, data_write)
-    pickle.dump(ns, data_write)
+        print('    %-12s %.2e' %(name, errors[name]))
 
 
     # CHECKING
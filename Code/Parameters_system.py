@@ -1,13 +1,24 @@
 """
 Here are all the free parameters for the system!
+
+All quantities of the computation are plain floats (numpy arrays) in these units, without astropy Quantities:
+    time                        yr (t, tsn, deltat), Myr (t6) or 10 Myr (t7)
+    lengths                     pc (Rsb, hs), except the diffusion length and D in cm (cm^2 s^-1)
+    densities                   cm^-3 (n0, ns, nh)
+    CR energies                 GeV (ECR) and particles distributions in GeV^-1
+    gamma energies              GeV (spectrum), also in eV (spectrum_ev) and erg (spectrum_erg) for the luminosities
+    differential luminosities   eV^-1 s^-1
+    luminosities                erg s^-1
+The units are only attached when the results are exported (see Functions_store.store_quantity and store_export).
 """
 
+import os
 import numpy
-import astropy.units as units
 
 # Physical constants and conversion factors
 from Physical_constants import *
 from Conversion_factors import *
+from Functions_quadrature import *
 
 ##=============================##
 # Superbubble and OB assocation #
@@ -20,6 +31,7 @@ Pob = Nob * Lob     # mean power of the association (erg/s)
 L36 = Pob * erg236erg     # mechanical energy expressed in 10^36 erg/s
 L38 = L36 * t36erg238erg  # mechanical energy expressed in 10^38 erg/s
 lifetime = 4e6 #30e6     # average lifetime of the lowest B star (yr)
+number_bin_sb = 100 # number of time steps per decade of the table of the evolution of the SB (see Functions_SB.superbubble_table)
 
     # Fit parameters of the model
 n0 = 10             # ambient density (cm^-3)
@@ -91,14 +103,17 @@ Esng = Esn * erg2GeV    # GeV
     # Energy (GeV)
 Emin_CR = 1            # minimum kinetic energy: Emin = 1GeV
 Emax_CR = 1*PeV2GeV    # minimum kinetic energy: Emax = 1PeV in GeV
+energy_quadrature = 'trapezoid'   # quadrature in log(E) of the CR and gamma energy grids: 'trapezoid' (logarithmic bins) or 'gauss' (Gauss-Lobatto-Legendre nodes)
 number_bin_E = 10
-ECR = numpy.logspace(numpy.log10(Emin_CR), numpy.log10(Emax_CR), number_bin_E)
-E_CR = ECR * units.GeV
+ECR = log_quadrature(Emin_CR, Emax_CR, number_bin_E, energy_quadrature)[0]     # GeV (the CR distribution is not integrated on this grid: no weights)
 
     # Power-law distribution of the cosmic rays (GeV^-1 cm^-3)
 p0 = 10             # normalization constant (GeV/c)
 alpha = 2.2         # exponent of the power-law distribution
 
+    # Local interstellar spectrum of the cosmic rays (Boschini et al. 2017), a binary cache (.npy) is written next to it
+lis_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'CosmicRayLocal.txt')
+
     # Diffusion coefficient of the cosmic rays (cm^2 s^-1)
 delta = 1.0/2       # exponent of the power-law of the diffusion coefficient
 D0 = 1e25           # diffusion coefficient at 10 GeV/c in cm^2 s^-1  ==> prendre *10 et /10
@@ -112,10 +127,10 @@ Emin_gamma = 100 * MeV2GeV      # 100 MeV (GeV)
 Emax_gamma = 100 * TeV2GeV      # 100 TeV (GeV)
 
 number_bin_E = 20
-spectrum = numpy.logspace(numpy.log10(Emin_gamma), numpy.log10(Emax_gamma), number_bin_E)   # GeV
+spectrum, spectrum_weights = log_quadrature(Emin_gamma, Emax_gamma, number_bin_E, energy_quadrature)  # GeV
 spectrum_erg = spectrum * 1.0/erg2GeV       # erg
 spectrum_ev = spectrum * GeV2eV             # eV
-spectrum_energy = spectrum * units.GeV      # with the units
+spectrum_weights_ev = spectrum_weights * GeV2eV     # integration weights of the gamma energies (eV) (see Functions_gamma.luminosity)
 
 ##=======================##
 # Supernovae & time array #
@@ -133,3 +148,19 @@ number_bin_t = 3000
 t_fix = numpy.linspace(tmin, tmax, number_bin_t)    # yrs
 t6 = t_fix * yr26yr                                 # Myrs
 t7 = t6 * s6yr27yr                                  # 10 Myrs
+
+    # Time steps of each SN (see Functions_gamma.data)
+number_bin_tsn = 200        # number of time steps of the fixed grid (maximal number of time steps of the adaptive grid)
+adaptive_time = False       # if the time steps are refined where the gamma emission changes quickly
+tolerance_time = 1e-2       # maximal error of the linear interpolation between two adaptive time steps (relative to the maximum of each quantity)
+number_bin_tsn0 = 17        # number of time steps of the first adaptive grid
+
+    # Profiling of the stages of Functions_gamma.data (see Functions_profile.py)
+profiling = False           # if the wall time and the number of calls of each stage are recorded (report written next to the outputs)
+
+##=======##
+# Storage #
+##=======##
+
+    # Precision of the intrinsic differential luminosity and of the luminosities written in the stores (see Functions_store.store_encode)
+storage_precision = 'float64'   # 'float64', 'float32' or 'log16' (log10 of the values in float16, 4 times smaller than float64)
@@ -9,18 +9,17 @@ Make sure that you have already run the code 'Iterations.py' to have the data se
 ##------------------------##
 # Librairies and functions #
 ##------------------------##
-import matplotlib.pyplot as plt
+from Functions_figures import *
 import numpy
 import scipy.integrate as integrate
-import astropy.units as units
 import os
 import pickle
-import naima
-from naima.models import PionDecay, TableModel
 from Functions import *
 from Functions_CR import *
 from Functions_SB import *
 from Functions_gamma import *
+from Functions_store import *
+from Functions_statistics import *
 
 # Physical constants and conversion factors
 from Physical_constants import *
@@ -36,6 +35,9 @@ pathfigure_gamma = '/Users/stage/Documents/Virginie/Superbubbles/figures/Paramet
 pathfigure_remain = '/Users/stage/Documents/Virginie/Superbubbles/figures/Parametric_studies/stars/100/'
 pathfigure = '/Users/stage/Documents/Virginie/Superbubbles/figures/Parametric_studies/stars/100/'
 
+    # Number of worker processes which render the figures
+nworkers = 1                                                                    #you need to change it for your machine
+
 ## ======================================= ##
 # Statistic for a high number of iterations #
 ## ======================================= ##
@@ -44,26 +46,33 @@ pathfigure = '/Users/stage/Documents/Virginie/Superbubbles/figures/Parametric_st
 nit = 100                                                                        #you need to change it for your simulations (depends on the number of iterations per files)
 
     # Number of Files
-nfiles = 1                                                                     #you need to change it for your simulations (depends on the number of files (paralelization you have done))
+nfiles = 1                                                                     #you need to change it for your simulations (1 when the iterations were parallelized by Iterations.py with nworkers, otherwise the number of files of the parallelization by hand)
 
     # Total number of iterations
 nit_tot = nit * nfiles                                                          #you need to change it for your simulations
 
     # Initialization
-figure_number = 1
+specs = []  # specs of the figures (see Functions_figures.py), rendered at the end
 k = 0       # for the concatenisation of the all iterations
 
-Lum_HESS_it = numpy.zeros((nit_tot, number_bin_t))          # gamma-ray luminosity in the H.E.S.S. energy range
-Lum_Fermi_it = numpy.zeros((nit_tot, number_bin_t))         # gamma-ray luminosity in the Fermi energy range
-Lum_it = numpy.zeros((nit_tot, number_bin_t))               # gamma-ray luminosity in the whole energy range
-Gamma_HESS_it = numpy.zeros((nit_tot, number_bin_t))        # spectral index in the H.E.S.S. energy range
-Gamma_GeV_it = numpy.zeros((nit_tot, number_bin_t))         # spectral index in the HE energy range (1 GeV - 10 GeV)
-Gamma_MeV_it = numpy.zeros((nit_tot, number_bin_t))         # spectral index in the HE energy range (100 MeV - 100 GeV)
-Lum_pwn_it = numpy.zeros((nit_tot, number_bin_t))           # TeV emission of PWNe
-Lum_psr_it = numpy.zeros((nit_tot, number_bin_t))           # GeV emission of PSRs
+        # the iterations of all files are recorded in the store Total (memory-mapped, not kept in memory) (you need to change it)
+pathtotal = '/Users/stage/Documents/Virginie/Superbubbles/Files/Parametric_studies/stars/100/'
+axes = ['iteration', 'time']
+
+Lum_HESS_it = store_create(pathtotal + 'Total', 'Lum_HESS', (nit_tot, number_bin_t), axes, 'erg s^-1')      # gamma-ray luminosity in the H.E.S.S. energy range
+Lum_Fermi_it = store_create(pathtotal + 'Total', 'Lum_Fermi', (nit_tot, number_bin_t), axes, 'erg s^-1')    # gamma-ray luminosity in the Fermi energy range
+Lum_it = store_create(pathtotal + 'Total', 'Lum', (nit_tot, number_bin_t), axes, 'erg s^-1')                # gamma-ray luminosity in the whole energy range
+Gamma_HESS_it = store_create(pathtotal + 'Total', 'Gamma_HESS', (nit_tot, number_bin_t), axes)              # spectral index in the H.E.S.S. energy range
+Gamma_GeV_it = store_create(pathtotal + 'Total', 'Gamma_GeV', (nit_tot, number_bin_t), axes)                # spectral index in the HE energy range (1 GeV - 10 GeV)
+Gamma_MeV_it = store_create(pathtotal + 'Total', 'Gamma_MeV', (nit_tot, number_bin_t), axes)                # spectral index in the HE energy range (100 MeV - 100 GeV)
+Lum_pwn_it = store_create(pathtotal + 'Total', 'Lum_pwn', (nit_tot, number_bin_t), axes, 'erg s^-1')        # TeV emission of PWNe
+Lum_psr_it = store_create(pathtotal + 'Total', 'Lum_psr', (nit_tot, number_bin_t), axes, 'erg s^-1')        # GeV emission of PSRs
 tsn_it = []                                                 # SN explosion times (yr)
 nsn_it = numpy.zeros((nit_tot, number_bin_t))               # number of supernova per iterations
 
+        # statistics of all iterations for each time bin (merged file after file)
+acc_it = {name: accumulator(number_bin_t, statistics_quantities[name]['edges']) for name in (statistics_quantities)}
+
     ## ------- ##
     # Load data #
     ## ------- ##
@@ -79,78 +88,45 @@ for i in range (nfiles):
     else:
         os.chdir('/Users/stage/Documents/Virginie/Superbubbles/Files/Parametric_studies/stars/100/')
 
-    with open('SB', 'rb') as SB_load:
-
-            # SN explosions time
-        tsn = pickle.load(SB_load)  # yrs
-        tsn = tsn * yr26yr          # Myrs
-
-            # number of SN
-        nsn = pickle.load(SB_load)
+        # SN explosions time and number of SN
+    tsn = store_read('SB', 'tsn')                    # yrs
+    tsn = [tsn_j * yr26yr for tsn_j in (tsn)]       # Myrs
+    nsn = store_read('SB', 'nsn')
 
-    with open('General', 'rb') as data_load:
+        # Gamma-ray luminosities (erg/s), spectral index and gamma-ray luminosity of PSRs and PWNe (erg/s)
+    for name, array in (('Lum_HESS', Lum_HESS_it), ('Lum_Fermi', Lum_Fermi_it), ('Lum', Lum_it), ('Gamma_HESS', Gamma_HESS_it), ('Gamma_GeV', Gamma_GeV_it), ('Gamma_MeV', Gamma_MeV_it), ('Lum_pwn', Lum_pwn_it), ('Lum_psr', Lum_psr_it)):
 
-            # Gamma-ray luminosities
-        Lum_HESS = pickle.load(data_load)   # erg/s
-        Lum_Fermi = pickle.load(data_load)  # erg/s
-        Lum = pickle.load(data_load)        # erg/s
+        array[k:k + nit] = store_read('General', name, iterations = slice(0, nit))
+        acc_it[name] = accumulator_merge(acc_it[name], accumulator_read('Statistics', name))
 
-            # Spectral index
-        Gamma_HESS = pickle.load(data_load)
-        Gamma_GeV = pickle.load(data_load)
-        Gamma_MeV = pickle.load(data_load)
+        # Concatenisation of all iterations
+    for j in range (nit):
 
-            # Gamma-ray luminosity of PSRs and PWNe
-        Lum_pwn = pickle.load(data_load)    # erg/s
-        Lum_psr = pickle.load(data_load)    # erg/s
+        tsn_it.append(tsn[j])
+        nsn_it[j + k] = nsn[j]
 
-            # Concatenisation of all iterations
-        for j in range (nit):
+    k += nit
 
-            Lum_HESS_it[j + k] = Lum_HESS[j]
-            Lum_Fermi_it[j + k] = Lum_Fermi[j]
-            Lum_it[j + k] = Lum[j]
-            Gamma_HESS_it[j + k] = Gamma_HESS[j]
-            Gamma_GeV_it[j + k] = Gamma_GeV[j]
-            Gamma_MeV_it[j + k] = Gamma_MeV[j]
-            Lum_pwn_it[j + k] = Lum_pwn[j]
-            Lum_psr_it[j + k] = Lum_psr[j]
-            tsn_it.append(tsn[j])
-            nsn_it[j + k] = nsn[j]
+    # Recording of the concatenisation
+os.chdir(pathtotal)
 
-        k += nit
+        # For the others
+for array in (Lum_HESS_it, Lum_Fermi_it, Lum_it, Gamma_HESS_it, Gamma_GeV_it, Gamma_MeV_it, Lum_pwn_it, Lum_psr_it):
+    array.flush()
 
-    # Recording of the concatenisation (you need to change it)
-os.chdir('/Users/stage/Documents/Virginie/Superbubbles/Files/Parametric_studies/stars/100/')
+store_write('Total', 'tsn', tsn_it, ['iteration', 'sn'], 'Myr', ragged = True)
+store_write('Total', 'nsn', nsn_it, axes)
 
-        # For the others
-with open('Total', 'wb') as iteration_write:
-    pickle.dump(Lum_HESS_it, iteration_write)
-    pickle.dump(Lum_Fermi_it, iteration_write)
-    pickle.dump(Lum_it, iteration_write)
-    pickle.dump(Gamma_HESS_it, iteration_write)
-    pickle.dump(Gamma_GeV_it, iteration_write)
-    pickle.dump(Gamma_MeV_it, iteration_write)
-    pickle.dump(Lum_pwn_it, iteration_write)
-    pickle.dump(Lum_psr_it, iteration_write)
+for name in (acc_it):
+    accumulator_write('Statistics', name, acc_it[name])
 
         # For 30 Dor C
 """
-with open('General', 'wb') as iteration_write:
-
-    pickle.dump(Lum_HESS_it, iteration_write)
-    pickle.dump(Lum_Fermi_it, iteration_write)
-    pickle.dump(Lum_it, iteration_write)
-    pickle.dump(Gamma_HESS_it, iteration_write)
-    pickle.dump(Gamma_GeV_it, iteration_write)
-    pickle.dump(Gamma_MeV_it, iteration_write)
-    pickle.dump(Lum_pwn_it, iteration_write)
-    pickle.dump(Lum_psr_it, iteration_write)
+for name in ('Lum_HESS', 'Lum_Fermi', 'Lum', 'Gamma_HESS', 'Gamma_GeV', 'Gamma_MeV', 'Lum_pwn', 'Lum_psr'):
+    store_write('General', name, store_read('Total', name), axes, store_index('Total')[name]['unit'])
 
-with open('SB', 'wb') as iteration_write:
-
-    pickle.dump(tsn_it, iteration_write)
-    pickle.dump(nsn_it, iteration_write)
+store_write('SB', 'tsn', tsn_it, ['iteration', 'sn'], 'Myr', ragged = True)
+store_write('SB', 'nsn', nsn_it, axes)
 """
     ##-------------------------------------------##
     # Histogramme of the sn in our time interval  #
@@ -160,28 +136,16 @@ if nit_tot > 1:
         # Computation of the probability to get nsn
     xlabel = '$n_{sn}$'
     ylabel = 'counts'
-    figure = figure_number
     len_bins = 1
-    histmin = numpy.min(nsn_it)
-    histmax = numpy.max(nsn_it)
-
-    histogramme(figure, nsn_it, xlabel, ylabel, len_bins)
-    plt.savefig(pathfigure+'Histogramme_nsn.pdf')
 
-    figure_number = figure + 1
+    specs.append(figure_spec(pathfigure+'Histogramme_nsn.pdf', [figure_call('histogramme', nsn_it, xlabel, ylabel, len_bins)]))
 
-    # Computation of the probability to get nsn
+    # Computation of the probability to get tsn
 xlabel = '$t_{sn}$'
 ylabel = 'counts'
-figure = figure_number
 len_bins = 1    # Myr
 
-for i in range (nfiles):
-    histogramme(figure, tsn_it[i], xlabel, ylabel, len_bins)
-
-plt.savefig(pathfigure+'Histogramme_tsn.pdf')
-
-figure_number = figure + 1
+specs.append(figure_spec(pathfigure+'Histogramme_tsn.pdf', [figure_call('histogramme', tsn_it[i], xlabel, ylabel, len_bins) for i in range (nfiles)]))
 
     ## ---------------------------------------------------------------- ##
     # Histogramme of the probability to have one luminosity/photon index #
@@ -197,135 +161,41 @@ if nit_tot > 1:
     xlabel_LH = '$L_\gamma$ (1 TeV - 10 TeV)'
     xlabel_GH = '$\Gamma_{ph}$ (1 TeV - 10 TeV)'
     xlabel_LF = '$L_\gamma$ (100 MeV - 100 GeV)'
+    xlabel_L = '$L_\gamma$ (100 MeV - 100 TeV)'
     xlabel_GG = '$\Gamma_{ph}$ (1 GeV - 10 GeV)'
     xlabel_GM = '$\Gamma_{ph}$ (100 MeV - 1 GeV)'
     xlabel_PSR = '$Lum_{\gamma, psr}$ (100 MeV - 10 GeV)'
     xlabel_PWN = '$Lum_{\gamma, psr}$ (1 TeV - 10 TeV)'
     ylabel = 'counts'
-    figure_LH = figure_number
-    figure_GH = figure_LH + 1
-    figure_LF = figure_GH + 1
-    figure_L = figure_LF + 1
-    figure_GG = figure_L + 1
-    figure_GM = figure_GG + 1
-    figure_PSR = figure_GM + 1
-    figure_PWN = figure_PSR + 1
-
-    for j in (ind_hist):
-
-        label = 't = %.2e yr'%t_fix[j]
-
-        Lum_HESS = Lum_HESS_it[:, j]
-        len_bins = 1e32
-
-        histogramme(figure_LH, Lum_HESS, label, title, xlabel_LH, ylabel, len_bins)
-        plt.savefig(pathfigure_gamma+'Histogramme_Lum_HESS.pdf')
-
-        Gamma_HESS = Gamma_HESS_it[:, j]
-        len_bins = 0.001
-
-        histogramme(figure_GH, Gamma_HESS, label, title, xlabel_GH, ylabel, len_bins)
-        plt.savefig(pathfigure_gamma+'Histogramme_Gamma_HESS.pdf')
-
-        Lum_Fermi = Lum_Fermi_it[:, j]
-        len_bins = 1e33
-
-        histogramme(figure_L, Lum_Fermi, label, title, xlabel_LF, ylabel, len_bins)
-        plt.savefig(pathfigure_gamma+'Histogramme_Lum_Fermi.pdf')
-
-        Lum = Lum_it[:, j]
-        len_bins = 1e33
-
-        histogramme(figure_LF, Lum, label, title, xlabel_LF, ylabel, len_bins)
-        plt.savefig(pathfigure_gamma+'Histogramme_Lum_.pdf')
-
-        Gamma_GeV = Gamma_GeV_it[:, j]
-        len_bins = 0.001
-
-        histogramme(figure_GG, Gamma_GeV, label, title, xlabel_GG, ylabel, len_bins)
-        plt.savefig(pathfigure_gamma+'Histogramme_Gamma_GeV.pdf')
-
-        Gamma_MeV = Gamma_MeV_it[:, j]
-        len_bins = 0.001
 
-        histogramme(figure_GM, Gamma_MeV, label, title, xlabel_GM, ylabel, len_bins)
-        plt.savefig(pathfigure_gamma+'Histogramme_Gamma_MeV.pdf')
+            # name of the file, iterations at each time step, label of the x-axis and width of the bins
+    histograms = [('Histogramme_Lum_HESS.pdf', Lum_HESS_it, xlabel_LH, 1e32),
+                  ('Histogramme_Gamma_HESS.pdf', Gamma_HESS_it, xlabel_GH, 0.001),
+                  ('Histogramme_Lum_Fermi.pdf', Lum_Fermi_it, xlabel_LF, 1e33),
+                  ('Histogramme_Lum_.pdf', Lum_it, xlabel_L, 1e33),
+                  ('Histogramme_Gamma_GeV.pdf', Gamma_GeV_it, xlabel_GG, 0.001),
+                  ('Histogramme_Gamma_MeV.pdf', Gamma_MeV_it, xlabel_GM, 0.001),
+                  ('Histogramme_Lum_PSR.pdf', Lum_psr_it, xlabel_PSR, 1e33),
+                  ('Histogramme_Lum_PWN.pdf', Lum_pwn_it, xlabel_PWN, 1e33)]
 
-        Lum_PSR = Lum_psr_it[:, j]
-        len_bins = 1e33
+    for name, array, xlabel, len_bins in (histograms):
 
-        histogramme(figure_PSR, Lum_PSR, label, title, xlabel_PSR, ylabel, len_bins)
-        plt.savefig(pathfigure_gamma+'Histogramme_Lum_PSR.pdf')
-
-        Lum_PWN = Lum_pwn_it[:, j]
-        len_bins = 1e33
-
-        histogramme(figure_PWN, Lum_PWN, label, title, xlabel_PWN, ylabel, len_bins)
-        plt.savefig(pathfigure_gamma+'Histogramme_Lum_PWN.pdf')
-
-    figure_number = figure_PWN + 1
+        calls = [figure_call('histogramme', numpy.array(array[:, j]), xlabel, ylabel, len_bins, label_name = 't = %.2e yr'%t_fix[j], title = title) for j in (ind_hist)]
+        specs.append(figure_spec(pathfigure_gamma+name, calls))
 
     ##---------------------------##
     # Mean and standard deviation #
     ##---------------------------##
 
-        # Initialization
-
-            # Mean
-Lum_HESS_mean = numpy.zeros(number_bin_t)               # from 1 TeV to 10 TeV
-Lum_Fermi_mean = numpy.zeros(number_bin_t)              # from 100 MeV to 100 GeV
-Lum_mean = numpy.zeros(number_bin_t)                    # from 100 MeV to 100 TeV
-Gamma_HESS_mean = numpy.zeros(number_bin_t)             # photon spectral index from 1 TeV to 10 TeV
-Gamma_GeV_mean = numpy.zeros(number_bin_t)              # photon spectral index from 1 GeV to 10 GeV
-Gamma_MeV_mean = numpy.zeros(number_bin_t)              # photon spectral index from 100 MeV to 1 GeV
-Lum_pwn_mean = numpy.zeros(number_bin_t)                # TeV emission of PWNe
-Lum_psr_mean = numpy.zeros(number_bin_t)                # GeV emission of PSRs
-
-            # Standard deviation
-Lum_HESS_std = numpy.zeros(number_bin_t)                # from 1 TeV to 10 TeV
-Lum_Fermi_std = numpy.zeros(number_bin_t)               # from 100 MeV to 100 GeV
-Lum_std = numpy.zeros(number_bin_t)                     # from 100 MeV to 100 TeV
-Gamma_HESS_std = numpy.zeros(number_bin_t)              # photon spectral index from 1 TeV to 10 TeV
-Gamma_GeV_std = numpy.zeros(number_bin_t)               # photon spectral index from 1 GeV to 10 GeV
-Gamma_MeV_std = numpy.zeros(number_bin_t)               # photon spectral index from 100 MeV to 1 GeV
-Lum_pwn_std = numpy.zeros(number_bin_t)                 # TeV emission of PWNe
-Lum_psr_std = numpy.zeros(number_bin_t)                 # GeV emission of PSRs
-
-for j in range (number_bin_t):
-
-    Lum_HESS = Lum_HESS_it[:, j]
-
-    Lum_Fermi = Lum_Fermi_it[:, j]
-
-    Lum = Lum_it[:, j]
-
-    Gamma_HESS = Gamma_HESS_it[:, j]
-
-    Gamma_GeV = Gamma_GeV_it[:, j]
-
-    Gamma_MeV = Gamma_MeV_it[:, j]
-
-    Lum_pwn = Lum_pwn_it[:, j]
-    Lum_pwn = Lum_pwn[numpy.where(Lum_pwn > 0.0)[0]]
-
-    Lum_psr = Lum_psr_it[:, j]
-    Lum_psr = Lum_psr[numpy.where(Lum_psr > 0.0)[0]]
-
-    Lum_HESS_mean[j] = numpy.mean(Lum_HESS)
-    Lum_Fermi_mean[j] = numpy.mean(Lum_Fermi)
-    Lum_mean[j] = numpy.mean(Lum)
-    Gamma_HESS_mean[j] = numpy.mean(Gamma_HESS)
-    Gamma_GeV_mean[j] = numpy.mean(Gamma_GeV)
-    Gamma_MeV_mean[j] = numpy.mean(Gamma_MeV)
-    Lum_pwn_mean[j] = 10**(numpy.mean(numpy.log10(Lum_pwn)))
-    Lum_psr_mean[j] = 10**(numpy.mean(numpy.log10(Lum_psr)))
-
-    Lum_HESS_std[j] = numpy.std(Lum_HESS)
-    Lum_Fermi_std[j] = numpy.std(Lum_Fermi)
-    Lum_std[j] = numpy.std(Lum)
-    Gamma_HESS_std[j] = numpy.std(Gamma_HESS)
-    Gamma_GeV_std[j] = numpy.std(Gamma_GeV)
-    Gamma_MeV_std[j] = numpy.std(Gamma_MeV)
+        # From the statistics of all iterations (see Functions_statistics.py)
+Lum_HESS_mean, Lum_HESS_std = accumulator_statistics(acc_it['Lum_HESS'])                # from 1 TeV to 10 TeV
+Lum_Fermi_mean, Lum_Fermi_std = accumulator_statistics(acc_it['Lum_Fermi'])             # from 100 MeV to 100 GeV
+Lum_mean, Lum_std = accumulator_statistics(acc_it['Lum'])                               # from 100 MeV to 100 TeV
+Gamma_HESS_mean, Gamma_HESS_std = accumulator_statistics(acc_it['Gamma_HESS'])          # photon spectral index from 1 TeV to 10 TeV
+Gamma_GeV_mean, Gamma_GeV_std = accumulator_statistics(acc_it['Gamma_GeV'])             # photon spectral index from 1 GeV to 10 GeV
+Gamma_MeV_mean, Gamma_MeV_std = accumulator_statistics(acc_it['Gamma_MeV'])             # photon spectral index from 100 MeV to 1 GeV
+Lum_pwn_mean = accumulator_statistics(acc_it['Lum_pwn'], log = True)[0]                 # TeV emission of PWNe (log-mean of the non-zero values)
+Lum_psr_mean = accumulator_statistics(acc_it['Lum_psr'], log = True)[0]                 # GeV emission of PSRs (log-mean of the non-zero values)
 
 Lum_HESS_mean = numpy.nan_to_num(Lum_HESS_mean)
 Lum_HESS_std = numpy.nan_to_num(Lum_HESS_std)
@@ -386,12 +256,10 @@ ylabel_HESS = '$L_\gamma$ [erg s$^{-1}$] (1 TeV - 10 TeV)'
 color_mean = 'cornflowerblue'
 color_pwn = 'green'
 
-semilog_plot(figure_number, 1, t6, y_mean, xlabel, ylabel_HESS, sym, linestyle, color_mean, xmin, xmax, ymin, ymax, label_name = label_mean)
-plt.fill_between(t6, Lum_HESS_pst, Lum_HESS_mst, color = color_mean, alpha = '0.15')
-semilog_plot(figure_number, 1, t6, y_pwn, label_pwn, Title, xlabel, ylabel_HESS, sym, linestyle, color_pwn, xmin, xmax, ymin, ymax, label_name = label_pwn)
-plt.savefig(pathfigure_gamma+'Mean_gamma_emission_HESS.pdf')
-
-figure_number += 1
+specs.append(figure_spec(pathfigure_gamma+'Mean_gamma_emission_HESS.pdf',
+                         [figure_call('semilog_plot', 1, t6, y_mean, xlabel, ylabel_HESS, sym, linestyle, color_mean, xmin, xmax, ymin, ymax, label_name = label_mean),
+                          figure_call('fill_between', t6, Lum_HESS_pst, Lum_HESS_mst, color = color_mean, alpha = 0.15),
+                          figure_call('semilog_plot', 1, t6, y_pwn, xlabel, ylabel_HESS, sym, linestyle, color_pwn, xmin, xmax, ymin, ymax, label_name = label_pwn)]))
 
             # Fermi energy range
 y_mean = Lum_Fermi_mean
@@ -402,43 +270,33 @@ y_psr = Lum_psr_mean
 label_psr = 'PSRs'
 color_psr = 'orange'
 
-semilog_plot(figure_number, 1, t6, y_mean, xlabel, ylabel_Fermi, sym, linestyle, color_mean, xmin, xmax, ymin, ymax, label_name = label_mean)
-plt.fill_between(t6, Lum_Fermi_pst, Lum_Fermi_mst, color = color_mean, alpha = '0.15')
-semilog_plot(figure_number, 1, t6, y_psr, xlabel, ylabel_Fermi, sym, linestyle, color_psr, xmin, xmax, ymin, ymax, label_name = label_psr)
-plt.savefig(pathfigure_gamma+'Mean_gamma_emission_Fermi.pdf')
-
-figure_number += 1
+specs.append(figure_spec(pathfigure_gamma+'Mean_gamma_emission_Fermi.pdf',
+                         [figure_call('semilog_plot', 1, t6, y_mean, xlabel, ylabel_Fermi, sym, linestyle, color_mean, xmin, xmax, ymin, ymax, label_name = label_mean),
+                          figure_call('fill_between', t6, Lum_Fermi_pst, Lum_Fermi_mst, color = color_mean, alpha = 0.15),
+                          figure_call('semilog_plot', 1, t6, y_psr, xlabel, ylabel_Fermi, sym, linestyle, color_psr, xmin, xmax, ymin, ymax, label_name = label_psr)]))
 
             # whole energy range
 y = Lum_mean
 ylabel = '$L_\gamma$ [erg s$^{-1}$] (100 MeV - 100 TeV)'
 color = 'cyan'
 
-semilog_plot(figure_number, 1, t6, y, xlabel, ylabel, sym, linestyle, color, xmin, xmax, ymin, ymax)
-plt.fill_between(t6, Lum_pst, Lum_mst, color = color, alpha = '0.15')
-plt.savefig(pathfigure_gamma+'Mean_gamma_emission.pdf')
-
-figure_number += 1
+specs.append(figure_spec(pathfigure_gamma+'Mean_gamma_emission.pdf',
+                         [figure_call('semilog_plot', 1, t6, y, xlabel, ylabel, sym, linestyle, color, xmin, xmax, ymin, ymax),
+                          figure_call('fill_between', t6, Lum_pst, Lum_mst, color = color, alpha = 0.15)]))
 
         # TeV emission of PWN
 y = Lum_pwn_mean
 ylabel = '$\log(L_{\gamma, pwn})$ [erg s$^{-1}$] (1 TeV - 10 TeV)'
 color = 'green'
 
-semilog_plot(figure_number, 1, t6, y, xlabel, ylabel, sym, linestyle, color, xmin, xmax, ymin, ymax)
-plt.savefig(pathfigure_remain+'Mean_luminosity_pwn.pdf')
-
-figure_number += 1
+specs.append(figure_spec(pathfigure_remain+'Mean_luminosity_pwn.pdf', [figure_call('semilog_plot', 1, t6, y, xlabel, ylabel, sym, linestyle, color, xmin, xmax, ymin, ymax)]))
 
         # GeV emission of PWN
 y = Lum_psr_mean
 ylabel = '$\log(L_{\gamma, psr})$ [erg s$^{-1}$] (100 MeV - 100 GeV)'
 color = 'orange'
 
-semilog_plot(figure_number, 1, t6, y, xlabel, ylabel, sym, linestyle, color, xmin, xmax, ymin, ymax)
-plt.savefig(pathfigure_remain+'Mean_luminosity_psr.pdf')
-
-figure_number += 1
+specs.append(figure_spec(pathfigure_remain+'Mean_luminosity_psr.pdf', [figure_call('semilog_plot', 1, t6, y, xlabel, ylabel, sym, linestyle, color, xmin, xmax, ymin, ymax)]))
 
         # Spectral index
 ymin = 0.0
@@ -449,32 +307,27 @@ y = Gamma_HESS_mean
 ylabel_HESS = '$\Gamma_{ph}$ (1 TeV - 10 TeV)'
 color = 'cornflowerblue'
 
-plot(figure_number, 1, t6, y, xlabel, ylabel_HESS, sym, linestyle, color, xmin, xmax, ymin, ymax)
-plt.fill_between(t6, Gamma_HESS_pst, Gamma_HESS_mst, color = color, alpha = '0.15')
-plt.savefig(pathfigure_gamma+'Photon_index_HESS.pdf')
-
-figure_number += 1
+specs.append(figure_spec(pathfigure_gamma+'Photon_index_HESS.pdf',
+                         [figure_call('plot', 1, t6, y, xlabel, ylabel_HESS, sym, linestyle, color, xmin, xmax, ymin, ymax),
+                          figure_call('fill_between', t6, Gamma_HESS_pst, Gamma_HESS_mst, color = color, alpha = 0.15)]))
 
             # 1 GeV to 10 GeV
 y = Gamma_GeV_mean
 ylabel_GeV = '$\Gamma_{ph}$ (1 GeV - 10 GeV)'
 color = 'orangered'
 
-plot(figure_number, 1, t6, y, xlabel, ylabel_GeV, sym, linestyle, color, xmin, xmax, ymin, ymax)
-plt.fill_between(t6, Gamma_GeV_pst, Gamma_GeV_mst, color = color, alpha = '0.15')
-plt.savefig(pathfigure_gamma+'Photon_index_GeV.pdf')
-
-figure_number += 1
+specs.append(figure_spec(pathfigure_gamma+'Photon_index_GeV.pdf',
+                         [figure_call('plot', 1, t6, y, xlabel, ylabel_GeV, sym, linestyle, color, xmin, xmax, ymin, ymax),
+                          figure_call('fill_between', t6, Gamma_GeV_pst, Gamma_GeV_mst, color = color, alpha = 0.15)]))
 
             # 100 MeV to 1 GeV
 y = Gamma_MeV_mean
 ylabel_MeV = '$\Gamma_{ph}$ (100 MeV - 1 GeV)'
 color = 'green'
 
-plot(figure_number, 1, t6, y, xlabel, ylabel_MeV, sym, linestyle, color, xmin, xmax, ymin, ymax)
-plt.fill_between(t6, Gamma_MeV_pst, Gamma_MeV_mst, color = color, alpha = '0.15')
-plt.savefig(pathfigure_gamma+'Photon_index_MeV.pdf')
-
-figure_number += 1
+specs.append(figure_spec(pathfigure_gamma+'Photon_index_MeV.pdf',
+                         [figure_call('plot', 1, t6, y, xlabel, ylabel_MeV, sym, linestyle, color, xmin, xmax, ymin, ymax),
+                          figure_call('fill_between', t6, Gamma_MeV_pst, Gamma_MeV_mst, color = color, alpha = 0.15)]))
 
-plt.show()
+    # Rendering of all figures (Agg backend, nworkers processes)
+render_figures(specs, nworkers)
@@ -9,18 +9,16 @@ Make sure that you have already run the code 'Plotting.py' with the correct form
 ##------------------------##
 # Librairies and functions #
 ##------------------------##
-import matplotlib.pyplot as plt
+from Functions_figures import *
 import numpy
 import scipy.integrate as integrate
-import astropy.units as units
 import os
 import pickle
-import naima
-from naima.models import PionDecay, TableModel
 from Functions import *
 from Functions_CR import *
 from Functions_SB import *
 from Functions_gamma import *
+from Functions_store import *
 
 # Physical constants and conversion factors
 from Physical_constants import *
@@ -37,6 +35,9 @@ from Parameters_system import *
 pathfigure_gamma = '/Users/stage/Documents/Virginie/Superbubbles/figures/30_Dor_C/Simulations/1e28_22_050/'
 pathfigure_sn = '/Users/stage/Documents/Virginie/Superbubbles/figures/30_Dor_C/Simulations/1e28_22_050/'
 
+    # Number of worker processes which render the figures
+nworkers = 1                                                                    #you need to change it for your machine
+
 ## ======================================= ##
 # Statistic for a high number of iterations #
 ## ======================================= ##
@@ -46,7 +47,7 @@ nit_tot = 200                                                          #you need
 
 
     # Initialization
-figure_number = 1
+specs = []  # specs of the figures (see Functions_figures.py), rendered at the end
 
     ## ------- ##
     # Load data #
@@ -55,35 +56,25 @@ figure_number = 1
         # you need to change it
 os.chdir('/Users/stage/Documents/Virginie/Superbubbles/Files/30_Dor_C/Simulations/1e28_22_050/')
 
-with open('General', 'rb') as iteration_write:
-
-    Lum_HESS_it = pickle.load(iteration_write)
-    Lum_Fermi_it = pickle.load(iteration_write)
-    Lum_it = pickle.load(iteration_write)
-    Gamma_HESS_it = pickle.load(iteration_write)
-    Gamma_GeV_it = pickle.load(iteration_write)
-    Gamma_MeV_it = pickle.load(iteration_write)
-    Lum_pwn_it = pickle.load(iteration_write)
-    Lum_psr_it = pickle.load(iteration_write)
+Lum_HESS_it = store_read('General', 'Lum_HESS')
+Lum_Fermi_it = store_read('General', 'Lum_Fermi')
+Lum_it = store_read('General', 'Lum')
+Gamma_HESS_it = store_read('General', 'Gamma_HESS')
+Gamma_GeV_it = store_read('General', 'Gamma_GeV')
+Gamma_MeV_it = store_read('General', 'Gamma_MeV')
 
-with open('SB', 'rb') as iteration_write:
-
-    tsn_it = pickle.load(iteration_write)
-    nsn_it = pickle.load(iteration_write)
+tsn_it = store_read('SB', 'tsn')
+nsn_it = store_read('SB', 'nsn')
 
         # you need to change it
 os.chdir('/Users/stage/Documents/Virginie/Superbubbles/Files/30_Dor_C/CR/')
 
-with open('CRbackground', 'rb') as CR_write:
-
-    Lum_CRb = pickle.load(CR_write)
-    Lum_HESS_CRb = pickle.load(CR_write)
-    Lum_Fermi_CRb = pickle.load(CR_write)
+Lum_CRb = store_read('CRbackground', 'Lum')
+Lum_HESS_CRb = store_read('CRbackground', 'Lum_HESS')
+Lum_Fermi_CRb = store_read('CRbackground', 'Lum_Fermi')
 
-with open('Pwn_psr', 'rb') as psr_write:
-
-    Lum_pwn_it = pickle.load(psr_write)
-    Lum_psr_it = pickle.load(psr_write)
+Lum_pwn_it = store_read('Pwn_psr', 'Lum_pwn')
+Lum_psr_it = store_read('Pwn_psr', 'Lum_psr')
 
     ##---------------------##
     # Supernovae explosions #
@@ -98,10 +89,7 @@ len_bins = 1
 histmin = numpy.min(nsn_it)
 histmax = numpy.max(nsn_it)
 
-histogramme(figure_number, nsn_it, label, title, xlabel, ylabel, len_bins)
-plt.savefig(pathfigure_sn+'Histogramme_nsn.pdf')
-
-figure_number += 1
+specs.append(figure_spec(pathfigure_sn+'Histogramme_nsn.pdf', [figure_call('histogramme', nsn_it, xlabel, ylabel, len_bins, label_name = label, title = title)]))
 
     ##---------------------------##
     # Mean and standard deviation #
@@ -216,13 +204,11 @@ color_mean = ['cornflowerblue', 'green', 'purple']
 y_mean = [Lum_HESS_mean, Lum_pwn_mean, Lum_HESS_CRb]
 ylabel_HESS = '$L_\gamma$ [erg s$^{-1}$] (1 TeV - 10 TeV)'
 
-semilog_plot(figure_number, len(y_mean), t6, y_mean, label_mean, Title, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, text, xmin, xmax, ymin, ymax)
-plt.fill_between(t6, Lum_HESS_pst, Lum_HESS_mst, color = 'cornflowerblue', alpha = '0.25')
-plt.errorbar(tobs, Lum_obs_HESS, yerr = 0.2e35, marker = 'd', linestyle = '', color = 'darkred', label = 'H.E.S.S.')
-plt.legend(loc = 'best')
-plt.savefig(pathfigure_gamma+'Mean_gamma_emission_HESS.pdf')
-
-figure_number += 1
+specs.append(figure_spec(pathfigure_gamma+'Mean_gamma_emission_HESS.pdf',
+                         [figure_call('semilog_plot', len(y_mean), t6, y_mean, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, xmin, xmax, ymin, ymax, label_name = label_mean, title = Title, text = text),
+                          figure_call('fill_between', t6, Lum_HESS_pst, Lum_HESS_mst, color = 'cornflowerblue', alpha = 0.25),
+                          figure_call('errorbar', tobs, Lum_obs_HESS, yerr = 0.2e35, marker = 'd', linestyle = '', color = 'darkred', label = 'H.E.S.S.'),
+                          figure_call('legend', loc = 'best')]))
 
             # Fermi energy range
 label_mean = ['HE CRs', 'PSRs', 'CRs background']
@@ -230,11 +216,9 @@ color_mean = ['orangered', 'orange', 'maroon']
 y_mean = [Lum_Fermi_mean, Lum_psr_mean, Lum_Fermi_CRb]
 ylabel_HESS = '$L_\gamma$ [erg s$^{-1}$] (100 MeV - 100 GeV)'
 
-semilog_plot(figure_number, len(y_mean), t6, y_mean, label_mean, Title, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, text, xmin, xmax, ymin, ymax)
-plt.fill_between(t6, Lum_Fermi_pst, Lum_Fermi_mst, color = 'orangered', alpha = '0.25')
-plt.savefig(pathfigure_gamma+'Mean_gamma_emission_Fermi.pdf')
-
-figure_number += 1
+specs.append(figure_spec(pathfigure_gamma+'Mean_gamma_emission_Fermi.pdf',
+                         [figure_call('semilog_plot', len(y_mean), t6, y_mean, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, xmin, xmax, ymin, ymax, label_name = label_mean, title = Title, text = text),
+                          figure_call('fill_between', t6, Lum_Fermi_pst, Lum_Fermi_mst, color = 'orangered', alpha = 0.25)]))
 
         # Spectral index
 label = 'none'
@@ -249,24 +233,20 @@ y = Gamma_HESS_mean
 color = 'cornflowerblue'
 ylabel_HESS = '$\Gamma_{ph}$ (1 TeV - 10 TeV)'
 
-plot(figure_number, 1, t6, y, label, Title, xlabel, ylabel_HESS, sym, linestyle, color, text, xmin, xmax, ymin, ymax)
-plt.fill_between(t6, Gamma_HESS_pst, Gamma_HESS_mst, color = 'cornflowerblue', alpha = '0.25')
-plt.errorbar(tobs, Gamma_obs_HESS, yerr = 0.2, marker = 'd', linestyle = '', color = 'darkred', label = 'H.E.S.S.')
-plt.legend(loc = 'best')
-plt.savefig(pathfigure_gamma+'Photon_index_HESS.pdf')
-
-figure_number += 1
+specs.append(figure_spec(pathfigure_gamma+'Photon_index_HESS.pdf',
+                         [figure_call('plot', 1, t6, y, xlabel, ylabel_HESS, sym, linestyle, color, xmin, xmax, ymin, ymax, label_name = label, title = Title, text = text),
+                          figure_call('fill_between', t6, Gamma_HESS_pst, Gamma_HESS_mst, color = 'cornflowerblue', alpha = 0.25),
+                          figure_call('errorbar', tobs, Gamma_obs_HESS, yerr = 0.2, marker = 'd', linestyle = '', color = 'darkred', label = 'H.E.S.S.'),
+                          figure_call('legend', loc = 'best')]))
 
             # 1 GeV to 10 GeV
 y = Gamma_GeV_mean
 color = 'orangered'
 ylabel_GeV = '$\Gamma_{ph}$ (1 GeV - 10 GeV)'
 
-plot(figure_number, 1, t6, y, label, Title, xlabel, ylabel_GeV, sym, linestyle, color, text, xmin, xmax, ymin, ymax)
-plt.fill_between(t6, Gamma_GeV_pst, Gamma_GeV_mst, color = 'orangered', alpha = '0.25')
-plt.savefig(pathfigure_gamma+'Photon_index_GeV.pdf')
-
-figure_number += 1
+specs.append(figure_spec(pathfigure_gamma+'Photon_index_GeV.pdf',
+                         [figure_call('plot', 1, t6, y, xlabel, ylabel_GeV, sym, linestyle, color, xmin, xmax, ymin, ymax, label_name = label, title = Title, text = text),
+                          figure_call('fill_between', t6, Gamma_GeV_pst, Gamma_GeV_mst, color = 'orangered', alpha = 0.25)]))
 
     ## ----------- ##
     # Probabilities #
@@ -282,8 +262,15 @@ label = ['VHE CRs + PWNe', 'only VHE CRs', 'HE CRs + PSRs', 'only HE CRs', 'no P
 y = [Proba_HESS, Proba_HESS_CR, Proba_Fermi, Proba_Fermi_CR, Proba_pwn_psr]
 ylabel = 'Probability'
 
-plot(figure_number, 5, t6, y, label, Title, xlabel, ylabel, sym, linestyle, color, text, xmin, xmax, ymin, ymax)
-plt.savefig(pathfigure_gamma+'Probabilities.pdf')
+        # 95 % confidence intervals (Wilson score, or probability_bootstrap(probability_events(...)) for bootstrap intervals)
+y_min, y_max = probability_wilson(y, nit_tot)
+
+specs.append(figure_spec(pathfigure_gamma+'Probabilities.pdf',
+                         [figure_call('plot', 5, t6, y, xlabel, ylabel, sym, linestyle, color, xmin, xmax, ymin, ymax, label_name = label, title = Title, text = text)] +
+                         [figure_call('fill_between', t6, y_min[i], y_max[i], color = color[i], alpha = 0.15) for i in range (len(y))]))
+
+    # Rendering of all figures (Agg backend, nworkers processes)
+render_figures(specs, nworkers)
 
     # Analyse (t6 = 4 Myrs)
 indt = numpy.where(t6 >= 4)[0]
@@ -293,5 +280,3 @@ print('Photon spectral index: (%.3f +/- %.3f)'%(Gamma_HESS_mean[indt[0]], Gamma_
 print('Probability to observe the SB in the VHE range: %.2f'%Proba_HESS[indt[0]])
 print('Probability to observe only the VHE CRs: %.2f' %Proba_HESS_CR[indt[0]])
 print('Probability to observe no PWN: %.2f' %Proba_pwn_psr[indt[0]])
-
-plt.show()
@@ -8,18 +8,16 @@ Make sure that you have already run the code 'Iterations.py' and 'Plotting.py' t
 ##------------------------##
 # Librairies and functions #
 ##------------------------##
-import matplotlib.pyplot as plt
+from Functions_figures import *
 import numpy
 import scipy.integrate as integrate
-import astropy.units as units
 import os
 import pickle
-import naima
-from naima.models import PionDecay, TableModel
 from Functions import *
 from Functions_CR import *
 from Functions_SB import *
 from Functions_gamma import *
+from Functions_store import *
 
 # Physical constants and conversion factors
 from Physical_constants import *
@@ -33,12 +31,15 @@ from Parameters_system import *
     # you need to change it
 pathfigure_gamma = '/Users/stage/Documents/Virginie/Superbubbles/figures/Parametric_studies/diffusion/Comparison/indices/'
 
+    # Number of worker processes which render the figures
+nworkers = 1                                                                    #you need to change it for your machine
+
 ## ======================================= ##
 # Statistic for a high number of iterations #
 ## ======================================= ##
 
     # Initialization
-figure_number = 1
+specs = []  # specs of the figures (see Functions_figures.py), rendered at the end
 
     ## ------- ##
     # Load data #
@@ -48,16 +49,14 @@ figure_number = 1
 
 os.chdir('/Users/stage/Documents/Virginie/Superbubbles/Files/Parametric_studies/diffusion/alpha2_2/')
 
-with open('Total', 'rb') as iteration_write:
-
-    Lum_HESS_30 = pickle.load(iteration_write)
-    Lum_Fermi_30 = pickle.load(iteration_write)
-    Lum_30 = pickle.load(iteration_write)
-    Gamma_HESS_30 = pickle.load(iteration_write)
-    Gamma_GeV_30 = pickle.load(iteration_write)
-    Gamma_MeV_30 = pickle.load(iteration_write)
-    Lum_pwn_30 = pickle.load(iteration_write)
-    Lum_psr_30 = pickle.load(iteration_write)
+Lum_HESS_30 = store_read('Total', 'Lum_HESS')
+Lum_Fermi_30 = store_read('Total', 'Lum_Fermi')
+Lum_30 = store_read('Total', 'Lum')
+Gamma_HESS_30 = store_read('Total', 'Gamma_HESS')
+Gamma_GeV_30 = store_read('Total', 'Gamma_GeV')
+Gamma_MeV_30 = store_read('Total', 'Gamma_MeV')
+Lum_pwn_30 = store_read('Total', 'Lum_pwn')
+Lum_psr_30 = store_read('Total', 'Lum_psr')
 
 ##---------------------------##
 # Mean and standard deviation #
@@ -139,16 +138,14 @@ Gamma_GeV_mst_30[ind0] = numpy.zeros(len(ind0))
 
 os.chdir('/Users/stage/Documents/Virginie/Superbubbles/Files/Parametric_studies/diffusion/delta0_33/')
 
-with open('Total', 'rb') as iteration_write:
-
-    Lum_HESS_100 = pickle.load(iteration_write)
-    Lum_Fermi_100 = pickle.load(iteration_write)
-    Lum_100 = pickle.load(iteration_write)
-    Gamma_HESS_100 = pickle.load(iteration_write)
-    Gamma_GeV_100 = pickle.load(iteration_write)
-    Gamma_MeV_100 = pickle.load(iteration_write)
-    Lum_pwn_100 = pickle.load(iteration_write)
-    Lum_psr_100 = pickle.load(iteration_write)
+Lum_HESS_100 = store_read('Total', 'Lum_HESS')
+Lum_Fermi_100 = store_read('Total', 'Lum_Fermi')
+Lum_100 = store_read('Total', 'Lum')
+Gamma_HESS_100 = store_read('Total', 'Gamma_HESS')
+Gamma_GeV_100 = store_read('Total', 'Gamma_GeV')
+Gamma_MeV_100 = store_read('Total', 'Gamma_MeV')
+Lum_pwn_100 = store_read('Total', 'Lum_pwn')
+Lum_psr_100 = store_read('Total', 'Lum_psr')
 
     ##---------------------------##
     # Mean and standard deviation #
@@ -228,16 +225,14 @@ Gamma_GeV_mst_100[ind0] = numpy.zeros(len(ind0))
 
 os.chdir('/Users/stage/Documents/Virginie/Superbubbles/Files/Parametric_studies/stars/100/')
 
-with open('Total', 'rb') as iteration_write:
-
-    Lum_HESS_300 = pickle.load(iteration_write)
-    Lum_Fermi_300 = pickle.load(iteration_write)
-    Lum_300 = pickle.load(iteration_write)
-    Gamma_HESS_300 = pickle.load(iteration_write)
-    Gamma_GeV_300 = pickle.load(iteration_write)
-    Gamma_MeV_300 = pickle.load(iteration_write)
-    Lum_pwn_300 = pickle.load(iteration_write)
-    Lum_psr_300 = pickle.load(iteration_write)
+Lum_HESS_300 = store_read('Total', 'Lum_HESS')
+Lum_Fermi_300 = store_read('Total', 'Lum_Fermi')
+Lum_300 = store_read('Total', 'Lum')
+Gamma_HESS_300 = store_read('Total', 'Gamma_HESS')
+Gamma_GeV_300 = store_read('Total', 'Gamma_GeV')
+Gamma_MeV_300 = store_read('Total', 'Gamma_MeV')
+Lum_pwn_300 = store_read('Total', 'Lum_pwn')
+Lum_psr_300 = store_read('Total', 'Lum_psr')
 
     ##---------------------------##
     # Mean and standard deviation #
@@ -334,19 +329,15 @@ ymax = 1e36
 y_mean = [Lum_HESS_mean_30, Lum_HESS_mean_100, Lum_HESS_mean_300]
 ylabel_HESS = '$L_\gamma$ [erg s$^{-1}$] (1 TeV - 10 TeV)'
 
-semilog_plot(figure_number, 3, t6, y_mean, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, xmin, xmax, ymin, ymax, label_name = label_mean)
-plt.savefig(pathfigure_gamma+'Mean_gamma_emission_HESS.pdf')
-
-figure_number += 1
+specs.append(figure_spec(pathfigure_gamma+'Mean_gamma_emission_HESS.pdf',
+                         [figure_call('semilog_plot', 3, t6, y_mean, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, xmin, xmax, ymin, ymax, label_name = label_mean)]))
 
             # Fermi energy range
 y_mean = [Lum_Fermi_mean_30, Lum_Fermi_mean_100, Lum_Fermi_mean_300]
 ylabel_HESS = '$L_\gamma$ [erg s$^{-1}$] (100 MeV - 100 GeV)'
 
-semilog_plot(figure_number, 3, t6, y_mean, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, xmin, xmax, ymin, ymax, label_name = label_mean)
-plt.savefig(pathfigure_gamma+'Mean_gamma_emission_Fermi.pdf')
-
-figure_number += 1
+specs.append(figure_spec(pathfigure_gamma+'Mean_gamma_emission_Fermi.pdf',
+                         [figure_call('semilog_plot', 3, t6, y_mean, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, xmin, xmax, ymin, ymax, label_name = label_mean)]))
 
         # Spectral index
 ymin = 0.0
@@ -356,18 +347,15 @@ ymax = 3.5
 y_mean = [Gamma_HESS_mean_30, Gamma_HESS_mean_100, Gamma_HESS_mean_300]
 ylabel_HESS = '$\Gamma_{ph}$ (1 TeV - 10 TeV)'
 
-plot(figure_number, 3, t6, y_mean, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, xmin, xmax, ymin, ymax, label_name = label_mean)
-plt.savefig(pathfigure_gamma+'Photon_index_HESS.pdf')
-
-figure_number += 1
+specs.append(figure_spec(pathfigure_gamma+'Photon_index_HESS.pdf',
+                         [figure_call('plot', 3, t6, y_mean, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, xmin, xmax, ymin, ymax, label_name = label_mean)]))
 
             # 1 GeV to 10 GeV
 y_mean = [Gamma_GeV_mean_30, Gamma_GeV_mean_100, Gamma_GeV_mean_300]
 ylabel_HESS = '$\Gamma_{ph}$ (1 GeV - 10 GeV)'
 
-plot(figure_number, 3, t6, y_mean, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, xmin, xmax, ymin, ymax, label_name = label_mean)
-plt.savefig(pathfigure_gamma+'Photon_index_GeV.pdf')
-
-figure_number += 1
+specs.append(figure_spec(pathfigure_gamma+'Photon_index_GeV.pdf',
+                         [figure_call('plot', 3, t6, y_mean, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, xmin, xmax, ymin, ymax, label_name = label_mean)]))
 
-plt.show()
+    # Rendering of all figures (Agg backend, nworkers processes)
+render_figures(specs, nworkers)
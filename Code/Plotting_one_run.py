@@ -10,18 +10,16 @@ Make sure that you have already run the code 'Plotting.py' to have the concateni
 ##------------------------##
 # Librairies and functions #
 ##------------------------##
-import matplotlib.pyplot as plt
+from Functions_figures import *
 import numpy
 import scipy.integrate as integrate
-import astropy.units as units
 import os
 import pickle
-import naima
-from naima.models import PionDecay, TableModel
 from Functions import *
 from Functions_CR import *
 from Functions_SB import *
 from Functions_gamma import *
+from Functions_store import *
 
 # Physical constants and conversion factors
 from Physical_constants import *
@@ -35,12 +33,15 @@ from Parameters_system import *
     # you need to change it
 pathfigure_gamma = '/Users/stage/Documents/Virginie/Superbubbles/figures/Parametric_studies/diffusion/delta0_33/Gamma_emission/'
 
+    # Number of worker processes which render the figures
+nworkers = 1                                                                    #you need to change it for your machine
+
 ## ======================================= ##
 # Statistic for a high number of iterations #
 ## ======================================= ##
 
     # Initialization
-figure_number = 1
+specs = []  # specs of the figures (see Functions_figures.py), rendered at the end
 
     ## ------- ##
     # Load data #
@@ -48,16 +49,17 @@ figure_number = 1
 
 os.chdir('/Users/stage/Documents/Virginie/Superbubbles/Files/Parametric_studies/diffusion/delta0_33/')
 
-with open('Total', 'rb') as iteration_write:
+        # only the plotted iterations are read (0: iteration 20, 1: iteration 98)
+iterations = [20, 98]
 
-    Lum_HESS = pickle.load(iteration_write)
-    Lum_Fermi = pickle.load(iteration_write)
-    Lum = pickle.load(iteration_write)
-    Gamma_HESS = pickle.load(iteration_write)
-    Gamma_GeV = pickle.load(iteration_write)
-    Gamma_MeV = pickle.load(iteration_write)
-    Lum_pwn = pickle.load(iteration_write)
-    Lum_psr = pickle.load(iteration_write)
+Lum_HESS = store_read('Total', 'Lum_HESS', iterations = iterations)
+Lum_Fermi = store_read('Total', 'Lum_Fermi', iterations = iterations)
+Lum = store_read('Total', 'Lum', iterations = iterations)
+Gamma_HESS = store_read('Total', 'Gamma_HESS', iterations = iterations)
+Gamma_GeV = store_read('Total', 'Gamma_GeV', iterations = iterations)
+Gamma_MeV = store_read('Total', 'Gamma_MeV', iterations = iterations)
+Lum_pwn = store_read('Total', 'Lum_pwn', iterations = iterations)
+Lum_psr = store_read('Total', 'Lum_psr', iterations = iterations)
 
     # One iteration
 j = 20  # one iteration
@@ -82,45 +84,34 @@ color_pwn = ['green', 'darkviolet']
             # H.E.S.S. range
 ylabel_HESS = '$L_\gamma$ [erg s$^{-1}$] (1 TeV - 10 TeV)'
 
-y_mean = [Lum_HESS[20], Lum_HESS[98]]
-y_pwn = [Lum_pwn[20], Lum_pwn[98]]
-
-semilog_plot(figure_number, 2, t6, y_mean, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, xmin, xmax, ymin, ymax)
-semilog_plot(figure_number, 2, t6, y_pwn, xlabel, ylabel_HESS, sym_pwn, linestyle_pwn, color_pwn, xmin, xmax, ymin, ymax)
-plt.savefig(pathfigure_gamma+'Gamma_emission_HESS_tot.pdf')
-figure_number += 1
+y_mean = [Lum_HESS[0], Lum_HESS[1]]
+y_pwn = [Lum_pwn[0], Lum_pwn[1]]
 
-semilog_plot(figure_number, 2, t6, y_mean, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, xmin, xmax, ymin, ymax)
-plt.savefig(pathfigure_gamma+'Gamma_emission_HESS.pdf')
-figure_number += 1
+mean = figure_call('semilog_plot', 2, t6, y_mean, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, xmin, xmax, ymin, ymax)
+pwn = figure_call('semilog_plot', 2, t6, y_pwn, xlabel, ylabel_HESS, sym_pwn, linestyle_pwn, color_pwn, xmin, xmax, ymin, ymax)
 
-semilog_plot(figure_number, 2, t6, y_pwn, xlabel, ylabel_HESS, sym_pwn, linestyle_pwn, color_pwn, xmin, xmax, ymin, ymax)
-plt.savefig(pathfigure_gamma+'Gamma_emission_pwn.pdf')
-figure_number += 1
+specs.append(figure_spec(pathfigure_gamma+'Gamma_emission_HESS_tot.pdf', [mean, pwn]))
+specs.append(figure_spec(pathfigure_gamma+'Gamma_emission_HESS.pdf', [mean]))
+specs.append(figure_spec(pathfigure_gamma+'Gamma_emission_pwn.pdf', [pwn]))
 
             # Fermi range
 ylabel_HESS = '$L_\gamma$ [erg s$^{-1}$] (100 MeV - 100 GeV)'
 
-y_mean = [Lum_Fermi[20], Lum_Fermi[98]]
-y_psr = [Lum_psr[20], Lum_psr[98]]
-
-semilog_plot(figure_number, 2, t6, y_mean, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, xmin, xmax, ymin, ymax)
-semilog_plot(figure_number, 2, t6, y_psr, xlabel, ylabel_HESS, sym_pwn, linestyle_pwn, color_pwn, xmin, xmax, ymin, ymax)
-plt.savefig(pathfigure_gamma+'Gamma_emission_Fermi_tot.pdf')
-figure_number += 1
+y_mean = [Lum_Fermi[0], Lum_Fermi[1]]
+y_psr = [Lum_psr[0], Lum_psr[1]]
 
-semilog_plot(figure_number, 2, t6, y_mean, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, xmin, xmax, ymin, ymax)
-plt.savefig(pathfigure_gamma+'Gamma_emission_Fermi.pdf')
-figure_number += 1
+mean = figure_call('semilog_plot', 2, t6, y_mean, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, xmin, xmax, ymin, ymax)
+psr = figure_call('semilog_plot', 2, t6, y_psr, xlabel, ylabel_HESS, sym_pwn, linestyle_pwn, color_pwn, xmin, xmax, ymin, ymax)
 
-semilog_plot(figure_number, 2, t6, y_psr, xlabel, ylabel_HESS, sym_pwn, linestyle_pwn, color_pwn, xmin, xmax, ymin, ymax)
-plt.savefig(pathfigure_gamma+'Gamma_emission_psr.pdf')
-figure_number += 1
+specs.append(figure_spec(pathfigure_gamma+'Gamma_emission_Fermi_tot.pdf', [mean, psr]))
+specs.append(figure_spec(pathfigure_gamma+'Gamma_emission_Fermi.pdf', [mean]))
+specs.append(figure_spec(pathfigure_gamma+'Gamma_emission_psr.pdf', [psr]))
 
 label = ['VHE', 'HE']
-y_mean = [Lum_HESS[20], Lum_Fermi[20]]
+y_mean = [Lum_HESS[0], Lum_Fermi[0]]
 
-semilog_plot(figure_number, 2, t6, y_mean, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, xmin, xmax, ymin, ymax, label_name = label)
-plt.savefig(pathfigure_gamma+'Gamma_emission_comparison.pdf')
+specs.append(figure_spec(pathfigure_gamma+'Gamma_emission_comparison.pdf',
+                         [figure_call('semilog_plot', 2, t6, y_mean, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, xmin, xmax, ymin, ymax, label_name = label)]))
 
-plt.show()
+    # Rendering of all figures (Agg backend, nworkers processes)
+render_figures(specs, nworkers)
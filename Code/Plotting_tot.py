@@ -9,18 +9,17 @@ Make sure that you have already run the code 'Plotting.py' to have the concateni
 ##------------------------##
 # Librairies and functions #
 ##------------------------##
-import matplotlib.pyplot as plt
+from Functions_figures import *
 import numpy
 import scipy.integrate as integrate
-import astropy.units as units
 import os
 import pickle
-import naima
-from naima.models import PionDecay, TableModel
 from Functions import *
 from Functions_CR import *
 from Functions_SB import *
 from Functions_gamma import *
+from Functions_store import *
+from Functions_statistics import *
 
 # Physical constants and conversion factors
 from Physical_constants import *
@@ -34,12 +33,15 @@ from Parameters_system import *
     # you need to change it
 pathfigure_gamma = '/Users/stage/Documents/Virginie/Superbubbles/figures/Parametric_studies/percentage/20/Gamma_emission/'
 
+    # Number of worker processes which render the figures
+nworkers = 1                                                                    #you need to change it for your machine
+
 ## ======================================= ##
 # Statistic for a high number of iterations #
 ## ======================================= ##
 
     # Initialization
-figure_number = 1
+specs = []  # specs of the figures (see Functions_figures.py), rendered at the end
 
     ## ------- ##
     # Load data #
@@ -47,87 +49,40 @@ figure_number = 1
 
 os.chdir('/Users/stage/Documents/Virginie/Superbubbles/Files/Parametric_studies/percentage/20/')
 
-with open('Total', 'rb') as iteration_write:
-
-    Lum_HESS_it = pickle.load(iteration_write)
-    nit_tot = len(Lum_HESS_it)
-    Lum_Fermi_it = pickle.load(iteration_write)
-    Lum_it = pickle.load(iteration_write)
-    Gamma_HESS_it = pickle.load(iteration_write)
-    Gamma_GeV_it = pickle.load(iteration_write)
-    Gamma_MeV_it = pickle.load(iteration_write)
-    Lum_pwn_it = pickle.load(iteration_write)
-    Lum_psr_it = pickle.load(iteration_write)
-    tsn_it = pickle.load(iteration_write)
-    nsn_it = pickle.load(iteration_write)
+nit_tot = store_index('Total')['Lum_HESS']['shape'][0]
+Lum_HESS_it = store_read('Total', 'Lum_HESS')
+Lum_Fermi_it = store_read('Total', 'Lum_Fermi')
+Lum_it = store_read('Total', 'Lum')
+Gamma_HESS_it = store_read('Total', 'Gamma_HESS')
+Gamma_GeV_it = store_read('Total', 'Gamma_GeV')
+Gamma_MeV_it = store_read('Total', 'Gamma_MeV')
+Lum_pwn_it = store_read('Total', 'Lum_pwn')
+Lum_psr_it = store_read('Total', 'Lum_psr')
+tsn_it = store_read('Total', 'tsn')
+nsn_it = store_read('Total', 'nsn')
 
 os.chdir('/Users/stage/Documents/Virginie/Superbubbles/Files/Parametric_studies/stars/100/')
 
-with open('CRbackground', 'rb') as CR_write:
-
-    Lum_CRb = pickle.load(CR_write)
-    Lum_HESS_CRb = pickle.load(CR_write)
-    Lum_Fermi_CRb = pickle.load(CR_write)
+Lum_CRb = store_read('CRbackground', 'Lum')
+Lum_HESS_CRb = store_read('CRbackground', 'Lum_HESS')
+Lum_Fermi_CRb = store_read('CRbackground', 'Lum_Fermi')
 
     ##---------------------------##
     # Mean and standard deviation #
     ##---------------------------##
 
-        # Initialization
-
-            # Mean
-Lum_HESS_mean = numpy.zeros(number_bin_t)               # from 1 TeV to 10 TeV
-Lum_Fermi_mean = numpy.zeros(number_bin_t)              # from 100 MeV to 100 GeV
-Lum_mean = numpy.zeros(number_bin_t)                    # from 100 MeV to 100 TeV
-Gamma_HESS_mean = numpy.zeros(number_bin_t)             # photon spectral index from 1 TeV to 10 TeV
-Gamma_GeV_mean = numpy.zeros(number_bin_t)              # photon spectral index from 1 GeV to 10 GeV
-Gamma_MeV_mean = numpy.zeros(number_bin_t)              # photon spectral index from 100 MeV to 1 GeV
-Lum_pwn_mean = numpy.zeros(number_bin_t)                # TeV emission of PWNe
-Lum_psr_mean = numpy.zeros(number_bin_t)                # GeV emission of PSRs
-
-            # Standard deviation
-Lum_HESS_std = numpy.zeros(number_bin_t)                # from 1 TeV to 10 TeV
-Lum_Fermi_std = numpy.zeros(number_bin_t)               # from 100 MeV to 100 GeV
-Lum_std = numpy.zeros(number_bin_t)                     # from 100 MeV to 100 TeV
-Gamma_HESS_std = numpy.zeros(number_bin_t)              # photon spectral index from 1 TeV to 10 TeV
-Gamma_GeV_std = numpy.zeros(number_bin_t)               # photon spectral index from 1 GeV to 10 GeV
-Gamma_MeV_std = numpy.zeros(number_bin_t)               # photon spectral index from 100 MeV to 1 GeV
-
-for j in range (number_bin_t):
-
-    Lum_HESS = Lum_HESS_it[:, j]
-
-    Lum_Fermi = Lum_Fermi_it[:, j]
-
-    Lum = Lum_it[:, j]
-
-    Gamma_HESS = Gamma_HESS_it[:, j]
+        # From the statistics of all iterations written by Plotting.py (see Functions_statistics.py)
+Lum_HESS_mean, Lum_HESS_std = accumulator_statistics(accumulator_read('Statistics', 'Lum_HESS'))                # from 1 TeV to 10 TeV
+Lum_Fermi_mean, Lum_Fermi_std = accumulator_statistics(accumulator_read('Statistics', 'Lum_Fermi'))             # from 100 MeV to 100 GeV
+Lum_mean, Lum_std = accumulator_statistics(accumulator_read('Statistics', 'Lum'))                               # from 100 MeV to 100 TeV
+Gamma_HESS_mean, Gamma_HESS_std = accumulator_statistics(accumulator_read('Statistics', 'Gamma_HESS'))          # photon spectral index from 1 TeV to 10 TeV
+Gamma_GeV_mean, Gamma_GeV_std = accumulator_statistics(accumulator_read('Statistics', 'Gamma_GeV'))             # photon spectral index from 1 GeV to 10 GeV
+Gamma_MeV_mean, Gamma_MeV_std = accumulator_statistics(accumulator_read('Statistics', 'Gamma_MeV'))             # photon spectral index from 100 MeV to 1 GeV
+Lum_pwn_mean = accumulator_statistics(accumulator_read('Statistics', 'Lum_pwn'), log = True)[0]                 # TeV emission of PWNe (log-mean of the non-zero values)
+Lum_psr_mean = accumulator_statistics(accumulator_read('Statistics', 'Lum_psr'), log = True)[0]                 # GeV emission of PSRs (log-mean of the non-zero values)
 
-    Gamma_GeV = Gamma_GeV_it[:, j]
-
-    Gamma_MeV = Gamma_MeV_it[:, j]
-
-    Lum_pwn = Lum_pwn_it[:, j]
-    Lum_pwn = Lum_pwn[numpy.where(Lum_pwn > 0.0)[0]]
-
-    Lum_psr = Lum_psr_it[:, j]
-    Lum_psr = Lum_psr[numpy.where(Lum_psr > 0.0)[0]]
-
-    Lum_HESS_mean[j] = numpy.mean(Lum_HESS)
-    Lum_Fermi_mean[j] = numpy.mean(Lum_Fermi)
-    Lum_mean[j] = numpy.mean(Lum)
-    Gamma_HESS_mean[j] = numpy.mean(Gamma_HESS)
-    Gamma_GeV_mean[j] = numpy.mean(Gamma_GeV)
-    Gamma_MeV_mean[j] = numpy.mean(Gamma_MeV)
-    Lum_pwn_mean[j] = 10**(numpy.mean(numpy.log10(Lum_pwn)))
-    Lum_psr_mean[j] = 10**(numpy.mean(numpy.log10(Lum_psr)))
-
-    Lum_HESS_std[j] = numpy.std(Lum_HESS)
-    Lum_Fermi_std[j] = numpy.std(Lum_Fermi)
-    Lum_std[j] = numpy.std(Lum)
-    Gamma_HESS_std[j] = numpy.std(Gamma_HESS)
-    Gamma_GeV_std[j] = numpy.std(Gamma_GeV)
-    Gamma_MeV_std[j] = numpy.std(Gamma_MeV)
+        # Export of the mean of each quantity with its unit (table Statistics.ecsv, see Functions_store.store_export)
+store_export('Statistics', [name + '_mean' for name in (statistics_quantities)], 'Statistics.ecsv', t_fix)
 
 Lum_HESS_mean = numpy.nan_to_num(Lum_HESS_mean)
 Lum_HESS_std = numpy.nan_to_num(Lum_HESS_std)
@@ -190,11 +145,9 @@ color_std = ['cornflowerblue', 'cornflowerblue']
 y_mean = [Lum_HESS_mean, Lum_pwn_mean, Lum_HESS_CRb]
 ylabel_HESS = '$L_\gamma$ [erg s$^{-1}$] (1 TeV - 10 TeV)'
 
-semilog_plot(figure_number, 3, t6, y_mean, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, xmin, xmax, ymin, ymax, label_name = label_mean)
-plt.fill_between(t6, Lum_HESS_pst, Lum_HESS_mst, color = 'cornflowerblue', alpha = '0.25')
-plt.savefig(pathfigure_gamma+'Mean_gamma_emission_HESS.pdf')
-
-figure_number += 1
+specs.append(figure_spec(pathfigure_gamma+'Mean_gamma_emission_HESS.pdf',
+                         [figure_call('semilog_plot', 3, t6, y_mean, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, xmin, xmax, ymin, ymax, label_name = label_mean),
+                          figure_call('fill_between', t6, Lum_HESS_pst, Lum_HESS_mst, color = 'cornflowerblue', alpha = 0.25)]))
 
             # Fermi energy range
 label_mean = ['HE CRs', 'PSRs', 'CRs background']
@@ -202,11 +155,9 @@ color_mean = ['orangered', 'orange', 'maroon']
 y_mean = [Lum_Fermi_mean, Lum_psr_mean, Lum_Fermi_CRb]
 ylabel_HESS = '$L_\gamma$ [erg s$^{-1}$] (100 MeV - 100 GeV)'
 
-semilog_plot(figure_number, 3, t6, y_mean, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, xmin, xmax, ymin, ymax, label_name = label_mean)
-plt.fill_between(t6, Lum_Fermi_pst, Lum_Fermi_mst, color = 'orangered', alpha = '0.25')
-plt.savefig(pathfigure_gamma+'Mean_gamma_emission_Fermi.pdf')
-
-figure_number += 1
+specs.append(figure_spec(pathfigure_gamma+'Mean_gamma_emission_Fermi.pdf',
+                         [figure_call('semilog_plot', 3, t6, y_mean, xlabel, ylabel_HESS, sym_mean, linestyle_mean, color_mean, xmin, xmax, ymin, ymax, label_name = label_mean),
+                          figure_call('fill_between', t6, Lum_Fermi_pst, Lum_Fermi_mst, color = 'orangered', alpha = 0.25)]))
 
         # Spectral index
 label = 'none'
@@ -220,22 +171,18 @@ y = Gamma_HESS_mean
 color = 'cornflowerblue'
 ylabel_HESS = '$\Gamma_{ph}$ (1 TeV - 10 TeV)'
 
-plot(figure_number, 1, t6, y, xlabel, ylabel_HESS, sym, linestyle, color, xmin, xmax, ymin, ymax)
-plt.fill_between(t6, Gamma_HESS_pst, Gamma_HESS_mst, color = 'cornflowerblue', alpha = '0.25')
-plt.savefig(pathfigure_gamma+'Photon_index_HESS.pdf')
-
-figure_number += 1
+specs.append(figure_spec(pathfigure_gamma+'Photon_index_HESS.pdf',
+                         [figure_call('plot', 1, t6, y, xlabel, ylabel_HESS, sym, linestyle, color, xmin, xmax, ymin, ymax),
+                          figure_call('fill_between', t6, Gamma_HESS_pst, Gamma_HESS_mst, color = 'cornflowerblue', alpha = 0.25)]))
 
             # 1 GeV to 10 GeV
 y = Gamma_GeV_mean
 color = 'orangered'
 ylabel_GeV = '$\Gamma_{ph}$ (1 GeV - 10 GeV)'
 
-plot(figure_number, 1, t6, y, xlabel, ylabel_GeV, sym, linestyle, color, xmin, xmax, ymin, ymax)
-plt.fill_between(t6, Gamma_GeV_pst, Gamma_GeV_mst, color = 'orangered', alpha = '0.25')
-plt.savefig(pathfigure_gamma+'Photon_index_GeV.pdf')
-
-figure_number += 1
+specs.append(figure_spec(pathfigure_gamma+'Photon_index_GeV.pdf',
+                         [figure_call('plot', 1, t6, y, xlabel, ylabel_GeV, sym, linestyle, color, xmin, xmax, ymin, ymax),
+                          figure_call('fill_between', t6, Gamma_GeV_pst, Gamma_GeV_mst, color = 'orangered', alpha = 0.25)]))
 
     ## ----------- ##
     # Probabilities #
@@ -250,8 +197,14 @@ linestyle = ['-', '-', '-', '-', '-']
 color = ['green', 'blue', 'orange', 'red', 'violet']
 label = ['VHE CRs + PWNe', 'only VHE CRs', 'HE CRs + PSRs', 'only HE CRs', 'no PWN - no PSR']
 y = [Proba_HESS, Proba_HESS_CR, Proba_Fermi, Proba_Fermi_CR, Proba_pwn_psr]
+ylabel = 'Probability'
+
+        # 95 % confidence intervals (Wilson score, or probability_bootstrap(probability_events(...)) for bootstrap intervals)
+y_min, y_max = probability_wilson(y, nit_tot)
 
-plot(figure_number, 5, t6, y, xlabel, ylabel_GeV, sym, linestyle, color, xmin, xmax, ymin, ymax, label_name = label)
-plt.savefig(pathfigure_gamma+'Probabilities.pdf')
+specs.append(figure_spec(pathfigure_gamma+'Probabilities.pdf',
+                         [figure_call('plot', 5, t6, y, xlabel, ylabel, sym, linestyle, color, xmin, xmax, ymin, ymax, label_name = label)] +
+                         [figure_call('fill_between', t6, y_min[i], y_max[i], color = color[i], alpha = 0.15) for i in range (len(y))]))
 
-plt.show()
+    # Rendering of all figures (Agg backend, nworkers processes)
+render_figures(specs, nworkers)
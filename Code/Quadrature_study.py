@@ -0,0 +1,117 @@
+"""
+It compares the accuracy of the gamma-ray luminosities for different numbers of bins of the CR and gamma energy grids and for both quadratures (see Functions_quadrature.py).
+
+The test case is the supershell of the superbubble after one SN explosion: the luminosities of each grid are compared to the ones of a fine grid.
+All the other parameters must be given in the Parameters_system
+"""
+
+##------------------------##
+# Librairies and functions #
+##------------------------##
+import time
+import numpy
+from Functions_CR import *
+from Functions_SB import *
+from Functions_kernel import *
+from Functions_bands import *
+from Functions_quadrature import *
+
+# Physical constants and conversion factors
+from Physical_constants import *
+from Conversion_factors import *
+from Parameters_system import *
+
+##==========##
+# Parameters #
+##==========##
+
+    # Grids to compare
+quadratures = ['trapezoid', 'gauss']
+bins_CR = [6, 8, 10, 16, 24]                # numbers of bins of the CR energy grid                  #you need to change it for your study
+bins_gamma = [8, 12, 16, 20, 32]            # numbers of bins of the gamma energy grid               #you need to change it for your study
+
+    # Reference grid
+quadrature_ref = 'gauss'
+bin_CR_ref = 48
+bin_gamma_ref = 64
+
+    # Maximal relative error on the luminosities
+tolerance = 1e-2                                                                                     #you need to change it for your study
+
+    # Test case: supershell of the SB after one SN explosion
+tsn = 5e6                                   # SN explosion time (yr)
+delta_t = numpy.logspace(4, 7, 30)          # time after the SN explosion (yr)
+
+##===========##
+# Computation #
+##===========##
+
+    # Parameters of the SB
+state = superbubble_state(1.0, (tsn + delta_t) * yr26yr)
+r_bound = numpy.column_stack((numpy.zeros(len(delta_t)), state['Rsb'] - state['hs'], state['Rsb']))     # pc
+ns = state['ns']                                                                                        # cm^-3
+
+def luminosities(quadrature, bin_CR, bin_gamma):
+    """
+    Return the gamma-ray luminosities of the test case for one grid and the time of their computation (the kernel is computed before)
+
+    Inputs:
+        quadrature  :   quadrature of the energy grids
+        bin_CR      :   number of bins of the CR energy grid
+        bin_gamma   :   number of bins of the gamma energy grid
+
+    Outputs:
+        lum         :   dictionary with the gamma-ray luminosity in the whole energy range 'Lum' and in each band 'Lum_' + name (erg s^-1)
+        duration    :   time of the computation (s)
+    """
+    E, w_E = log_quadrature(Emin_CR, Emax_CR, bin_CR, quadrature)                   # GeV
+    Egamma, w_gamma = log_quadrature(Emin_gamma, Emax_gamma, bin_gamma, quadrature) # GeV
+    kernel = pion_decay_kernel(E, Egamma)
+
+    start = time.time()
+
+    N_E = power_law_distribution(E)
+    D = diffusion_coefficient(E)
+    N_shell = shell_particles_cube(r_bound, N_E, D, delta_t)[:, -1]
+    flux = pion_decay_flux(N_shell, ns, kernel)                                     # eV^-1 s^-1
+
+    bands = band_quantities(flux, Egamma, quadrature)
+    lum = {name: bands[name] for name in (bands) if name.startswith('Lum_')}
+    lum['Lum'] = numpy.nan_to_num(numpy.dot(flux * Egamma/erg2GeV, w_gamma * GeV2eV))
+
+    return lum, time.time() - start
+
+lum_ref = luminosities(quadrature_ref, bin_CR_ref, bin_gamma_ref)[0]
+names = ['Lum'] + sorted([name for name in (lum_ref) if name != 'Lum'])
+
+print('maximal relative error on the luminosities (reference: %s with %d CR bins and %d gamma bins)' %(quadrature_ref, bin_CR_ref, bin_gamma_ref))
+print('%-10s %6s %6s %10s ' %('quadrature', 'CR', 'gamma', 'time (ms)') + ' '.join(['%10s' %name for name in (names)]))
+
+best = None
+
+for quadrature in (quadratures):
+
+    for bin_CR in (bins_CR):
+
+        for bin_gamma in (bins_gamma):
+
+            lum, duration = luminosities(quadrature, bin_CR, bin_gamma)
+
+            errors = []
+
+            for name in (names):
+
+                ind = lum_ref[name] > 0
+                errors.append(numpy.max(numpy.abs(lum[name][ind]/lum_ref[name][ind] - 1)) if numpy.any(ind) else 0.0)
+
+            print('%-10s %6d %6d %10.3f ' %(quadrature, bin_CR, bin_gamma, 1e3 * duration) + ' '.join(['%10.2e' %error for error in (errors)]))
+
+                # cheapest grid (number of bins) meeting the tolerance
+            if (max(errors) <= tolerance) and ((best is None) or (bin_CR * bin_gamma < best[1] * best[2])):
+                best = (quadrature, bin_CR, bin_gamma)
+
+if best is None:
+    print('no grid meets the tolerance %.1e' %tolerance)
+
+else:
+    print('cheapest grid meeting the tolerance %.1e: %s with %d CR bins and %d gamma bins' %((tolerance,) + best))
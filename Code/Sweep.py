@@ -0,0 +1,75 @@
+"""
+It computes the iterations of the gamma-ray emission of the superbubble for each point of a grid of parameters (parametric study) and writes them in one catalogue.
+
+The parameters which are not in the grid are the ones given in the Parameters_system
+"""
+
+##------------------------##
+# Librairies and functions #
+##------------------------##
+import numpy
+import os
+from Functions_sweep import *
+
+# Physical constants and conversion factors
+from Physical_constants import *
+from Conversion_factors import *
+from Parameters_system import *
+
+##====##
+# Path #
+##====##
+
+    # You need to change it
+os.chdir('/Users/stage/Documents/Virginie/Superbubbles/Files/30_Dor_C/Parametric_studies')
+
+## ============== ##
+# Parametric study #
+## ============== ##
+
+    # Grid of parameters (D0, delta, alpha, n0, Nob, percentage)
+grid = {'D0': [1e25, 1e26, 1e27],                                              #you need to change it for your simulations
+        'delta': [1.0/3, 1.0/2],
+        'alpha': [2.0, 2.2],
+        'n0': [10],
+        'Nob': [100],
+        'percentage': [0.20]}
+
+    # Number of iterations of each point
+nit = 100                                                                      #you need to change it for your simulations
+
+    # Which zone for the Computation
+zones = [2]                                                                     #you need to change it for your simulations
+
+    # Parallelisation
+nworkers = 1        # number of worker processes (one point per worker)         #you need to change it for your simulations
+seed = 0            # seed of the SN explosion times (the same for all points)
+
+    # Catalogue
+catalogue = 'Sweep' # directory of the catalogue (the points already in the catalogue are not computed again)
+
+    # Correction factor
+
+need_correction = True
+
+if need_correction:             # if any correction factor must be used
+
+    t_end_6 = 4.0                       # Myrs
+    Rsb = 47.0                          # observed radius (pc)                  #you need to change it for your simulations
+
+else:
+
+    t_end_6 = None
+    Rsb = None
+
+    ##-----##
+    # Sweep #
+    ##-----##
+print('For %d iterations per point' %nit)
+
+index = run_sweep(catalogue, grid, nit, zones, nworkers, seed, t_end_6, Rsb)
+
+    # CHECKING
+for point_name in sorted(index):
+
+    print('%s: %s' %(point_name, index[point_name]['parameters']))
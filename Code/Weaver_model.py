@@ -11,6 +11,7 @@ All the parameters must be given in the Parameters_system.
 import matplotlib.pyplot as plt
 import numpy
 from Functions import *
+from Functions_plot import *
 from Functions_SB import *
 
 # Physical constants and conversion factors